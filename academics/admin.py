@@ -1,9 +1,16 @@
 """Django admin registrations for the Academics app.
 
 Registers Faculty, Career, Subject, FinalExam, and Grade with basic list and search configuration.
+
+Notes:
+    Changelists load the relations printed by their columns (list_select_related),
+    foreign keys use autocomplete widgets, and grades are searched by student or
+    subject code through indexed subqueries (users.admin mixins).
 """
 
 from django.contrib import admin
+
+from users.admin import ScalableAdminMixin, StudentRecordSearchMixin
 from .models import Faculty, Career, Subject, FinalExam, Grade
 
 
@@ -15,28 +22,36 @@ class FacultyAdmin(admin.ModelAdmin):
 
 
 @admin.register(Career)
-class CareerAdmin(admin.ModelAdmin):
+class CareerAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Career: show program metadata with faculty relation."""
     list_display = ("code", "name", "faculty", "director", "duration_years")
+    list_select_related = ("faculty",)
+    autocomplete_fields = ("faculty",)
     search_fields = ("code", "name", "director", "faculty__name")
 
 
 @admin.register(Subject)
-class SubjectAdmin(admin.ModelAdmin):
+class SubjectAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Subject: curriculum fields and quick search."""
-    list_display = ("code", "name", "career", "year", "period", "category", "semanal_hours")
+    list_display = ("code", "name", "career", "year", "period", "category", "semanal_hours", "capacity", "seats_taken")
+    list_select_related = ("career__faculty",)
+    autocomplete_fields = ("career",)
     search_fields = ("code", "name", "career__name")
 
 
 @admin.register(FinalExam)
-class FinalExamAdmin(admin.ModelAdmin):
+class FinalExamAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin for FinalExam: scheduling fields and subject lookup."""
-    list_display = ("subject", "date", "call_number", "location", "duration")
+    list_display = ("subject", "date", "call_number", "location", "duration", "capacity", "seats_taken")
+    list_select_related = ("subject__career",)
+    autocomplete_fields = ("subject",)
     search_fields = ("subject__name", "subject__code", "location")
 
 
 @admin.register(Grade)
-class GradeAdmin(admin.ModelAdmin):
+class GradeAdmin(StudentRecordSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Grade: student, subject, status and grades overview."""
-    list_display = ("student", "subject", "status", "promotion_grade", "final_grade")
-    search_fields = ("student__user__username", "subject__name", "subject__code")
+    list_display = ("student", "subject", "status", "status_override", "promotion_grade", "final_grade")
+    list_select_related = ("student__user", "subject__career")
+    autocomplete_fields = ("student", "subject")
+    search_fields = ("student__student_id", "subject__code")
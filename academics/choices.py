@@ -0,0 +1,148 @@
+"""Cached model choice fields for the curriculum hierarchy.
+
+Includes:
+- CachedModelChoiceField: ModelChoiceField whose rendered (value, label) list is cached.
+- FacultyChoiceField, CareerChoiceField, SubjectChoiceField: one per curriculum level.
+- invalidate_model_choices(): drop every cached choice list.
+
+Notes:
+    A stock ModelChoiceField renders each option with the instance's __str__,
+    and Career.__str__ / Subject.__str__ read their parent's name, so a dropdown
+    of n subjects costs 1 + n queries. These fields load the queryset once with
+    select_related, render the labels, and keep the list in the default cache
+    under a key built from the queryset's SQL and a version token. Saving or
+    deleting a Faculty, Career or Subject replaces the token (academics.signals),
+    so stale lists are never read again and simply expire. Bulk writes send no
+    signals; callers must call invalidate_model_choices() themselves.
+
+    Each field instance reads the list once and keeps it; forms deep-copy
+    their fields, so a form instance renders, counts and tests its options
+    with one cache read.
+
+    Validation of a submitted value still runs one queryset.get(), as in Django.
+"""
+
+import hashlib
+from uuid import uuid4
+
+from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.forms.models import ModelChoiceIterator, ModelChoiceIteratorValue
+
+CACHE_PREFIX = "model-choices"
+VERSION_KEY = f"{CACHE_PREFIX}:version"
+
+
+def _version():
+    """Current version token, created if missing."""
+    token = cache.get(VERSION_KEY)
+    if token is None:
+        token = uuid4().hex
+        if not cache.add(VERSION_KEY, token, None):
+            token = cache.get(VERSION_KEY, token)
+    return token
+
+
+def invalidate_model_choices():
+    """Drop every cached choice list (a faculty, career or subject changed)."""
+    cache.set(VERSION_KEY, uuid4().hex, None)
+
+
+class CachedModelChoiceIterator(ModelChoiceIterator):
+    """
+    Yields the field's cached (value, label) pairs instead of querying.
+
+    Values are wrapped in ModelChoiceIteratorValue like Django's, but with
+    instance set to None: the cached list holds no model instances, so a widget
+    that reads option["value"].instance needs a stock ModelChoiceField.
+    """
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for value, label in self.field.memoized_choices():
+            yield ModelChoiceIteratorValue(value, None), label
+
+    def __len__(self):
+        return len(self.field.memoized_choices()) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.memoized_choices())
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField with a select_related queryset and a cached choice list.
+
+    Attributes:
+        select_related (tuple[str]): Relations read by label_from_instance (e.g. __str__).
+
+    Works both declared on a form and through ModelForm Meta.field_classes.
+    """
+
+    iterator = CachedModelChoiceIterator
+    select_related = ()
+    _memoized_choices = None
+
+    def __init__(self, queryset, **kwargs):
+        if queryset is not None and self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        super().__init__(queryset, **kwargs)
+
+    def _set_queryset(self, queryset):
+        self._memoized_choices = None
+        super()._set_queryset(queryset)
+
+    queryset = property(forms.ModelChoiceField._get_queryset, _set_queryset)
+
+    def cache_key(self):
+        sql, params = self.queryset.query.sql_with_params()
+        digest = hashlib.md5(repr((sql, params, self.to_field_name)).encode()).hexdigest()
+        return f"{CACHE_PREFIX}:{_version()}:{self.queryset.model._meta.label_lower}:{digest}"
+
+    def cached_choices(self):
+        """
+        Rendered choices of the queryset, from cache when possible.
+
+        Returns:
+            list[tuple[str, str]]: (value, label) pairs in queryset order.
+        """
+        key = self.cache_key()
+        choices = cache.get(key)
+        if choices is None:
+            rows = self.queryset if self.queryset._prefetch_related_lookups else self.queryset.iterator()
+            choices = [(str(self.prepare_value(obj)), str(self.label_from_instance(obj))) for obj in rows]
+            cache.set(key, choices, settings.MODEL_CHOICE_CACHE_TIMEOUT)
+        return choices
+
+    def memoized_choices(self):
+        """
+        cached_choices() read once per field instance.
+
+        Assigning a queryset (which Form.__init__ does through deepcopy) drops
+        the list, so it lives as long as one form instance.
+
+        Returns:
+            list[tuple[str, str]]: (value, label) pairs in queryset order.
+        """
+        if self._memoized_choices is None:
+            self._memoized_choices = self.cached_choices()
+        return self._memoized_choices
+
+
+class FacultyChoiceField(CachedModelChoiceField):
+    """Faculty dropdown."""
+
+
+class CareerChoiceField(CachedModelChoiceField):
+    """Career dropdown; labels show the faculty name."""
+
+    select_related = ("faculty",)
+
+
+class SubjectChoiceField(CachedModelChoiceField):
+    """Subject dropdown; labels show the career name."""
+
+    select_related = ("career",)
+
@@ -7,6 +7,8 @@ Provides forms to create and edit:
 - Subject: courses belonging to a career.
 - FinalExam: final exam sessions for a subject.
 - Grade: student grades and academic status.
+- GradeGridFormSet: spreadsheet-style grading of a whole subject in one POST.
+- GradeImportForm: CSV/XLSX upload of a subject's grades.
 
 Example:
     Typical usage in a view:
@@ -20,7 +22,12 @@ Example:
 """
 
 from django import forms
+from django.db import transaction
+from django.utils import timezone
+
+from .choices import CareerChoiceField, FacultyChoiceField, SubjectChoiceField
 from .models import Faculty, Career, Subject, FinalExam, Grade
+from .signals import grades_bulk_updated
 
 
 class FacultyForm(forms.ModelForm):
@@ -46,6 +53,7 @@ class CareerForm(forms.ModelForm):
 
     Notes:
     - Related selections (e.g., faculty) can be restricted in the view if needed.
+    - The faculty dropdown is a cached choice list (academics.choices).
     - Business rules should live in the model clean() methods.
 
     Fields:
@@ -55,6 +63,7 @@ class CareerForm(forms.ModelForm):
     class Meta:
         model = Career
         fields = ['name', 'code', 'faculty', 'director', 'duration_years', 'description']
+        field_classes = {'faculty': FacultyChoiceField}
 
 
 class SubjectForm(forms.ModelForm):
@@ -66,12 +75,13 @@ class SubjectForm(forms.ModelForm):
     - Leverages model validators for year/category/period fields.
 
     Fields:
-    - name, code, career, year, category, period, semanal_hours, description
+    - name, code, career, year, category, period, semanal_hours, description, capacity
     """
 
     class Meta:
         model = Subject
-        fields = ['name', 'code', 'career', 'year', 'category', 'period', 'semanal_hours', 'description']
+        fields = ['name', 'code', 'career', 'year', 'category', 'period', 'semanal_hours', 'description', 'capacity']
+        field_classes = {'career': CareerChoiceField}
 
 
 class FinalExamForm(forms.ModelForm):
@@ -82,12 +92,31 @@ class FinalExamForm(forms.ModelForm):
     - Schedule exam calls for a subject with date/time/location metadata.
 
     Fields:
-    - subject, date, location, duration, call_number, notes
+    - subject, date, location, duration, call_number, notes, capacity
     """
 
     class Meta:
         model = FinalExam
-        fields = ['subject', 'date', 'location', 'duration', 'call_number', 'notes']
+        fields = ['subject', 'date', 'location', 'duration', 'call_number', 'notes', 'capacity']
+        field_classes = {'subject': SubjectChoiceField}
+
+
+CLEAR_STATUS_OVERRIDE_LABEL = 'Calcular el estado a partir de la nota final'
+
+
+def apply_grade_status(form, grade):
+    """
+    Resolve the status of a grade edited through ``form`` (Grade.set_status).
+
+    An explicitly changed status becomes status_override; the
+    clear_status_override checkbox drops it; otherwise the current override is
+    kept. Removing the final grade makes an ungraded row FREE.
+    """
+    grade.set_status(
+        form.cleaned_data['status'] if 'status' in form.changed_data else None,
+        Grade.StatusSubject.FREE if 'final_grade' in form.changed_data else None,
+        clear_override=form.cleaned_data.get('clear_status_override', False),
+    )
 
 
 class GradeForm(forms.ModelForm):
@@ -97,11 +126,129 @@ class GradeForm(forms.ModelForm):
     Notes:
     - Captures promotion/regular status and final grade values.
     - Status transition rules should be enforced in the model.
+    - A status picked by hand is stored as status_override and kept by later
+      edits until clear_status_override is checked; status is resolved before
+      the single save (apply_grade_status).
 
     Fields:
-    - promotion_grade, status, final_grade, notes
+    - promotion_grade, status, final_grade, notes, clear_status_override
     """
 
+    clear_status_override = forms.BooleanField(required=False, label=CLEAR_STATUS_OVERRIDE_LABEL)
+
     class Meta:
         model = Grade
         fields = ['promotion_grade', 'status', 'final_grade', 'notes']
+
+    def save(self, commit=True):
+        grade = super().save(commit=False)
+        apply_grade_status(self, grade)
+        if commit:
+            grade.save()
+            self._save_m2m()
+        return grade
+
+
+class GradeGridForm(forms.ModelForm):
+    """
+    One row of the grading grid (a Grade of an inscribed student).
+
+    Fields:
+    - promotion_grade, final_grade, status, clear_status_override
+    """
+
+    clear_status_override = forms.BooleanField(
+        required=False,
+        label=CLEAR_STATUS_OVERRIDE_LABEL,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
+
+    class Meta:
+        model = Grade
+        fields = ['promotion_grade', 'final_grade', 'status']
+        widgets = {
+            'promotion_grade': forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': '0.01'}),
+            'final_grade': forms.NumberInput(attrs={'class': 'form-control form-control-sm', 'step': '0.01'}),
+            'status': forms.Select(attrs={'class': 'form-select form-select-sm'}),
+        }
+
+
+class BaseGradeGridFormSet(forms.BaseModelFormSet):
+    """
+    Edit-only formset over the grades of one subject, persisted in bulk.
+
+    Notes:
+    - Rows are validated together; nothing is written if any row is invalid.
+    - Status follows the same rule as grade_edit (apply_grade_status): an
+      explicitly changed status is stored as status_override, an existing
+      override is kept unless the row's clear box is checked, and the rest is
+      derived from final_grade in memory.
+    - save_bulk() writes every changed row with one bulk update in one transaction
+      and sends grades_bulk_updated (eligibility and dashboard caches).
+    """
+
+    BULK_FIELDS = ['promotion_grade', 'final_grade', 'status', 'status_override', 'last_updated']
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        # The stock ModelChoiceField validates each row's pk with one query per
+        # row; the instances are already resolved from self.queryset, so a plain
+        # integer field is enough (unknown pks are rejected in clean()).
+        form.fields[self.model._meta.pk.name] = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
+    def clean(self):
+        super().clean()
+        for form in self.forms:
+            if form.instance.pk is None:
+                raise forms.ValidationError("La planilla contiene notas que no pertenecen a esta materia.")
+
+    def save_bulk(self):
+        """
+        Persist every changed row with one bulk_update.
+
+        Returns:
+            list[Grade]: The grades that were written.
+        """
+        now = timezone.now()
+        changed = []
+        for form in self.forms:
+            if not form.has_changed():
+                continue
+            grade = form.save(commit=False)
+            apply_grade_status(form, grade)
+            grade.last_updated = now
+            changed.append(grade)
+        if changed:
+            with transaction.atomic():
+                Grade.objects.bulk_update_values(changed, self.BULK_FIELDS, batch_size=500)
+                grades_bulk_updated.send(
+                    sender=Grade,
+                    student_ids={g.student_id for g in changed},
+                    subject_ids={g.subject_id for g in changed},
+                )
+        return changed
+
+
+GradeGridFormSet = forms.modelformset_factory(
+    Grade, form=GradeGridForm, formset=BaseGradeGridFormSet, extra=0, edit_only=True
+)
+
+
+class GradeImportForm(forms.Form):
+    """
+    Upload of a grades spreadsheet (see users.services.GradeImportService).
+
+    Fields:
+    - file: CSV or XLSX file.
+    - dry_run: validate and report without saving.
+    """
+
+    file = forms.FileField(
+        label='Planilla (CSV o XLSX)',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'}),
+    )
+    dry_run = forms.BooleanField(
+        label='Solo validar (no guardar cambios)',
+        required=False,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
@@ -0,0 +1,17 @@
+"""Rebuild the FinalExamEligibility index for the whole university.
+
+Usage:
+    python manage.py rebuild_final_eligibility
+"""
+
+from django.core.management.base import BaseCommand
+
+from academics.models import FinalExamEligibility
+
+
+class Command(BaseCommand):
+    help = "Recompute every (student, final exam) eligibility row with one set-based statement."
+
+    def handle(self, *args, **options):
+        rows = FinalExamEligibility.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Final exam eligibility rebuilt: {rows} row(s)."))
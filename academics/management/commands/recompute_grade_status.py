@@ -0,0 +1,30 @@
+"""Re-derive every Grade status from its final grade, set-based.
+
+Usage:
+    python manage.py recompute_grade_status
+    python manage.py recompute_grade_status --by-subject
+    python manage.py recompute_grade_status --subject MAT101 --subject FIS101
+"""
+
+from django.core.management.base import BaseCommand
+
+from academics.models import Grade
+
+
+class Command(BaseCommand):
+    help = "Recompute Grade.status with one UPDATE ... SET status = CASE ... (optionally one per subject)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subject", action="append", dest="subjects", metavar="CODE", help="Limit to a subject (repeatable)."
+        )
+        parser.add_argument(
+            "--by-subject", action="store_true", help="Run one UPDATE and one transaction per subject."
+        )
+
+    def handle(self, *args, **options):
+        grades = Grade.objects.all()
+        if options["subjects"]:
+            grades = grades.filter(subject_id__in=options["subjects"])
+        updated = grades.recompute_status(by_subject=options["by_subject"])
+        self.stdout.write(self.style.SUCCESS(f"Grade statuses recomputed: {updated} row(s) changed."))
@@ -4,13 +4,18 @@ Defines core academic entities and their relationships:
 - Faculty -> Career -> Subject hierarchy.
 - FinalExam sessions per Subject.
 - Grade linking a Student to a Subject with status and grades.
+- FinalExamEligibility: denormalized (student, final_exam) index of the finals a student may take.
 
 Notes:
     - String representations (__str__) are optimized for admin readability.
     - Uniqueness of (student, subject) is enforced at the Grade model level.
+    - Subject and FinalExam seats are claimed with a conditional UPDATE, never read-then-write.
+    - Grade statuses can be recomputed set-based with Grade.objects.recompute_status().
 """
 
-from django.db import models
+from django.db import connection, models, transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 
 
 class Faculty(models.Model):
@@ -38,6 +43,9 @@ class Faculty(models.Model):
     established_date = models.DateField()
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['name', 'code'], name='faculty_name_idx')]
+
     def __str__(self):
         return self.name
 
@@ -61,11 +69,80 @@ class Career(models.Model):
     duration_years = models.PositiveIntegerField()
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['name', 'code'], name='career_name_idx')]
+
     def __str__(self):
         return f"{self.name} ({self.code}) - {self.faculty.name}"
 
 
-class Subject(models.Model):
+class SeatCapacityModel(models.Model):
+    """
+    Abstract base for rows that can limit how many students inscribe in them.
+
+    Attributes:
+        capacity (int | None): Maximum number of inscriptions; None means unlimited.
+        seats_taken (int): Seats currently claimed; maintained by claim_seat()/release_seat()
+            and recount_seats().
+
+    Notes:
+        Subclasses set inscriptions_relation to the reverse accessor of their
+        inscription model; recount_seats() counts through it.
+    """
+    capacity = models.PositiveIntegerField(blank=True, null=True)
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
+
+    inscriptions_relation = None
+
+    class Meta:
+        abstract = True
+
+    def claim_seat(self):
+        """
+        Atomically take one seat if there is capacity left.
+
+        Runs a single conditional statement:
+        UPDATE ... SET seats_taken = seats_taken + 1 WHERE seats_taken < capacity.
+        The row lock it takes is held until the surrounding transaction ends, so
+        concurrent claims can never oversell.
+
+        Returns:
+            bool: True if a seat was taken or there is no capacity limit.
+        """
+        if self.capacity is None:
+            return True
+        claimed = type(self).objects.filter(
+            pk=self.pk, capacity__isnull=False, seats_taken__lt=F("capacity")
+        ).update(seats_taken=F("seats_taken") + 1)
+        return claimed == 1
+
+    def release_seat(self):
+        """Atomically give back one seat (no-op when none is taken)."""
+        type(self).objects.filter(pk=self.pk, seats_taken__gt=0).update(seats_taken=F("seats_taken") - 1)
+
+    def recount_seats(self):
+        """
+        Recompute seats_taken from the actual inscriptions of a capped row.
+
+        The row is locked first (the lock claim_seat() takes), so the count runs
+        once concurrent claims have committed and includes their inscriptions.
+        Uncapped rows are skipped; they are recounted when a capacity is set.
+        """
+        relation = self._meta.get_field(self.inscriptions_relation)
+        target = relation.field.name
+        inscribed = (
+            relation.related_model.objects.filter(**{target: OuterRef("pk")})
+            .values(target)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        rows = type(self).objects.filter(pk=self.pk, capacity__isnull=False)
+        with transaction.atomic():
+            if list(rows.select_for_update().values_list("pk", flat=True)):
+                rows.update(seats_taken=Coalesce(Subquery(inscribed), 0))
+
+
+class Subject(SeatCapacityModel):
     """
     Course within a Career curriculum.
 
@@ -78,6 +155,11 @@ class Subject(models.Model):
         period (str): One of Period choices.
         semanal_hours (int): Weekly contact hours.
         description (str | None): Optional description.
+        capacity (int | None): Maximum number of inscriptions (SeatCapacityModel).
+        seats_taken (int): Seats currently claimed (SeatCapacityModel).
+
+    Indexes:
+        (career, year, name) serves a career's plan in dashboard order and replaces the plain career FK index.
     """
 
     class Category(models.TextChoices):
@@ -93,18 +175,26 @@ class Subject(models.Model):
 
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=10, primary_key=True)
-    career = models.ForeignKey(Career, on_delete=models.CASCADE, related_name='subjects')
+    career = models.ForeignKey(Career, on_delete=models.CASCADE, related_name='subjects', db_index=False)
     year = models.PositiveSmallIntegerField()
     category = models.CharField(max_length=10, choices=Category.choices)
     period = models.CharField(max_length=10, choices=Period.choices)
     semanal_hours = models.PositiveIntegerField()
     description = models.TextField(blank=True, null=True)
 
+    inscriptions_relation = 'subject_inscriptions'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name', 'code'], name='subject_name_idx'),
+            models.Index(fields=['career', 'year', 'name'], name='subject_career_year_idx'),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.code}) - {self.career.name}"
 
 
-class FinalExam(models.Model):
+class FinalExam(SeatCapacityModel):
     """
     Final exam call (session) for a Subject.
 
@@ -115,18 +205,140 @@ class FinalExam(models.Model):
         duration (timedelta): Expected duration.
         call_number (int): Call identifier/ordinal within the period.
         notes (str | None): Optional remarks for logistics or scope.
+        capacity (int | None): Maximum number of inscriptions (SeatCapacityModel).
+        seats_taken (int): Seats currently claimed (SeatCapacityModel).
+
+    Indexes:
+        (subject, date) serves a subject's calls in date order and replaces the plain subject FK index.
     """
-    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='final_exams')
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='final_exams', db_index=False)
     date = models.DateField()
     location = models.CharField(max_length=255)
     duration = models.DurationField()
     call_number = models.PositiveSmallIntegerField()
     notes = models.TextField(blank=True, null=True)
 
+    inscriptions_relation = 'final_exam_inscriptions'
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='final_exam_date_idx'),
+            models.Index(fields=['subject', 'date'], name='final_exam_subject_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.subject.name} Final Exam on {self.date.strftime('%Y-%m-%d')}"
 
 
+class GradeQuerySet(models.QuerySet):
+    """Bulk write helpers for Grade."""
+
+    def derived_status(self):
+        """
+        SQL expression of Grade.derive_status() for rows already stored.
+
+        Returns:
+            Case: status_override when set; otherwise PROMOTED from 6.0, REGULAR
+            below, and the stored status without final_grade.
+        """
+        status = self.model.StatusSubject
+        return Case(
+            When(status_override__isnull=False, then=F("status_override")),
+            When(final_grade__isnull=True, then=F("status")),
+            When(final_grade__gte=6, then=Value(status.PROMOTED)),
+            default=Value(status.REGULAR),
+            output_field=models.CharField(),
+        )
+
+    def recompute_status(self, by_subject=False):
+        """
+        Re-derive the status of every grade in the queryset set-based.
+
+        Runs ``UPDATE ... SET status = CASE ... WHERE status <> CASE ...``, so only
+        drifted rows are written. Sends grades_bulk_updated afterwards, which
+        resyncs final exam eligibility and the dashboard caches: for the students
+        and subjects of the drifted rows (read and locked before the UPDATE), or
+        for everything (None) when the queryset is unfiltered.
+
+        Args:
+            by_subject (bool): Issue one UPDATE (and one transaction) per subject
+                instead of one for the whole queryset, keeping locks and WAL
+                bursts small on huge tables.
+
+        Returns:
+            int: Number of grades whose status changed.
+        """
+        from academics.signals import grades_bulk_updated
+
+        def recompute(queryset, scoped):
+            drifted = queryset.filter(~Q(status=self.derived_status()))
+            with transaction.atomic(using=self.db):
+                if not scoped:
+                    updated = drifted.update(status=self.derived_status())
+                    if updated:
+                        grades_bulk_updated.send(sender=self.model, student_ids=None, subject_ids=None)
+                    return updated
+                rows = list(drifted.select_for_update().values_list("student_id", "subject_id"))
+                if not rows:
+                    return 0
+                updated = drifted.update(status=self.derived_status())
+                grades_bulk_updated.send(
+                    sender=self.model,
+                    student_ids={student_id for student_id, _ in rows},
+                    subject_ids={subject_id for _, subject_id in rows},
+                )
+            return updated
+
+        if not by_subject:
+            return recompute(self, scoped=bool(self.query.where))
+        subject_ids = self.order_by("subject_id").values_list("subject_id", flat=True).distinct()
+        return sum(recompute(self.filter(subject_id=code), scoped=True) for code in list(subject_ids))
+
+    def bulk_update_values(self, grades, fields, batch_size=1000):
+        """
+        Same contract as bulk_update(), but cheap to build for large batches.
+
+        On PostgreSQL each batch is one ``UPDATE ... FROM (VALUES ...)`` statement;
+        Django's bulk_update spends most of its time compiling one CASE WHEN
+        branch per row and field. Other backends fall back to bulk_update().
+
+        Args:
+            grades (Sequence[Grade]): Saved grades carrying the new values.
+            fields (Iterable[str]): Concrete field names to write.
+            batch_size (int): Rows per statement.
+
+        Returns:
+            int: Number of rows updated.
+        """
+        if connection.vendor != "postgresql":
+            return self.bulk_update(grades, fields, batch_size=batch_size)
+        fields = [self.model._meta.get_field(name) for name in fields]
+        pk = self.model._meta.pk
+        columns = [pk, *fields]
+        qn = connection.ops.quote_name
+        row_sql = "(" + ", ".join(f"%s::{f.db_type(connection)}" for f in columns) + ")"
+        assignments = ", ".join(f"{qn(f.column)} = v.{qn(f.column)}" for f in fields)
+        table = qn(self.model._meta.db_table)
+        updated = 0
+        with transaction.atomic(using=self.db, savepoint=False), connection.cursor() as cursor:
+            for start in range(0, len(grades), batch_size):
+                batch = grades[start:start + batch_size]
+                params = [
+                    f.get_db_prep_save(getattr(grade, f.attname), connection)
+                    for grade in batch
+                    for f in columns
+                ]
+                cursor.execute(
+                    f"UPDATE {table} SET {assignments} "
+                    f"FROM (VALUES {', '.join([row_sql] * len(batch))}) "
+                    f"AS v({', '.join(qn(f.column) for f in columns)}) "
+                    f"WHERE {table}.{qn(pk.column)} = v.{qn(pk.column)}",
+                    params,
+                )
+                updated += cursor.rowcount
+        return updated
+
+
 class Grade(models.Model):
     """
     Student performance and academic status for a Subject.
@@ -138,13 +350,23 @@ class Grade(models.Model):
         subject (Subject): Subject graded (FK).
         promotion_grade (Decimal | None): Continuous assessment/commission grade.
         status (str): One of StatusSubject choices (FREE, REGULAR, PROMOTED).
+        status_override (str | None): Status set by hand; wins over the derived one.
         final_grade (Decimal | None): Final exam grade, if applicable.
         last_updated (datetime): Auto-updated timestamp on save.
         notes (str | None): Optional comments.
 
     Notes:
         - Uniqueness of (student, subject) is enforced via Meta.unique_together.
-        - Status transitions are maintained by update_status().
+        - Status transitions are maintained by update_status() (derive_status() in bulk paths).
+        - With GRADE_STATUS_MODE = "database" PostgreSQL triggers derive status and
+          resync FinalExamEligibility on every write (see academics.triggers), so
+          admin edits, bulk_update() and QuerySet.update() cannot leave them stale.
+          Those writes still do not refresh dashboard caches; call
+          StudentDashboardService or send grades_bulk_updated after them.
+        - (subject, status) serves a subject's grade sheet and its regular students
+          (eligibility sync); (student, status) serves a student's grades by status.
+          They replace the plain FK indexes (student is also the leading column of
+          the unique index).
     """
 
     class StatusSubject(models.TextChoices):
@@ -153,16 +375,23 @@ class Grade(models.Model):
         REGULAR = 'regular', 'Regular'
         PROMOTED = 'promoted', 'Promoted'
 
-    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='grades')
-    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='grades')
+    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='grades', db_index=False)
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='grades', db_index=False)
     promotion_grade = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
     status = models.CharField(max_length=10, choices=StatusSubject.choices, default=StatusSubject.REGULAR)
+    status_override = models.CharField(max_length=10, choices=StatusSubject.choices, blank=True, null=True)
     final_grade = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
     last_updated = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True, null=True)
 
+    objects = GradeQuerySet.as_manager()
+
     class Meta:
         unique_together = ('student', 'subject')
+        indexes = [
+            models.Index(fields=['subject', 'status'], name='grade_subject_status_idx'),
+            models.Index(fields=['student', 'status'], name='grade_student_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.user.username} - {self.subject.name} ({self.status})"
@@ -172,6 +401,7 @@ class Grade(models.Model):
         Update and persist the status based on current final_grade.
 
         Logic:
+            - If status_override is set -> status_override.
             - If final_grade is not None and >= 6.0 -> PROMOTED.
             - If final_grade is not None and < 6.0 -> REGULAR.
             - If final_grade is None -> FREE.
@@ -182,11 +412,155 @@ class Grade(models.Model):
         Raises:
             TypeError: If final_grade is not a number when provided.
         """
+        self.status = self.derive_status(ungraded_status=self.StatusSubject.FREE)
+        self.save()
+
+    def derive_status(self, ungraded_status=None):
+        """
+        Return the status implied by final_grade without touching the database.
+
+        This is the single status rule; GradeQuerySet.derived_status() and the
+        database trigger (academics.triggers) apply it too. A manual
+        status_override wins. Without final_grade the status is the one being
+        written: an ungraded inscription stays REGULAR (the model default),
+        while grading a row without final grade (update_status()) or removing
+        its final grade passes ungraded_status=FREE.
+
+        Args:
+            ungraded_status (str | None): Status for a grade without final_grade;
+                None keeps the current status.
+
+        Returns:
+            str: One of StatusSubject values.
+        """
+        if self.status_override:
+            return self.status_override
         if self.final_grade is not None:
             if self.final_grade >= 6.0:
-                self.status = self.StatusSubject.PROMOTED
-            else:
-                self.status = self.StatusSubject.REGULAR
-        else:
-            self.status = self.StatusSubject.FREE
-        self.save()
+                return self.StatusSubject.PROMOTED
+            return self.StatusSubject.REGULAR
+        return ungraded_status or self.status
+
+    def set_status(self, explicit=None, ungraded_status=None, clear_override=False):
+        """
+        Record a manual status (or clear it) and refresh status in memory.
+
+        Args:
+            explicit (str | None): Status chosen by hand, stored as status_override;
+                None keeps the current override.
+            ungraded_status (str | None): Passed to derive_status().
+            clear_override (bool): Drop status_override so status is derived again.
+        """
+        if clear_override:
+            self.status_override = None
+        elif explicit:
+            self.status_override = explicit
+        self.status = self.derive_status(ungraded_status)
+
+
+class FinalExamEligibilityManager(models.Manager):
+    """
+    Maintenance operations for the FinalExamEligibility index.
+
+    A student is eligible for every FinalExam of a subject whose Grade status is
+    REGULAR. Rows are kept in sync incrementally (see academics.signals) and can be
+    rebuilt from scratch with rebuild().
+
+    Notes:
+        bulk_create/bulk_update/update() on Grade send no signals; callers of those
+        bulk paths must call sync() for the students and subjects they touched.
+    """
+
+    def sync(self, student_ids=None, subject_ids=None):
+        """
+        Recompute the rows of some students and/or subjects in three statements.
+
+        Deletes the affected rows, reads the (student, final_exam) pairs of
+        REGULAR grades with one join and bulk-inserts them.
+
+        Args:
+            student_ids (Iterable[str] | None): Limit to these students; None means all.
+            subject_ids (Iterable[str] | None): Limit to these subjects; None means all.
+        """
+        stale = self.all()
+        regular = Grade.objects.filter(status=Grade.StatusSubject.REGULAR)
+        if student_ids is not None:
+            student_ids = list(student_ids)
+            stale = stale.filter(student_id__in=student_ids)
+            regular = regular.filter(student_id__in=student_ids)
+        if subject_ids is not None:
+            subject_ids = list(subject_ids)
+            stale = stale.filter(final_exam__subject_id__in=subject_ids)
+            regular = regular.filter(subject_id__in=subject_ids)
+        pairs = regular.filter(subject__final_exams__isnull=False).values_list(
+            "student_id", "subject__final_exams"
+        )
+        with transaction.atomic():
+            stale.delete()
+            self.bulk_create(
+                (self.model(student_id=student_id, final_exam_id=final_id) for student_id, final_id in pairs),
+                batch_size=5000,
+                ignore_conflicts=True,
+            )
+
+    def sync_final_exam(self, final_exam):
+        """Recompute the rows of one final exam session."""
+        with transaction.atomic():
+            self.filter(final_exam=final_exam).delete()
+            regular = Grade.objects.filter(subject_id=final_exam.subject_id, status=Grade.StatusSubject.REGULAR)
+            self.bulk_create(
+                (
+                    self.model(student_id=student_id, final_exam_id=final_exam.pk)
+                    for student_id in regular.values_list("student_id", flat=True)
+                ),
+                batch_size=5000,
+                ignore_conflicts=True,
+            )
+
+    def rebuild(self):
+        """
+        Recompute the whole table with one set-based INSERT ... SELECT.
+
+        Returns:
+            int: Number of eligibility rows written.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        grades = connection.ops.quote_name(Grade._meta.db_table)
+        finals = connection.ops.quote_name(FinalExam._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.all().delete()
+            cursor.execute(
+                f"INSERT INTO {table} (student_id, final_exam_id) "
+                f"SELECT g.student_id, f.id FROM {grades} g "
+                f"JOIN {finals} f ON f.subject_id = g.subject_id "
+                f"WHERE g.status = %s",
+                [Grade.StatusSubject.REGULAR],
+            )
+            return cursor.rowcount
+
+
+class FinalExamEligibility(models.Model):
+    """
+    Final exam sessions a student may inscribe in.
+
+    Denormalizes "Grade status is REGULAR" x "FinalExam of that subject", so that
+    "which finals can I take" is a single indexed lookup on student.
+
+    Attributes:
+        student (users.Student): Eligible student (FK).
+        final_exam (FinalExam): Session the student may take (FK).
+
+    Notes:
+        - Maintained incrementally from Grade/FinalExam signals (academics.signals).
+        - Rebuild with ``python manage.py rebuild_final_eligibility``.
+    """
+    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='final_eligibilities')
+    final_exam = models.ForeignKey(FinalExam, on_delete=models.CASCADE, related_name='eligibilities')
+
+    objects = FinalExamEligibilityManager()
+
+    class Meta:
+        unique_together = ('student', 'final_exam')
+
+    def __str__(self):
+        return f"{self.student_id} -> {self.final_exam_id}"
@@ -0,0 +1,76 @@
+"""Signal handlers for the Academics app.
+
+Keeps the FinalExamEligibility index in sync:
+- Saving or deleting a Grade resynchronizes that student's rows for the subject.
+- Saving a FinalExam resynchronizes the rows of that session.
+- grades_bulk_updated (sent by bulk grade writers) resynchronizes the touched rows.
+
+Saving or deleting a Faculty, Career or Subject invalidates the cached
+dropdown choices (academics.choices).
+
+After migrate, installs or drops the Grade status trigger according to
+GRADE_STATUS_MODE (see academics.triggers).
+
+Notes:
+    - Deleting a FinalExam or a Student cascades to its eligibility rows.
+    - Bulk Grade writes send no signals and call FinalExamEligibility.objects.sync() themselves.
+"""
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import Signal, receiver
+
+from academics import triggers
+from academics.choices import invalidate_model_choices
+from academics.models import Career, Faculty, FinalExam, FinalExamEligibility, Grade, Subject
+
+grades_bulk_updated = Signal()
+"""Sent with sender=Grade, student_ids and subject_ids after a bulk Grade write (None means all)."""
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def sync_grade_eligibility(sender, instance, raw=False, **kwargs):
+    """Resynchronize the eligibility of the grade's student for its subject."""
+    if not raw:
+        FinalExamEligibility.objects.sync(student_ids=[instance.student_id], subject_ids=[instance.subject_id])
+
+
+@receiver(post_save, sender=FinalExam)
+def sync_final_exam_eligibility(sender, instance, raw=False, **kwargs):
+    """Resynchronize the eligibility rows of a created or edited final exam."""
+    if not raw:
+        FinalExamEligibility.objects.sync_final_exam(instance)
+
+
+@receiver(grades_bulk_updated, sender=Grade)
+def sync_bulk_grade_eligibility(sender, student_ids, subject_ids, **kwargs):
+    """Resynchronize the eligibility rows touched by a bulk grade write."""
+    if student_ids is None and subject_ids is None:
+        FinalExamEligibility.objects.rebuild()
+    else:
+        FinalExamEligibility.objects.sync(student_ids=student_ids, subject_ids=subject_ids)
+
+
+@receiver(post_save, sender=Faculty)
+@receiver(post_delete, sender=Faculty)
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_curriculum_choices(sender, **kwargs):
+    """Drop the cached faculty/career/subject dropdowns (labels include parent names)."""
+    invalidate_model_choices()
+
+
+@receiver(post_migrate)
+def configure_grade_status_trigger(sender, using="default", **kwargs):
+    """Install the status trigger in database mode, drop it otherwise (PostgreSQL only)."""
+    connection = connections[using]
+    if sender.name != "academics" or not triggers.supports_database_status(connection):
+        return
+    if settings.GRADE_STATUS_MODE == "database":
+        triggers.install_grade_status_trigger(connection)
+    else:
+        triggers.drop_grade_status_trigger(connection)
@@ -1,7 +1,17 @@
-from django.test import TestCase
-from academics.models import Faculty, Career, Subject, FinalExam, Grade
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from academics import triggers
+from academics.forms import CareerForm, FinalExamForm, SubjectForm
+from academics.models import Faculty, Career, Subject, FinalExam, FinalExamEligibility, Grade
+from academics.signals import grades_bulk_updated
 from users.models import CustomUser, Student
 import datetime
+from decimal import Decimal
+from io import StringIO
 
 
 class FacultyModelTest(TestCase):
@@ -82,9 +92,12 @@ class SubjectModelTest(TestCase):
         self.assertEqual(str(subject), 'Matemática (MAT101) - Ingeniería')
 
 
-class FinalExamModelTest(TestCase):
-    def setUp(self):
-        self.faculty = Faculty.objects.create(
+class CurriculumFixture:
+    """Test data without tests: a faculty, a career and one subject, shared by the class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = Faculty.objects.create(
             code='F1',
             name='Facultad de Ingeniería',
             address='Calle 123',
@@ -94,23 +107,45 @@ class FinalExamModelTest(TestCase):
             dean='Decano Ejemplo',
             established_date='1950-01-01'
         )
-        self.career = Career.objects.create(
+        cls.career = Career.objects.create(
             name='Ingeniería',
             code='ING',
-            faculty=self.faculty,
+            faculty=cls.faculty,
             director='Director',
             duration_years=5
         )
-        self.subject = Subject.objects.create(
+        cls.subject = Subject.objects.create(
             name='Matemática',
             code='MAT101',
-            career=self.career,
+            career=cls.career,
             year=1,
             category=Subject.Category.OBLIGATORY,
             period=Subject.Period.FIRST,
             semanal_hours=6
         )
 
+
+class GradeFixture(CurriculumFixture):
+    """CurriculumFixture plus a student of the career."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = CustomUser.objects.create_user(
+            username='student1',
+            password='testpass',
+            role=CustomUser.Role.STUDENT,
+            dni='12345678'
+        )
+        cls.student = Student.objects.create(
+            student_id='S1',
+            user=cls.user,
+            career=cls.career,
+            enrollment_date='2022-01-01'
+        )
+
+
+class FinalExamModelTest(CurriculumFixture, TestCase):
     def test_create_final_exam(self):
         final_exam = FinalExam.objects.create(
             subject=self.subject,
@@ -124,47 +159,7 @@ class FinalExamModelTest(TestCase):
         self.assertIn('Matemática', str(final_exam))
 
 
-class GradeModelTest(TestCase):
-    def setUp(self):
-        self.faculty = Faculty.objects.create(
-            code='F1',
-            name='Facultad de Ingeniería',
-            address='Calle 123',
-            phone='123456789',
-            email='facu@uni.edu',
-            website='https://facu.uni.edu',
-            dean='Decano Ejemplo',
-            established_date='1950-01-01'
-        )
-        self.career = Career.objects.create(
-            name='Ingeniería',
-            code='ING',
-            faculty=self.faculty,
-            director='Director',
-            duration_years=5
-        )
-        self.subject = Subject.objects.create(
-            name='Matemática',
-            code='MAT101',
-            career=self.career,
-            year=1,
-            category=Subject.Category.OBLIGATORY,
-            period=Subject.Period.FIRST,
-            semanal_hours=6
-        )
-        self.user = CustomUser.objects.create_user(
-            username='student1',
-            password='testpass',
-            role=CustomUser.Role.STUDENT,
-            dni='12345678'
-        )
-        self.student = Student.objects.create(
-            student_id='S1',
-            user=self.user,
-            career=self.career,
-            enrollment_date='2022-01-01'
-        )
-
+class GradeModelTest(GradeFixture, TestCase):
     def test_create_grade(self):
         grade = Grade.objects.create(
             student=self.student,
@@ -192,3 +187,254 @@ class GradeModelTest(TestCase):
         grade.final_grade = 5.0
         grade.update_status()
         self.assertEqual(grade.status, Grade.StatusSubject.REGULAR)
+
+
+class FinalExamEligibilityTest(GradeFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.final = FinalExam.objects.create(
+            subject=self.subject,
+            date=datetime.date(2025, 7, 1),
+            call_number=1,
+            location='Aula 1',
+            duration=datetime.timedelta(hours=2)
+        )
+
+    def eligible(self):
+        return list(FinalExamEligibility.objects.filter(student=self.student).values_list('final_exam_id', flat=True))
+
+    def test_follows_grade_status(self):
+        grade = Grade.objects.create(student=self.student, subject=self.subject, status=Grade.StatusSubject.REGULAR)
+        self.assertEqual(self.eligible(), [self.final.pk])
+        grade.status = Grade.StatusSubject.FREE
+        grade.save()
+        self.assertEqual(self.eligible(), [])
+        grade.status = Grade.StatusSubject.REGULAR
+        grade.save()
+        grade.delete()
+        self.assertEqual(self.eligible(), [])
+
+    def test_new_final_exam_includes_regular_students(self):
+        Grade.objects.create(student=self.student, subject=self.subject, status=Grade.StatusSubject.REGULAR)
+        second = FinalExam.objects.create(
+            subject=self.subject,
+            date=datetime.date(2025, 12, 1),
+            call_number=2,
+            location='Aula 2',
+            duration=datetime.timedelta(hours=2)
+        )
+        self.assertCountEqual(self.eligible(), [self.final.pk, second.pk])
+
+    def test_rebuild_restores_bulk_written_grades(self):
+        Grade.objects.bulk_create([Grade(student=self.student, subject=self.subject)])
+        self.assertEqual(self.eligible(), [])
+        self.assertEqual(FinalExamEligibility.objects.rebuild(), 1)
+        self.assertEqual(self.eligible(), [self.final.pk])
+
+
+class GradeBulkUpdateValuesTest(GradeFixture, TestCase):
+    def test_writes_values_and_nulls(self):
+        grade = Grade.objects.create(student=self.student, subject=self.subject, promotion_grade=5)
+        grade.promotion_grade = None
+        grade.final_grade = Decimal('7.50')
+        grade.status = Grade.StatusSubject.PROMOTED
+        updated = Grade.objects.bulk_update_values([grade], ['promotion_grade', 'final_grade', 'status'])
+        self.assertEqual(updated, 1)
+        grade.refresh_from_db()
+        self.assertIsNone(grade.promotion_grade)
+        self.assertEqual(grade.final_grade, Decimal('7.50'))
+        self.assertEqual(grade.status, Grade.StatusSubject.PROMOTED)
+
+
+class GradeRecomputeStatusTest(GradeFixture, TestCase):
+    def test_recompute_status_matches_derive_status(self):
+        other = Subject.objects.create(
+            name='Física',
+            code='FIS101',
+            career=self.career,
+            year=1,
+            category=Subject.Category.OBLIGATORY,
+            period=Subject.Period.FIRST,
+            semanal_hours=6
+        )
+        final = FinalExam.objects.create(
+            subject=other,
+            date=datetime.date(2025, 7, 1),
+            call_number=1,
+            location='Aula 1',
+            duration=datetime.timedelta(hours=2)
+        )
+        Grade.objects.bulk_create([
+            Grade(student=self.student, subject=self.subject, final_grade=8, status=Grade.StatusSubject.FREE),
+            Grade(student=self.student, subject=other, final_grade=4, status=Grade.StatusSubject.FREE),
+        ])
+        for by_subject in (False, True):
+            with self.subTest(by_subject=by_subject):
+                Grade.objects.update(status=Grade.StatusSubject.FREE)
+                FinalExamEligibility.objects.all().delete()
+                self.assertEqual(Grade.objects.recompute_status(by_subject=by_subject), 2)
+                self.assertEqual(Grade.objects.recompute_status(by_subject=by_subject), 0)
+                for grade in Grade.objects.all():
+                    self.assertEqual(grade.status, grade.derive_status())
+                self.assertEqual(
+                    list(FinalExamEligibility.objects.values_list('final_exam_id', flat=True)), [final.pk]
+                )
+
+
+    def test_ungraded_inscription_keeps_its_status(self):
+        Grade.objects.bulk_create([Grade(student=self.student, subject=self.subject)])
+        self.assertEqual(Grade.objects.recompute_status(), 0)
+        grade = Grade.objects.get()
+        self.assertEqual(grade.status, Grade.StatusSubject.REGULAR)
+        self.assertEqual(grade.derive_status(), Grade.StatusSubject.REGULAR)
+        self.assertEqual(grade.derive_status(ungraded_status=Grade.StatusSubject.FREE), Grade.StatusSubject.FREE)
+
+    def test_filtered_recompute_only_resyncs_affected_rows(self):
+        other = Subject.objects.create(
+            name='Física',
+            code='FIS101',
+            career=self.career,
+            year=1,
+            category=Subject.Category.OBLIGATORY,
+            period=Subject.Period.FIRST,
+            semanal_hours=6
+        )
+        for subject in (self.subject, other):
+            FinalExam.objects.create(
+                subject=subject,
+                date=datetime.date(2025, 7, 1),
+                call_number=1,
+                location='Aula 1',
+                duration=datetime.timedelta(hours=2)
+            )
+        Grade.objects.bulk_create([
+            Grade(student=self.student, subject=self.subject, final_grade=4, status=Grade.StatusSubject.FREE),
+            Grade(student=self.student, subject=other, final_grade=4, status=Grade.StatusSubject.REGULAR),
+        ])
+        sent = []
+
+        def receiver(sender, student_ids, subject_ids, **kwargs):
+            sent.append((student_ids, subject_ids))
+
+        grades_bulk_updated.connect(receiver, sender=Grade)
+        self.addCleanup(grades_bulk_updated.disconnect, receiver, sender=Grade)
+        call_command('recompute_grade_status', '--subject', 'MAT101', stdout=StringIO())
+
+        self.assertEqual(sent, [({self.student.pk}, {'MAT101'})])
+        # FIS101 had no eligibility rows (bulk_create) and was not rebuilt.
+        self.assertEqual(
+            list(FinalExamEligibility.objects.values_list('final_exam__subject_id', flat=True)), ['MAT101']
+        )
+
+
+@skipUnless(connection.vendor == 'postgresql', 'The status trigger is PostgreSQL only.')
+class GradeStatusTriggerTest(GradeFixture, TestCase):
+    def setUp(self):
+        super().setUp()
+        triggers.install_grade_status_trigger(connection)
+
+    def status(self):
+        return Grade.objects.values_list('status', flat=True).get()
+
+    def test_database_derives_status_on_every_write(self):
+        Grade.objects.create(student=self.student, subject=self.subject)
+        self.assertEqual(self.status(), Grade.StatusSubject.REGULAR)
+        Grade.objects.update(final_grade=8)
+        self.assertEqual(self.status(), Grade.StatusSubject.PROMOTED)
+        Grade.objects.update(final_grade=3, status=Grade.StatusSubject.PROMOTED)
+        self.assertEqual(self.status(), Grade.StatusSubject.REGULAR)
+        Grade.objects.update(status_override=Grade.StatusSubject.FREE)
+        self.assertEqual(self.status(), Grade.StatusSubject.FREE)
+        Grade.objects.update(status_override=None, final_grade=None)
+        self.assertEqual(self.status(), Grade.StatusSubject.FREE)
+
+    def test_ungraded_inscription_matches_recompute(self):
+        Grade.objects.create(student=self.student, subject=self.subject)
+        Grade.objects.update(notes='Sin nota')
+        self.assertEqual(self.status(), Grade.StatusSubject.REGULAR)
+        self.assertEqual(Grade.objects.recompute_status(), 0)
+        self.assertEqual(self.status(), Grade.objects.get().derive_status())
+
+    def test_raw_updates_keep_eligibility_in_sync(self):
+        final = FinalExam.objects.create(
+            subject=self.subject,
+            date=datetime.date(2025, 7, 1),
+            call_number=1,
+            location='Aula 1',
+            duration=datetime.timedelta(hours=2)
+        )
+        eligible = FinalExamEligibility.objects.filter(student=self.student, final_exam=final)
+        # bulk_create and update() send no signals; only the trigger can keep the index in step.
+        Grade.objects.bulk_create([Grade(student=self.student, subject=self.subject)])
+        self.assertTrue(eligible.exists())
+        Grade.objects.update(final_grade=8)
+        self.assertEqual(self.status(), Grade.StatusSubject.PROMOTED)
+        self.assertFalse(eligible.exists())
+        Grade.objects.update(final_grade=4)
+        self.assertTrue(eligible.exists())
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {Grade._meta.db_table}')
+        self.assertFalse(eligible.exists())
+
+    def test_drop_restores_application_mode(self):
+        triggers.drop_grade_status_trigger(connection)
+        Grade.objects.create(student=self.student, subject=self.subject)
+        Grade.objects.update(final_grade=8)
+        self.assertEqual(self.status(), Grade.StatusSubject.REGULAR)
+
+
+class CachedChoiceFieldTest(CurriculumFixture, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(5):
+            Subject.objects.create(
+                name=f'Materia {i}', code=f'M{i}', career=cls.career, year=1,
+                category=Subject.Category.OBLIGATORY, period=Subject.Period.FIRST, semanal_hours=4
+            )
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_dropdown_renders_in_one_query_then_from_cache(self):
+        with self.assertNumQueries(1):
+            html = str(FinalExamForm()['subject'])
+        self.assertIn('Materia 4 (M4) - Ingeniería', html)
+        with self.assertNumQueries(2):
+            str(SubjectForm()['career'])
+            str(CareerForm()['faculty'])
+        with self.assertNumQueries(0):
+            str(FinalExamForm()['subject'])
+            str(SubjectForm()['career'])
+            str(CareerForm()['faculty'])
+        self.assertEqual(len(FinalExamForm().fields['subject'].choices), 7)
+
+    def test_form_reads_the_cached_list_once(self):
+        str(FinalExamForm()['subject'])
+        form = FinalExamForm()
+        with self.assertNumQueries(2):
+            html = str(form['subject'])
+        with self.assertNumQueries(0):
+            self.assertEqual(html, str(form['subject']))
+            choices = form.fields['subject'].choices
+            self.assertTrue(choices)
+            self.assertEqual(len(choices), 7)
+        options = {str(value): (value, label) for value, label in choices}
+        value, label = options['M0']
+        self.assertEqual(value, 'M0')
+        self.assertIsNone(value.instance)
+        self.assertEqual(label, 'Materia 0 (M0) - Ingeniería')
+
+    def test_curriculum_changes_invalidate_labels(self):
+        str(FinalExamForm()['subject'])
+        self.career.name = 'Sistemas'
+        self.career.save()
+        self.assertIn('Materia 0 (M0) - Sistemas', str(FinalExamForm()['subject']))
+        Subject.objects.filter(code='M0').delete()
+        self.assertNotIn('(M0)', str(FinalExamForm()['subject']))
+
+    def test_bound_form_validates_against_database(self):
+        form = FinalExamForm(data={
+            'subject': 'M1', 'date': '2024-07-01', 'location': 'Aula 1', 'duration': '02:00:00', 'call_number': 1,
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['subject'].career.name, 'Ingeniería')
+        self.assertFalse(FinalExamForm(data={'subject': 'NOPE'}).is_valid())
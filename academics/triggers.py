@@ -0,0 +1,117 @@
+"""Database-side Grade status derivation (GRADE_STATUS_MODE = "database").
+
+A PostgreSQL BEFORE INSERT OR UPDATE trigger sets Grade.status from
+status_override or final_grade with the same rules as Grade.derive_status():
+
+- status_override set -> status_override.
+- final_grade >= 6.0 -> PROMOTED; below -> REGULAR.
+- final_grade NULL -> the status being written, so freshly inscribed students
+  stay REGULAR (the model default) until they are graded; an UPDATE that removes
+  the final grade sets FREE.
+
+An AFTER INSERT OR UPDATE OR DELETE trigger then keeps FinalExamEligibility in
+step with the written status, so raw QuerySet.update(), bulk_update() and admin
+bulk actions, which send no grades_bulk_updated, cannot leave a student
+eligible for (or missing) the finals of a subject. Dashboard caches are not a
+database concern: those writers must still call StudentDashboardService (or
+wait for STUDENT_DASHBOARD_CACHE_TIMEOUT).
+
+Both triggers are (re)installed or dropped after migrate according to the
+setting (see academics.signals). Other database backends keep the application
+mode.
+"""
+
+from academics.models import FinalExam, FinalExamEligibility, Grade
+
+FUNCTION_NAME = "academics_grade_derive_status"
+TRIGGER_NAME = "academics_grade_derive_status"
+ELIGIBILITY_FUNCTION_NAME = "academics_grade_sync_eligibility"
+ELIGIBILITY_TRIGGER_NAME = "academics_grade_sync_eligibility"
+
+
+def _function_sql():
+    status = Grade.StatusSubject
+    return f"""
+        CREATE OR REPLACE FUNCTION {FUNCTION_NAME}() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status_override IS NOT NULL THEN
+                NEW.status := NEW.status_override;
+            ELSIF NEW.final_grade IS NOT NULL THEN
+                NEW.status := CASE
+                    WHEN NEW.final_grade >= 6 THEN '{status.PROMOTED.value}'
+                    ELSE '{status.REGULAR.value}'
+                END;
+            ELSIF TG_OP = 'UPDATE' AND OLD.final_grade IS NOT NULL THEN
+                NEW.status := '{status.FREE.value}';
+            END IF;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _eligibility_function_sql(connection):
+    qn = connection.ops.quote_name
+    regular = Grade.StatusSubject.REGULAR.value
+    eligibility = qn(FinalExamEligibility._meta.db_table)
+    final_exam = qn(FinalExam._meta.db_table)
+    return f"""
+        CREATE OR REPLACE FUNCTION {ELIGIBILITY_FUNCTION_NAME}() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF OLD.status = NEW.status AND OLD.student_id = NEW.student_id
+                        AND OLD.subject_id = NEW.subject_id THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP <> 'INSERT' THEN
+                IF OLD.status = '{regular}' THEN
+                    DELETE FROM {eligibility} e USING {final_exam} f
+                    WHERE e.final_exam_id = f.id AND f.subject_id = OLD.subject_id
+                        AND e.student_id = OLD.student_id;
+                END IF;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                IF NEW.status = '{regular}' THEN
+                    INSERT INTO {eligibility} (student_id, final_exam_id)
+                    SELECT NEW.student_id, f.id FROM {final_exam} f WHERE f.subject_id = NEW.subject_id
+                    ON CONFLICT DO NOTHING;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """
+
+
+def supports_database_status(connection):
+    """Return True if the connection's backend can run the status trigger."""
+    return connection.vendor == "postgresql"
+
+
+def install_grade_status_trigger(connection):
+    """Create (or replace) the status and eligibility triggers on the Grade table."""
+    table = connection.ops.quote_name(Grade._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(_function_sql())
+        cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table}")
+        cursor.execute(
+            f"CREATE TRIGGER {TRIGGER_NAME} BEFORE INSERT OR UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {FUNCTION_NAME}()"
+        )
+        cursor.execute(_eligibility_function_sql(connection))
+        cursor.execute(f"DROP TRIGGER IF EXISTS {ELIGIBILITY_TRIGGER_NAME} ON {table}")
+        cursor.execute(
+            f"CREATE TRIGGER {ELIGIBILITY_TRIGGER_NAME} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {ELIGIBILITY_FUNCTION_NAME}()"
+        )
+
+
+def drop_grade_status_trigger(connection):
+    """Remove both triggers; status and eligibility are maintained by the application again."""
+    table = connection.ops.quote_name(Grade._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {ELIGIBILITY_TRIGGER_NAME} ON {table}")
+        cursor.execute(f"DROP FUNCTION IF EXISTS {ELIGIBILITY_FUNCTION_NAME}()")
+        cursor.execute(f"DROP TRIGGER IF EXISTS {TRIGGER_NAME} ON {table}")
+        cursor.execute(f"DROP FUNCTION IF EXISTS {FUNCTION_NAME}()")
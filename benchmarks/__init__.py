@@ -0,0 +1,7 @@
+"""Performance benchmarks for SysAcad.
+
+Each benchmark is a management command (``python manage.py bench_<name>``).
+Unless stated otherwise a benchmark creates a throwaway database (the same way
+the test runner does), fills it with synthetic data from benchmarks.fixtures
+and drops it when done, so it never touches real data.
+"""
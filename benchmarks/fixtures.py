@@ -0,0 +1,106 @@
+"""Synthetic data builders shared by the benchmark commands.
+
+All rows are created with bulk_create and a single precomputed password hash,
+so building a few thousand students takes seconds.
+"""
+
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+
+from academics.models import Career, Faculty, FinalExam, Grade, Subject
+from inscriptions.models import SubjectInscription
+from users.models import CustomUser, Student
+
+BENCH_PASSWORD = "bench-pass"
+FIRST_NAMES = [
+    "Lucía", "Martina", "Sofía", "Valentina", "Camila", "Julieta", "Agustina", "Florencia", "Micaela", "Paula",
+    "Mateo", "Santiago", "Juan", "Tomás", "Nicolás", "Lucas", "Joaquín", "Facundo", "Franco", "Ignacio",
+]
+LAST_NAMES = [
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez", "García", "Sánchez",
+    "Romero", "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Benítez", "Acosta", "Medina",
+    "Herrera", "Suárez", "Aguirre", "Giménez", "Gutiérrez", "Pereyra", "Rojas", "Molina", "Castro", "Ortiz",
+]
+
+
+def build_career(code="BEN", subjects=10, students=100, inscribed_ratio=0.5, finals_per_subject=1):
+    """
+    Create one faculty/career with subjects, finals, students, inscriptions and grades.
+
+    Args:
+        code (str): Career code; also used as prefix for subjects, users and students.
+        subjects (int): Number of subjects in the career.
+        students (int): Number of students enrolled in the career.
+        inscribed_ratio (float): Share of subjects each student is inscribed in (with a grade).
+        finals_per_subject (int): Final exam calls created per subject.
+
+    Returns:
+        tuple[Career, list[Student]]: The career and its students.
+    """
+    faculty = Faculty.objects.create(
+        code=f"F{code}"[:10],
+        name=f"Facultad {code}",
+        address="Calle 1",
+        phone="0",
+        email="bench@uni.edu",
+        website="https://uni.edu",
+        dean="Decano",
+        established_date=date(1950, 1, 1),
+    )
+    career = Career.objects.create(
+        code=code, name=f"Carrera {code}", faculty=faculty, director="Director", duration_years=5
+    )
+    subject_objs = Subject.objects.bulk_create(
+        Subject(
+            code=f"{code}{i:04d}"[:10],
+            name=f"Materia {i}",
+            career=career,
+            year=i % 5 + 1,
+            category=Subject.Category.OBLIGATORY,
+            period=Subject.Period.ANNUAL,
+            semanal_hours=4,
+        )
+        for i in range(subjects)
+    )
+    FinalExam.objects.bulk_create(
+        FinalExam(
+            subject=subj,
+            date=date(2025, 7, 1) + timedelta(days=call),
+            location="Aula",
+            duration=timedelta(hours=2),
+            call_number=call + 1,
+        )
+        for subj in subject_objs
+        for call in range(finals_per_subject)
+    )
+
+    password = make_password(BENCH_PASSWORD)
+    users = CustomUser.objects.bulk_create(
+        CustomUser(
+            username=f"{code.lower()}-student-{i}",
+            password=password,
+            role=CustomUser.Role.STUDENT,
+            dni=f"{code}{i:08d}",
+            first_name=f"Nombre{i}",
+            last_name=f"Apellido{i}",
+        )
+        for i in range(students)
+    )
+    student_objs = Student.objects.bulk_create(
+        Student(student_id=f"{code}-{i:07d}", user=user, career=career, enrollment_date=date(2020, 3, 1))
+        for i, user in enumerate(users)
+    )
+
+    taken = max(0, min(subjects, round(subjects * inscribed_ratio)))
+    statuses = list(Grade.StatusSubject.values)
+    for student in student_objs:
+        chosen = subject_objs[:taken]
+        SubjectInscription.objects.bulk_create(
+            SubjectInscription(student=student, subject=subj) for subj in chosen
+        )
+        Grade.objects.bulk_create(
+            Grade(student=student, subject=subj, status=statuses[i % len(statuses)])
+            for i, subj in enumerate(chosen)
+        )
+    return career, student_objs
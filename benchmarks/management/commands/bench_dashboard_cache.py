@@ -0,0 +1,62 @@
+"""Benchmark the per-student dashboard cache.
+
+Measures StudentDashboardService.get_cached_dashboard_data() on a miss (version
+token just bumped) and on a hit, for the local-memory and file-based cache
+backends, next to the uncached builder as a reference.
+
+Usage:
+    python manage.py bench_dashboard_cache --students 200 --subjects 40
+"""
+
+from tempfile import TemporaryDirectory
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from benchmarks.fixtures import build_career
+from benchmarks.utils import format_table, scratch_database, summarize, timed
+from users.services import StudentDashboardService
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "filebased": "django.core.cache.backends.filebased.FileBasedCache",
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark student dashboard cache hit/miss latency per cache backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=200)
+        parser.add_argument("--subjects", type=int, default=40)
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        with scratch_database(keepdb=options["keepdb"]):
+            _, students = build_career(subjects=options["subjects"], students=options["students"])
+            rows = [self._measure("uncached", students, cached=False)]
+            for name, backend in BACKENDS.items():
+                with TemporaryDirectory() as location:
+                    caches = {"default": {"BACKEND": backend, "LOCATION": location}}
+                    with override_settings(CACHES=caches):
+                        rows.append(self._measure(f"{name} miss", students, hit=False))
+                        rows.append(self._measure(f"{name} hit", students, hit=True))
+                        cache.clear()
+
+        headers = ["case", "n", "mean ms", "p50 ms", "p95 ms", "p99 ms"]
+        self.stdout.write(format_table(headers, rows))
+
+    def _measure(self, label, students, cached=True, hit=True):
+        samples = []
+        for student in students:
+            if not cached:
+                _, elapsed = timed(StudentDashboardService.get_dashboard_data, student)
+            else:
+                StudentDashboardService.invalidate_student(student.pk)
+                if hit:
+                    StudentDashboardService.get_cached_dashboard_data(student)
+                _, elapsed = timed(StudentDashboardService.get_cached_dashboard_data, student)
+            samples.append(elapsed)
+        stats = summarize(samples)
+        return [label, stats["n"], stats["mean"], stats["p50"], stats["p95"], stats["p99"]]
@@ -0,0 +1,84 @@
+"""Benchmark DOCX rendering with and without the compiled template registry.
+
+Compares, for the regular certificate and the student file:
+- "per request": a fresh DocxTemplate per render (what the views used to do).
+- "registry": users.documents.render_docx (template compiled once per process).
+
+Both are measured as raw renders and as full requests to the views through the
+Django test client (the view's renderer is swapped for the baseline run).
+
+Usage:
+    python manage.py bench_docx_render --requests 200
+"""
+
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from docxtpl import DocxTemplate
+
+from benchmarks.fixtures import build_career
+from benchmarks.utils import format_table, scratch_database, summarize, timed
+from users.documents import registry, render_docx
+
+TEMPLATES = ("regular_certificate.docx", "ficha_alumno.docx")
+
+
+def render_per_request(path, context):
+    """Baseline: parse and compile the template on every call."""
+    document = DocxTemplate(str(path))
+    document.render(context)
+    output = BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+RENDERERS = {"per request": render_per_request, "registry": render_docx}
+
+
+class Command(BaseCommand):
+    help = "Report DOCX renders and certificate requests per second before/after the template registry."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        context = {
+            "full_name": "Apellido Nombre", "first_name": "Nombre", "last_name": "Apellido", "dni": "30111222",
+            "student_id": "BEN-0000001", "career_name": "Carrera", "career_code": "ING", "faculty_name": "Facultad",
+            "enrollment_date": "01/03/2020", "today_date": "01/03/2025",
+        }
+        rows = []
+        for name in TEMPLATES:
+            path = Path(settings.BASE_DIR) / name
+            registry.clear()
+            for label, renderer in RENDERERS.items():
+                renderer(path, context)  # warm up (compiles the template once for the registry)
+                samples = [timed(renderer, path, context)[1] for _ in range(count)]
+                rows.append(self._row(f"{name} render, {label}", samples))
+
+        with scratch_database(keepdb=options["keepdb"]), override_settings(ALLOWED_HOSTS=["testserver"]):
+            _, students = build_career(code="DOC", subjects=1, students=1)
+            client = Client()
+            client.force_login(students[0].user)
+            url = reverse("users:student-regular-certificate")
+            for label, renderer in RENDERERS.items():
+                with patch("users.views.render_docx", renderer):
+                    client.get(url)
+                    samples = [timed(client.get, url)[1] for _ in range(count)]
+                rows.append(self._row(f"certificate view, {label}", samples))
+
+        headers = ["case", "n", "req/s", "mean ms", "p50 ms", "p99 ms"]
+        self.stdout.write(format_table(headers, rows))
+
+    @staticmethod
+    def _row(label, samples):
+        stats = summarize(samples)
+        return [label, stats["n"], len(samples) / sum(samples), stats["mean"], stats["p50"], stats["p99"]]
@@ -0,0 +1,53 @@
+"""Benchmark the streaming grade import (GradeImportService).
+
+Builds one subject with N inscribed students, writes a CSV with one row per
+student to a temporary upload file and times a dry run and a real import.
+
+Usage:
+    python manage.py bench_grade_import --rows 10000
+"""
+
+import random
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.management.base import BaseCommand
+
+from benchmarks.fixtures import build_career
+from benchmarks.utils import format_table, scratch_database, timed
+from users.services import GradeImportService
+
+
+class Command(BaseCommand):
+    help = "Time a CSV grade import of --rows students into one subject."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        with scratch_database(keepdb=options["keepdb"]):
+            career, students = build_career(code="IMP", subjects=1, students=options["rows"], inscribed_ratio=1)
+            subject = career.subjects.get()
+            rng = random.Random(0)
+
+            with TemporaryUploadedFile("notas.csv", "text/csv", 0, "utf-8") as upload:
+                upload.write(b"legajo;promocion;final\n")
+                for student in students:
+                    upload.write(f"{student.pk};{rng.randint(1, 10)};{rng.randint(1, 10)},5\n".encode())
+                upload.size = upload.tell()
+
+                rows = []
+                for dry_run in (True, False):
+                    upload.seek(0)
+                    report, elapsed = timed(GradeImportService.import_grades, subject, upload, dry_run=dry_run)
+                    rows.append([
+                        "dry run" if dry_run else "import",
+                        report["rows"],
+                        report["updated"],
+                        report["error_count"],
+                        elapsed,
+                        report["rows"] / elapsed if elapsed else 0.0,
+                    ])
+
+        headers = ["case", "rows", "updated", "errors", "seconds", "rows/s"]
+        self.stdout.write(format_table(headers, rows))
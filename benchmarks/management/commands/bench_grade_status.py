@@ -0,0 +1,65 @@
+"""Benchmark set-based Grade status recomputation against the per-instance loop.
+
+For each requested table size, builds a career whose subjects x students give
+that many grades, assigns final grades and compares:
+- Grade.objects.recompute_status(): one UPDATE ... SET status = CASE ...
+- recompute_status(by_subject=True): one UPDATE per subject.
+- Grade.update_status() per row (load + save + signals). At large sizes the loop
+  is timed on --loop-sample rows and extrapolated, unless --full-loop is given.
+
+Usage:
+    python manage.py bench_grade_status --grades 100000 1000000 --subjects 100
+"""
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.db.models.functions import Mod
+
+from academics.models import Grade
+from benchmarks.fixtures import build_career
+from benchmarks.utils import format_table, scratch_database, timed
+
+
+class Command(BaseCommand):
+    help = "Compare set-based Grade.status recomputation with the update_status() loop."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grades", type=int, nargs="+", default=[100000, 1000000])
+        parser.add_argument(
+            "--subjects", type=int, default=100, help="Subjects per career (grades = subjects x students)."
+        )
+        parser.add_argument("--loop-sample", type=int, default=2000, help="Rows timed for the per-instance loop.")
+        parser.add_argument("--full-loop", action="store_true", help="Run the per-instance loop over every row.")
+
+    def handle(self, *args, **options):
+        rows = []
+        for size in options["grades"]:
+            with scratch_database():
+                subjects = min(options["subjects"], size)
+                build_career(code="ST", subjects=subjects, students=-(-size // subjects), inscribed_ratio=1)
+                Grade.objects.update(final_grade=Mod(F("id") * 7, 10) + 1)
+                total = Grade.objects.count()
+
+                for label, by_subject in (("set-based", False), ("set-based by subject", True)):
+                    self._reset()
+                    changed, elapsed = timed(Grade.objects.recompute_status, by_subject=by_subject)
+                    rows.append([label, total, changed, elapsed, total / elapsed, "measured"])
+
+                self._reset()
+                sample = total if options["full_loop"] else min(total, options["loop_sample"])
+                _, elapsed = timed(self._loop, sample)
+                estimate = elapsed * total / sample
+                note = "measured" if sample == total else f"extrapolated from {sample} rows"
+                rows.append(["update_status() loop", total, "-", estimate, total / estimate, note])
+
+        headers = ["case", "grades", "changed", "seconds", "rows/s", "note"]
+        self.stdout.write(format_table(headers, rows))
+
+    @staticmethod
+    def _reset():
+        Grade.objects.update(status=Grade.StatusSubject.REGULAR)
+
+    @staticmethod
+    def _loop(limit):
+        for grade in Grade.objects.order_by("pk")[:limit].iterator(chunk_size=2000):
+            grade.update_status()
@@ -0,0 +1,130 @@
+"""Check that the hot query paths of the views use their indexes.
+
+Builds a synthetic university with benchmarks.seed.UniversitySeeder (50
+careers x 40 subjects, 20k students, ~400k grades and subject inscriptions by
+default), runs ``EXPLAIN ANALYZE`` on the
+querysets behind the grade sheet, the final exam inscription list, the student
+dashboard, the eligibility sync and the per-career exports, and prints the
+execution time and the indexes of each plan. Exits with an error if any plan
+reads the filtered table (the queryset's model) with a sequential scan, unless
+the table is small enough (``--min-rows``) for a sequential scan to be the right
+plan. Tables joined by primary key (select_related) are left to the planner: a
+hash join over a whole table is its choice when the page is a large share of it.
+
+Usage:
+    python manage.py bench_query_plans --students 20000 --faculties 10 --careers 5 --subjects 40
+"""
+
+import re
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from academics.models import Career, FinalExam, Grade, Subject
+from benchmarks.seed import UniversitySeeder
+from benchmarks.utils import format_table, scratch_database
+from inscriptions.models import FinalExamInscription, SubjectInscription
+from users.models import Student
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+SEQ_SCAN = re.compile(r"Seq Scan on (\w+)")
+INDEX = re.compile(r"Index (?:Only )?Scan(?: Backward)? using (\w+)|Bitmap Index Scan on (\w+)")
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN ANALYZE the hot queries on a synthetic dataset; fail on sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=20_000)
+        parser.add_argument("--faculties", type=int, default=10)
+        parser.add_argument("--careers", type=int, default=5, help="Careers per faculty.")
+        parser.add_argument("--subjects", type=int, default=40, help="Subjects per career.")
+        parser.add_argument("--repeat", type=int, default=5, help="EXPLAIN ANALYZE runs per query (median kept).")
+        parser.add_argument(
+            "--min-rows", type=int, default=10_000, help="Sequential scans of smaller tables are not reported."
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("bench_query_plans needs PostgreSQL (EXPLAIN ANALYZE output is backend specific).")
+        with scratch_database(keepdb=options["keepdb"]):
+            if not Student.objects.exists():
+                UniversitySeeder(
+                    faculties=options["faculties"], careers=options["careers"], subjects=options["subjects"],
+                    students=options["students"], professors=options["students"] // 50,
+                    grades=options["subjects"] // 2, final_inscriptions=2,
+                ).run()
+            counts = {model.__name__: model.objects.count() for model in (Student, Grade, SubjectInscription)}
+            rows, failures = [], []
+            sizes = self._table_sizes()
+            for label, queryset in self._cases().items():
+                plan, elapsed = self._explain(queryset, options["repeat"])
+                table = queryset.model._meta.db_table
+                seq_scan = table in SEQ_SCAN.findall(plan) and sizes.get(table, 0) >= options["min_rows"]
+                indexes = sorted({a or b for a, b in INDEX.findall(plan)})
+                rows.append([label, table, elapsed, ", ".join(indexes) or "-", "YES" if seq_scan else "no"])
+                if seq_scan:
+                    failures.append((label, plan))
+
+        self.stdout.write(", ".join(f"{count} {name}" for name, count in counts.items()))
+        self.stdout.write(format_table(["query", "table", "median ms", "indexes", "seq scan"], rows))
+        if failures:
+            for label, plan in failures:
+                self.stderr.write(f"\n{label}:\n{plan}")
+            raise CommandError(f"{len(failures)} query plan(s) use a sequential scan.")
+
+    def _cases(self):
+        """The querysets of the views and services, with representative parameters."""
+        career = Career.objects.order_by("code")[Career.objects.count() // 2]
+        subject = Subject.objects.filter(career=career).order_by("code").first()
+        student = Student.objects.filter(career=career).order_by("student_id").first()
+        final = FinalExam.objects.filter(final_exam_inscriptions__isnull=False, subject__career=career).first()
+        enrolled = SubjectInscription.objects.filter(subject=subject).values_list("student_id", flat=True)
+        return {
+            # users.views._backfill_grades / grade_list
+            "subject inscriptions (students)": enrolled,
+            "grade sheet of a subject": (
+                Grade.objects.filter(subject=subject, student_id__in=list(enrolled))
+                .select_related("student__user")
+                .order_by("student__user__last_name", "student__user__first_name", "pk")
+            ),
+            # FinalExamEligibility.objects.sync_final_exam
+            "regular grades of a subject": Grade.objects.filter(
+                subject=subject, status=Grade.StatusSubject.REGULAR
+            ).values_list("student_id", flat=True),
+            # StudentDashboardService / FinalExamEligibility.objects.sync
+            "regular grades of a student": Grade.objects.filter(student=student, status=Grade.StatusSubject.REGULAR),
+            "grades of a student": Grade.objects.filter(student=student).select_related("subject"),
+            "career plan (dashboard)": Subject.objects.filter(career=career).order_by("year", "name"),
+            "final exams of a subject": FinalExam.objects.filter(subject=subject).order_by("date"),
+            # users.views.professor_final_inscriptions
+            "final exam inscriptions": (
+                FinalExamInscription.objects.filter(final_exam=final)
+                .select_related("student__user")
+                .order_by("student__user__last_name", "student__user__first_name")
+            ),
+            # CertificateService / StudentFileService keyset pages
+            "career export page": (
+                Student.objects.filter(career=career, student_id__gt=student.student_id)
+                .select_related("user", "career__faculty")
+                .order_by("student_id")[:500]
+            ),
+        }
+
+    @staticmethod
+    def _table_sizes():
+        """Planner row estimate of every table (pg_class.reltuples, fresh after ANALYZE)."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'")
+            return dict(cursor.fetchall())
+
+    @staticmethod
+    def _explain(queryset, repeat):
+        """Plan of the last run and median execution time (ms) over repeat runs."""
+        times, plan = [], ""
+        for _ in range(max(1, repeat)):
+            plan = queryset.explain(analyze=True)
+            times.append(float(EXECUTION_TIME.search(plan).group(1)))
+        return plan, statistics.median(times)
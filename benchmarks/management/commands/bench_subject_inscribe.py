@@ -0,0 +1,67 @@
+"""Load test for the subject inscription view (enrollment storm).
+
+Every synthetic student POSTs to users:subject-inscribe for the same subjects
+at once, from N concurrent threads, through the Django test client. Reports
+throughput and latency percentiles per request.
+
+Usage:
+    python manage.py bench_subject_inscribe --students 500 --subjects 2 --concurrency 16
+"""
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from benchmarks.fixtures import build_career
+from benchmarks.utils import format_table, run_concurrently, scratch_database, summarize
+from inscriptions.models import SubjectInscription
+
+
+class Command(BaseCommand):
+    help = "Fire concurrent subject inscription POSTs and report throughput and p99 latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=500)
+        parser.add_argument("--subjects", type=int, default=2, help="Subjects every student inscribes in.")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument(
+            "--repeat", type=int, default=1, help="POSTs per student and subject (simulates double submits)."
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        with scratch_database(keepdb=options["keepdb"]), override_settings(ALLOWED_HOSTS=["testserver"]):
+            career, students = build_career(
+                code="STORM", subjects=options["subjects"], students=options["students"], inscribed_ratio=0
+            )
+            codes = list(career.subjects.values_list("code", flat=True))
+
+            clients = {}
+            for student in students:
+                client = Client()
+                client.force_login(student.user)
+                clients[student.pk] = client
+
+            work = [
+                (clients[student.pk], reverse("users:subject-inscribe", args=[code]))
+                for _ in range(options["repeat"])
+                for code in codes
+                for student in students
+            ]
+            results, samples, wall = run_concurrently(
+                lambda item: item[0].post(item[1]).status_code, work, options["concurrency"]
+            )
+            inscriptions = SubjectInscription.objects.filter(subject__career=career).count()
+
+        stats = summarize(samples)
+        failures = sum(1 for status in results if status != 302)
+        self.stdout.write(format_table(
+            ["requests", "failures", "wall s", "req/s", "p50 ms", "p95 ms", "p99 ms", "max ms"],
+            [[stats["n"], failures, wall, stats["n"] / wall if wall else 0.0,
+              stats["p50"], stats["p95"], stats["p99"], stats["max"]]],
+        ))
+        expected = len(students) * len(codes)
+        self.stdout.write(f"inscriptions: {inscriptions} (expected {expected})")
+        if failures or inscriptions != expected:
+            self.stderr.write(self.style.ERROR("Load test finished with errors."))
@@ -0,0 +1,133 @@
+"""Benchmark the indexed user search against the icontains scan it replaces.
+
+Builds a synthetic population (200k users by default; students, professors and
+administrators with realistic names), then times the first page of the user
+list search (UserSearchService, ordered by username) per kind of query, next
+to the Django admin's former ``search_fields`` lookup (icontains over
+username, dni and email). The plan column reports whether PostgreSQL scans the
+whole users table.
+
+Usage:
+    python manage.py bench_user_search --users 200000 --queries 50
+"""
+
+import random
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from benchmarks.fixtures import BENCH_PASSWORD, FIRST_NAMES, LAST_NAMES
+from benchmarks.utils import format_table, scratch_database, summarize, timed
+from users import search
+from users.models import Administrator, CustomUser, Professor, Student
+from users.services import UserSearchService
+
+PAGE_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = "Benchmark user search latency (indexed search vs. icontains scan) on a synthetic population."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200_000)
+        parser.add_argument("--queries", type=int, default=50, help="Searches timed per case.")
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with scratch_database(keepdb=options["keepdb"]):
+            if not CustomUser.objects.exists():
+                self._populate(options["users"], rng)
+            total = CustomUser.objects.count()
+            students = list(Student.objects.values_list("student_id", flat=True)[:1000])
+            users = list(CustomUser.objects.values_list("dni", "username", "last_name", "first_name")[:1000])
+            count = options["queries"]
+            cases = {
+                "dni exact": [rng.choice(users)[0] for _ in range(count)],
+                "dni prefix (5 digits)": [rng.choice(users)[0][:5] for _ in range(count)],
+                "student_id exact": [rng.choice(students) for _ in range(count)],
+                "username prefix": [rng.choice(users)[1][:8] for _ in range(count)],
+                "last name": [rng.choice(users)[2] for _ in range(count)],
+                "first + last name": ["{3} {2}".format(*rng.choice(users)) for _ in range(count)],
+            }
+            rows = [self._measure(label, terms, self._indexed) for label, terms in cases.items()]
+            rows += [
+                self._measure(f"icontains {label}", terms, self._icontains)
+                for label, terms in cases.items() if label in ("dni exact", "username prefix")
+            ]
+            trigram = search.supports_trigram(connection)
+
+        self.stdout.write(f"{total} users; name matching: {'pg_trgm' if trigram else 'prefix (no pg_trgm)'}")
+        headers = ["case", "n", "mean ms", "p50 ms", "p95 ms", "p99 ms", "rows", "seq scan"]
+        self.stdout.write(format_table(headers, rows))
+
+    @staticmethod
+    def _indexed(term):
+        return UserSearchService.search(CustomUser.objects.all(), term)
+
+    @staticmethod
+    def _icontains(term):
+        return CustomUser.objects.filter(
+            Q(username__icontains=term) | Q(dni__icontains=term) | Q(email__icontains=term)
+        )
+
+    def _measure(self, label, terms, build):
+        samples, found = [], 0
+        for term in terms:
+            page, elapsed = timed(lambda: list(build(term).order_by("username")[:PAGE_SIZE]))
+            samples.append(elapsed)
+            found += len(page)
+        plan = build(terms[0]).order_by("username")[:PAGE_SIZE].explain()
+        seq_scan = f'Seq Scan on {CustomUser._meta.db_table}' in plan
+        stats = summarize(samples)
+        return [
+            label, stats["n"], stats["mean"], stats["p50"], stats["p95"], stats["p99"],
+            round(found / len(terms), 1), "yes" if seq_scan else "no",
+        ]
+
+    def _populate(self, total, rng, batch_size=5000):
+        password = make_password(BENCH_PASSWORD)
+        professors = total // 20
+        admins = max(1, total // 1000)
+        for start in range(0, total, batch_size):
+            users = CustomUser.objects.bulk_create(
+                CustomUser(
+                    username=f"{rng.choice(FIRST_NAMES)[:3].lower()}{rng.choice(LAST_NAMES)[:5].lower()}{i}",
+                    password=password,
+                    role=self._role(i, professors, admins),
+                    dni=f"{20_000_000 + i * 7:08d}",
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    email=f"user{i}@uni.edu",
+                )
+                for i in range(start, min(start + batch_size, total))
+            )
+            Student.objects.bulk_create(
+                Student(student_id=f"L-{u.pk:07d}", user=u, enrollment_date=date(2020, 3, 1))
+                for u in users if u.role == CustomUser.Role.STUDENT
+            )
+            Professor.objects.bulk_create(
+                Professor(
+                    professor_id=f"P-{u.pk:06d}", user=u, degree="Lic.", hire_date=date(2015, 3, 1),
+                    category=Professor.Category.TITULAR,
+                )
+                for u in users if u.role == CustomUser.Role.PROFESSOR
+            )
+            Administrator.objects.bulk_create(
+                Administrator(administrator_id=f"A-{u.pk:06d}", user=u, position="Bedel", hire_date=date(2015, 3, 1))
+                for u in users if u.role == CustomUser.Role.ADMIN
+            )
+        with connection.cursor() as cursor:
+            for model in (CustomUser, Student, Professor, Administrator):
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    @staticmethod
+    def _role(i, professors, admins):
+        if i < admins:
+            return CustomUser.Role.ADMIN
+        if i < admins + professors:
+            return CustomUser.Role.PROFESSOR
+        return CustomUser.Role.STUDENT
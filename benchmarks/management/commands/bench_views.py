@@ -0,0 +1,404 @@
+"""Benchmark every view of the users and accounts apps against a stored baseline.
+
+Drives each URL of ``users/urls.py`` and ``accounts/urls.py`` with the Django
+test client, logged in with the role the view expects, against a seeded
+university (benchmarks.seed.UniversitySeeder in a scratch database, or the
+configured database with ``--existing`` after ``seed_university``). Write
+views are also driven with POST. For each case it records the query count,
+database time, template render time and wall-clock percentiles, and compares
+them with a JSON baseline:
+
+- more queries than the baseline, or a different status code, is a regression;
+- a p50 slower than the baseline by more than ``--tolerance`` (and by at least
+  ``--min-delta-ms``) is a regression, checked only when the dataset matches
+  the baseline's (row counts of the main tables);
+- a URL with no case fails the run, so new views get a budget.
+
+Every request runs in a transaction that is rolled back, and the whole run in
+another one, so the data is left untouched (files go to a temporary directory).
+The cache is a LocMemCache for the run: a database cache would lose its entries
+with every rollback and count cache queries as the view's.
+
+Usage:
+    python manage.py bench_views --requests 20
+    python manage.py bench_views --update-baseline
+    python manage.py bench_views --existing --baseline /tmp/prod-like.json --update-baseline
+"""
+
+import json
+import statistics
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from academics.models import FinalExamEligibility, Grade, Subject
+from accounts import urls as accounts_urls
+from benchmarks.fixtures import BENCH_PASSWORD
+from benchmarks.seed import UniversitySeeder
+from benchmarks.utils import format_table, profiled, scratch_database, summarize
+from inscriptions.models import FinalExamInscription, SubjectInscription
+from users import urls as users_urls
+from users.models import Administrator, CustomUser, DocumentJob, Student
+from users.services import DocumentJobService
+
+DEFAULT_BASELINE = Path(__file__).resolve().parents[2] / "baselines" / "bench_views.json"
+DATASET_MODELS = (Student, Subject, Grade, SubjectInscription, FinalExamInscription)
+# Cache used while measuring (see the module docstring).
+BENCH_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bench_views"}}
+
+
+class _Rollback(Exception):
+    """Raised to roll back the whole run."""
+
+
+class Command(BaseCommand):
+    help = "Benchmark every users/accounts view (queries, DB, render, latency) against a JSON baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20, help="Measured requests per case.")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per case (caches).")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.5, help="Allowed p50 slowdown over the baseline (0.5 = +50%%)."
+        )
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=5.0, help="Slowdowns smaller than this are never regressions."
+        )
+        parser.add_argument(
+            "--existing", action="store_true", help="Use the configured database (seed_university) as is."
+        )
+        parser.add_argument("--students", type=int, default=5_000, help="Scratch dataset size.")
+        parser.add_argument("--faculties", type=int, default=2)
+        parser.add_argument("--careers", type=int, default=5, help="Careers per faculty.")
+        parser.add_argument("--subjects", type=int, default=40, help="Subjects per career.")
+        parser.add_argument("--grades", type=int, default=20, help="Subjects (inscription + grade) per student.")
+        parser.add_argument("--keepdb", action="store_true", help="Reuse the scratch database.")
+
+    def handle(self, *args, **options):
+        if options["existing"]:
+            results, dataset = self._run(options)
+        else:
+            with scratch_database(keepdb=options["keepdb"]):
+                if not Student.objects.exists():
+                    UniversitySeeder(
+                        faculties=options["faculties"], careers=options["careers"], subjects=options["subjects"],
+                        students=options["students"], professors=max(1, options["students"] // 50),
+                        grades=options["grades"], final_inscriptions=2,
+                    ).run()
+                results, dataset = self._run(options)
+
+        baseline_path = Path(options["baseline"])
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+        regressions, rows = self._compare(results, dataset, baseline, options)
+        headers = [
+            "case", "status", "queries", "db ms", "render ms", "p50 ms", "p95 ms", "p99 ms", "base p50", "result",
+        ]
+        self.stdout.write(", ".join(f"{count} {name}" for name, count in dataset.items()))
+        self.stdout.write(format_table(headers, rows))
+
+        if options["update_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"dataset": dataset, "requests": options["requests"], "cases": results}
+            baseline_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}."))
+        elif baseline is None:
+            self.stdout.write(f"No baseline at {baseline_path}; run with --update-baseline to create it.")
+        elif regressions:
+            for line in regressions:
+                self.stderr.write(line)
+            raise CommandError(f"{len(regressions)} performance regression(s) against {baseline_path}.")
+
+    # Running
+
+    def _run(self, options):
+        """Measure every case inside a transaction that is rolled back; returns (results, dataset)."""
+        dataset = {model.__name__: model.objects.count() for model in DATASET_MODELS}
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            DOCUMENT_CACHE_DIR=str(Path(tmp) / "documents"),
+            DOCUMENT_JOB_DIR=str(Path(tmp) / "jobs"),
+            CACHES=BENCH_CACHES,
+        ):
+            try:
+                with transaction.atomic():
+                    cases = self._cases(self._fixtures())
+                    self._check_coverage(cases)
+                    for case in cases:
+                        results[case["label"]] = self._measure(case, options["warmup"], options["requests"])
+                    raise _Rollback
+            except _Rollback:
+                pass
+        return results, dataset
+
+    def _measure(self, case, warmup, requests):
+        """Run one case warmup + requests times; every request is rolled back."""
+        client = Client(raise_request_exception=False)
+        samples, db_times, render_times, queries, status = [], [], [], 0, None
+        for n in range(warmup + max(1, requests)):
+            if case["user"] is not None and "_auth_user_id" not in client.session:
+                client.force_login(case["user"])
+            with transaction.atomic():
+                with profiled() as profile:
+                    start = time.perf_counter()
+                    response = self._request(client, case)
+                    elapsed = time.perf_counter() - start
+                transaction.set_rollback(True)
+            if n < warmup:
+                continue
+            status = response.status_code
+            samples.append(elapsed)
+            db_times.append(profile.db_time * 1000)
+            render_times.append(profile.render_time * 1000)
+            queries = max(queries, profile.queries)
+        stats = summarize(samples)
+        return {
+            "status": status,
+            "queries": queries,
+            "db_ms": round(statistics.median(db_times), 3),
+            "render_ms": round(statistics.median(render_times), 3),
+            **{key: round(stats[key], 3) for key in ("p50", "p95", "p99", "max")},
+        }
+
+    @staticmethod
+    def _request(client, case):
+        """Send the case's request and read the whole body (the client closes streamed responses at the end)."""
+        data = case["data"]() if callable(case["data"]) else case["data"]
+        if case["method"] == "post":
+            response = client.post(case["path"], data)
+        else:
+            response = client.get(case["path"], data)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    # Cases
+
+    def _fixtures(self):
+        """Users and objects the cases need, created inside the rolled back run."""
+        grade = (
+            Grade.objects.filter(status=Grade.StatusSubject.REGULAR, subject__final_exams__isnull=False)
+            .select_related("student__user", "subject")
+            .order_by("pk")
+            .first()
+        )
+        if grade is None:
+            raise CommandError("The dataset has no regular grade with final exams; seed it with seed_university.")
+        student, subject = grade.student, grade.subject
+        final = subject.final_exams.order_by("pk").first()
+        professor = subject.professors.select_related("user").order_by("pk").first()
+        if professor is None:
+            raise CommandError(f"Subject {subject.code} has no professor; seed the dataset with seed_university.")
+        professor.final_exams.add(final)
+
+        admin = CustomUser.objects.create_user(
+            username="bench-views-admin", password=BENCH_PASSWORD, role=CustomUser.Role.ADMIN, dni="bench-views-admin",
+            first_name="Bench", last_name="Admin",
+        )
+        Administrator.objects.create(
+            administrator_id="bench-views", user=admin, position="Bedel", hire_date=date(2020, 3, 1)
+        )
+        student.user.set_password(BENCH_PASSWORD)
+        student.user.save(update_fields=["password"])
+
+        job = DocumentJobService.submit(DocumentJob.Kind.STUDENT_FILE, {"student_id": student.pk}, user=student.user)
+        DocumentJob.objects.filter(pk=job.pk).update(
+            status=DocumentJob.Status.RUNNING, attempts=1, locked_at=timezone.now()
+        )
+        job.refresh_from_db()
+        DocumentJobService.run(job)
+
+        career_students = list(
+            Student.objects.filter(career=student.career).order_by("-student_id").values_list("student_id", flat=True)[:3]
+        )
+        return {
+            "admin": admin,
+            "student": student,
+            "professor": professor,
+            "subject": subject,
+            "final": final,
+            "grade": grade,
+            "job": job,
+            "open_subject": (
+                Subject.objects.filter(career=student.career)
+                .exclude(subject_inscriptions__student=student)
+                .order_by("code")
+                .first()
+            ) or subject,
+            "eligible_final": FinalExamEligibility.objects.filter(student=student).order_by("pk").first().final_exam,
+            "certificate_after": career_students[-1],
+            "faculty": student.career.faculty,
+            "career": student.career,
+        }
+
+    @staticmethod
+    def _case(name, user, method="get", kwargs=None, data=None, label=None):
+        path = reverse(name, kwargs=kwargs)
+        return {
+            "label": label or f"{name} {method.upper()}",
+            "name": name,
+            "user": user,
+            "method": method,
+            "path": path,
+            "data": data or {},
+        }
+
+    def _cases(self, f):
+        """One case per URL (GET, or POST for POST-only views), plus POST for the main write paths."""
+        case = self._case
+        admin, student, professor = f["admin"], f["student"].user, f["professor"].user
+        subject, final, grade = f["subject"], f["final"], f["grade"]
+        cases = [
+            case("login", None),
+            case("login", None, "post", data={"username": student.username, "password": BENCH_PASSWORD}),
+            case("logout", student),
+            case("users:admin-dashboard", admin),
+            case("users:user-list", admin),
+            case("users:user-list", admin, data={"q": student.last_name}, label="users:user-list GET search"),
+            case("users:user-list", admin, data={"format": "csv", "q": student.dni}, label="users:user-list GET csv"),
+            case("users:user-create", admin),
+            case("users:user-edit", admin, kwargs={"pk": student.pk}),
+            case("users:user-delete", admin, kwargs={"pk": student.pk}),
+            case("users:faculty-list", admin),
+            case("users:faculty-create", admin),
+            case("users:faculty-edit", admin, kwargs={"code": f["faculty"].code}),
+            case("users:faculty-delete", admin, kwargs={"code": f["faculty"].code}),
+            case("users:career-list", admin),
+            case("users:career-create", admin),
+            case("users:career-edit", admin, kwargs={"code": f["career"].code}),
+            case("users:career-delete", admin, kwargs={"code": f["career"].code}),
+            case("users:subject-list", admin),
+            case("users:subject-create", admin),
+            case("users:subject-edit", admin, kwargs={"code": subject.code}),
+            case("users:subject-delete", admin, kwargs={"code": subject.code}),
+            case("users:assign-subject-professors", admin, kwargs={"code": subject.code}),
+            case("users:final-list", admin),
+            case("users:final-create", admin),
+            case("users:final-edit", admin, kwargs={"pk": final.pk}),
+            case("users:final-delete", admin, kwargs={"pk": final.pk}),
+            case("users:assign-final-professors", admin, kwargs={"pk": final.pk}),
+            case("users:certificate-batch", admin),
+            case(
+                "users:certificate-batch", admin, data={"career": f["career"].code, "after": f["certificate_after"]},
+                label="users:certificate-batch GET zip",
+            ),
+            case("users:grade-export", admin, data={"subject": subject.code}),
+            case("users:subject-inscription-export", admin, data={"subject": subject.code}),
+            case("users:student-dashboard", student),
+            case("users:subject-inscribe", student, kwargs={"subject_code": f["open_subject"].code}),
+            case("users:subject-inscribe", student, "post", kwargs={"subject_code": f["open_subject"].code}),
+            case("users:subject-inscribe-batch", student, "post", data={"subjects": [f["open_subject"].code]}),
+            case("users:final-inscribe", student, kwargs={"final_exam_id": f["eligible_final"].pk}),
+            case("users:final-inscribe", student, "post", kwargs={"final_exam_id": f["eligible_final"].pk}),
+            case("users:student-regular-certificate", student),
+            case("users:student-file-docx", admin, kwargs={"student_id": f["student"].pk}),
+            case("users:student-file-json", admin, kwargs={"student_id": f["student"].pk}),
+            case("users:student-file-export", admin, data={"career": f["career"].code}),
+            case("users:professor-dashboard", professor),
+            case("users:grade-list", professor, kwargs={"subject_code": subject.code}),
+            case(
+                "users:grade-list", professor, "post", kwargs={"subject_code": subject.code},
+                data=self._grade_grid(subject),
+            ),
+            case("users:grade-import", professor, kwargs={"subject_code": subject.code}),
+            case(
+                "users:grade-import", professor, "post", kwargs={"subject_code": subject.code},
+                data=lambda: {"file": self._grade_sheet(subject)},
+            ),
+            case("users:grade-edit", professor, kwargs={"pk": grade.pk}),
+            case(
+                "users:grade-edit", professor, "post", kwargs={"pk": grade.pk},
+                data={"promotion_grade": "7", "final_grade": "8", "status": grade.status, "notes": ""},
+            ),
+            case("users:professor-final-inscriptions", professor, kwargs={"final_exam_id": final.pk}),
+            case(
+                "users:document-job-submit", student, "post",
+                data={"kind": DocumentJob.Kind.STUDENT_FILE, "student_id": f["student"].pk},
+            ),
+            case("users:document-job-status", student, kwargs={"pk": f["job"].pk}),
+            case("users:document-job-download", student, kwargs={"pk": f["job"].pk}),
+        ]
+        return cases
+
+    @staticmethod
+    def _grade_grid(subject):
+        """POST data of the grading grid with every final grade changed."""
+        grades = list(
+            Grade.objects.filter(subject=subject).order_by("pk").values_list("pk", "promotion_grade", "final_grade")
+        )
+        data = {"form-TOTAL_FORMS": len(grades), "form-INITIAL_FORMS": len(grades)}
+        for i, (pk, promotion, final) in enumerate(grades):
+            data[f"form-{i}-id"] = pk
+            data[f"form-{i}-promotion_grade"] = promotion or ""
+            data[f"form-{i}-final_grade"] = 10 if final != 10 else 9
+            data[f"form-{i}-status"] = Grade.StatusSubject.PROMOTED
+        return data
+
+    @staticmethod
+    def _grade_sheet(subject):
+        """CSV upload setting a final grade for every student of the subject."""
+        lines = ["legajo,promocion,final"] + [
+            f"{student_id},7,{6 + n % 5}"
+            for n, student_id in enumerate(
+                Grade.objects.filter(subject=subject).order_by("student_id").values_list("student_id", flat=True)
+            )
+        ]
+        return SimpleUploadedFile("notas.csv", "\n".join(lines).encode(), content_type="text/csv")
+
+    @staticmethod
+    def _check_coverage(cases):
+        """Fail if a URL of users/urls.py or accounts/urls.py has no case."""
+        covered = {case["name"] for case in cases}
+        names = [f"{users_urls.app_name}:{p.name}" for p in users_urls.urlpatterns] + [
+            p.name for p in accounts_urls.urlpatterns
+        ]
+        missing = [name for name in names if name not in covered]
+        if missing:
+            raise CommandError(f"No benchmark case for: {', '.join(missing)}. Add them to bench_views._cases().")
+
+    # Baseline
+
+    def _compare(self, results, dataset, baseline, options):
+        """Regression messages and table rows for results against baseline (None: nothing to compare)."""
+        cases = baseline["cases"] if baseline else {}
+        same_dataset = bool(baseline) and baseline["dataset"] == dataset
+        if baseline and not same_dataset:
+            self.stdout.write(
+                "Dataset differs from the baseline's; only status codes and query counts are compared."
+            )
+        regressions, rows = [], []
+        for label, result in results.items():
+            base = cases.get(label)
+            problems = []
+            if result["status"] >= 500:
+                problems.append(f"status {result['status']}")
+            if base is not None:
+                if result["status"] != base["status"]:
+                    problems.append(f"status {base['status']} -> {result['status']}")
+                if result["queries"] > base["queries"]:
+                    problems.append(f"queries {base['queries']} -> {result['queries']}")
+                slower = result["p50"] - base["p50"]
+                if (
+                    same_dataset
+                    and slower > base["p50"] * options["tolerance"]
+                    and slower >= options["min_delta_ms"]
+                ):
+                    problems.append(f"p50 {base['p50']:.1f} ms -> {result['p50']:.1f} ms")
+            regressions += [f"{label}: {problem}" for problem in problems]
+            verdict = "REGRESSION" if problems else ("new" if baseline and base is None else "ok")
+            rows.append([
+                label, result["status"], result["queries"], result["db_ms"], result["render_ms"], result["p50"],
+                result["p95"], result["p99"], base["p50"] if base else "-", verdict,
+            ])
+        return regressions, rows
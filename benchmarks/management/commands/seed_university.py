@@ -0,0 +1,68 @@
+"""Fill the configured database with a synthetic university.
+
+Generates faculties, careers, subjects, final exams, professors, students,
+subject inscriptions with their grades and final exam inscriptions (50k
+students and 2M grades by default) with benchmarks.seed.UniversitySeeder, for
+load tests and for trying the views at production scale. Every user's password
+is ``bench-pass``. Unlike the bench_* commands this writes to the real
+database; run ``flush`` first to seed again.
+
+Usage:
+    python manage.py seed_university --students 50000 --grades 40
+    python manage.py seed_university --students 2000 --faculties 2 --no-copy
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.seed import UniversitySeeder
+from benchmarks.utils import format_table
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic university (curriculum, users, inscriptions, grades) for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--faculties", type=int, default=10)
+        parser.add_argument("--careers", type=int, default=5, help="Careers per faculty.")
+        parser.add_argument("--subjects", type=int, default=40, help="Subjects per career.")
+        parser.add_argument("--finals", type=int, default=3, help="Final exam calls per subject.")
+        parser.add_argument("--students", type=int, default=50_000)
+        parser.add_argument("--professors", type=int, default=2_000)
+        parser.add_argument("--grades", type=int, default=40, help="Subjects (inscription + grade) per student.")
+        parser.add_argument(
+            "--final-inscriptions", type=int, default=4, help="Final exam inscriptions per student."
+        )
+        parser.add_argument("--batch-size", type=int, default=100_000, help="Rows per COPY / bulk insert.")
+        parser.add_argument("--no-copy", action="store_true", help="Use bulk_create even on PostgreSQL.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+
+    def handle(self, *args, **options):
+        if UniversitySeeder.is_seeded():
+            raise CommandError("The database already holds a seeded university; run 'manage.py flush' first.")
+        seeder = UniversitySeeder(
+            faculties=options["faculties"],
+            careers=options["careers"],
+            subjects=options["subjects"],
+            finals=options["finals"],
+            students=options["students"],
+            professors=options["professors"],
+            grades=options["grades"],
+            final_inscriptions=options["final_inscriptions"],
+            batch_size=options["batch_size"],
+            use_copy=not options["no_copy"],
+            seed=options["seed"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        start = time.perf_counter()
+        counts = seeder.run()
+        elapsed = time.perf_counter() - start
+
+        total = sum(counts.values())
+        rows = [[label, count] for label, count in counts.items()]
+        self.stdout.write(format_table(["model", "rows"], rows))
+        method = "COPY" if seeder.use_copy else "bulk_create"
+        self.stdout.write(
+            self.style.SUCCESS(f"{total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s, {method}).")
+        )
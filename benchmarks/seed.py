@@ -0,0 +1,298 @@
+"""Synthetic university-scale dataset (``manage.py seed_university``).
+
+Includes:
+- UniversitySeeder: faculties, careers, subjects, final exams, professors, students,
+  subject inscriptions with their grades, and final exam inscriptions.
+
+Notes:
+    Students are generated in chunks and every table is written with
+    PostgreSQL ``COPY ... FROM STDIN`` when available (bulk_create in large
+    batches otherwise). All users share one precomputed password hash, primary
+    keys referenced by other rows are assigned up front (sequences are reset at
+    the end), and FinalExamEligibility is rebuilt with one INSERT ... SELECT,
+    so 50k students and 2M grades load in minutes instead of hours.
+
+    COPY and bulk_create send no signals: the seeder invalidates the dropdown
+    and dashboard caches itself.
+"""
+
+import csv
+import io
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from academics.choices import invalidate_model_choices
+from academics.models import Career, Faculty, FinalExam, FinalExamEligibility, Grade, Subject
+from benchmarks.fixtures import BENCH_PASSWORD, FIRST_NAMES, LAST_NAMES
+from inscriptions.models import FinalExamInscription, SubjectInscription
+from users.models import CustomUser, Professor, Student
+from users.services import StudentDashboardService
+
+COPY_NULL = "\\N"
+
+
+def _batched(rows, size):
+    """Yield lists of up to size items from rows."""
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+class UniversitySeeder:
+    """
+    Generate a synthetic university in the default database.
+
+    Args:
+        faculties (int): Number of faculties.
+        careers (int): Careers per faculty.
+        subjects (int): Subjects per career.
+        finals (int): Final exam calls per subject.
+        students (int): Number of students, spread evenly over the careers.
+        professors (int): Number of professors; each subject gets two of them.
+        grades (int): Subjects each student is inscribed in (each with its Grade),
+            capped by the subjects of the student's career.
+        final_inscriptions (int): Final exam inscriptions per student, among its regular subjects.
+        batch_size (int): Rows per COPY statement (or per bulk_create call).
+        use_copy (bool): Use COPY on PostgreSQL; False forces bulk_create.
+        seed (int): Random seed; the same options always produce the same data.
+        log (Callable[[str], None] | None): Receives one progress line per table.
+
+    Attributes:
+        counts (dict[str, int]): Rows written per model label.
+    """
+
+    STUDENTS_PER_CHUNK = 5000
+    BULK_BATCH_SIZE = 2000
+    FIRST_FACULTY = "F000"
+
+    def __init__(
+        self, faculties=10, careers=5, subjects=40, finals=3, students=50_000, professors=2_000, grades=40,
+        final_inscriptions=4, batch_size=100_000, use_copy=True, seed=42, log=None,
+    ):
+        self.faculties = faculties
+        self.careers = careers
+        self.subjects = subjects
+        self.finals = finals
+        self.students = students
+        self.professors = professors
+        self.grades = grades
+        self.final_inscriptions = final_inscriptions
+        self.batch_size = batch_size
+        self.use_copy = use_copy and connection.vendor == "postgresql"
+        self.rng = random.Random(seed)
+        self.log = log or (lambda line: None)
+        self.counts = {}
+        self.password = make_password(BENCH_PASSWORD)
+        self.now = timezone.now()
+
+    @classmethod
+    def is_seeded(cls):
+        """True if the database already holds a seeded dataset (codes and usernames would clash)."""
+        return Faculty.objects.filter(code=cls.FIRST_FACULTY).exists()
+
+    def run(self):
+        """
+        Generate the whole dataset.
+
+        Returns:
+            dict[str, int]: Rows written per model label.
+        """
+        self._next_user_id = (CustomUser.objects.aggregate(top=Max("id"))["top"] or 0) + 1
+        self._next_final_id = (FinalExam.objects.aggregate(top=Max("id"))["top"] or 0) + 1
+        with transaction.atomic():
+            plan = self._curriculum()
+            self._professors(plan)
+        with transaction.atomic():
+            careers = list(plan)
+            for start in range(0, self.students, self.STUDENTS_PER_CHUNK):
+                numbers = range(start, min(start + self.STUDENTS_PER_CHUNK, self.students))
+                self._students(numbers, careers, plan)
+        self._finish()
+        return self.counts
+
+    # Curriculum
+
+    def _curriculum(self):
+        """Faculties, careers, subjects and final exams; returns {career code: [(subject code, [final ids])]}."""
+        faculty_codes = [f"F{i:03d}" for i in range(self.faculties)]
+        self._write(Faculty, ["code", "name", "address", "phone", "email", "website", "dean", "established_date"], (
+            (code, f"Facultad {i}", "Av. Universidad 1", "0", "facultad@seed.edu", "https://seed.edu",
+             f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}", date(1950 + i % 50, 3, 1))
+            for i, code in enumerate(faculty_codes)
+        ))
+        careers = [(f"C{n:04d}", faculty) for n, (faculty, _) in enumerate(
+            (faculty, i) for faculty in faculty_codes for i in range(self.careers)
+        )]
+        self._write(Career, ["code", "name", "faculty_id", "director", "duration_years"], (
+            (code, f"Carrera {n}", faculty, f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}", 5)
+            for n, (code, faculty) in enumerate(careers)
+        ))
+
+        plan, subjects, finals = {}, [], []
+        periods = list(Subject.Period.values)
+        for career, _ in careers:
+            plan[career] = []
+            for i in range(self.subjects):
+                code = f"S{len(subjects):06d}"
+                category = Subject.Category.OBLIGATORY if self.rng.random() < 0.8 else Subject.Category.ELECTIVE
+                subjects.append((code, f"Materia {i}", career, i % 5 + 1, category, periods[i % 3], 4 + i % 5))
+                calls = []
+                for call in range(self.finals):
+                    calls.append(self._next_final_id)
+                    finals.append((
+                        self._next_final_id, code, date(2025, 2, 10) + timedelta(days=7 * call), f"Aula {i % 20}",
+                        timedelta(hours=2), call + 1,
+                    ))
+                    self._next_final_id += 1
+                plan[career].append((code, calls))
+        self._write(Subject, ["code", "name", "career_id", "year", "category", "period", "semanal_hours"], subjects)
+        self._write(FinalExam, ["id", "subject_id", "date", "location", "duration", "call_number"], finals)
+        return plan
+
+    def _professors(self, plan):
+        """Professors, two per subject and one per final exam."""
+        if not self.professors:
+            return
+        ids = list(range(self._next_user_id, self._next_user_id + self.professors))
+        self._next_user_id += self.professors
+        self._write(CustomUser, self._user_fields(), (
+            self._user(user_id, f"docente{n:05d}", f"{20_000_000 + n}", CustomUser.Role.PROFESSOR)
+            for n, user_id in enumerate(ids)
+        ))
+        categories = list(Professor.Category.values)
+        professor_ids = [f"P{n:07d}" for n in range(self.professors)]
+        self._write(Professor, ["professor_id", "user_id", "degree", "hire_date", "category"], (
+            (professor_id, user_id, "Ing.", date(2000 + n % 24, 3, 1), categories[n % len(categories)])
+            for n, (professor_id, user_id) in enumerate(zip(professor_ids, ids))
+        ))
+
+        subject_rows, final_rows = [], []
+        for subjects in plan.values():
+            for code, calls in subjects:
+                staff = self.rng.sample(professor_ids, min(2, len(professor_ids)))
+                subject_rows += [(professor_id, code) for professor_id in staff]
+                final_rows += [(staff[0], final_id) for final_id in calls]
+        self._write(Professor.subjects.through, ["professor_id", "subject_id"], subject_rows)
+        self._write(Professor.final_exams.through, ["professor_id", "finalexam_id"], final_rows)
+
+    # Students
+
+    def _students(self, numbers, careers, plan):
+        """One chunk of students with their inscriptions, grades and final exam inscriptions."""
+        ids = list(range(self._next_user_id, self._next_user_id + len(numbers)))
+        self._next_user_id += len(numbers)
+        self._write(CustomUser, self._user_fields(), (
+            self._user(user_id, f"alumno{n:06d}", f"{30_000_000 + n}", CustomUser.Role.STUDENT)
+            for n, user_id in zip(numbers, ids)
+        ))
+        students = [(f"L{n:08d}", careers[n % len(careers)]) for n in numbers]
+        self._write(Student, ["student_id", "user_id", "career_id", "enrollment_date"], (
+            (student_id, user_id, career, date(2015 + self.rng.randrange(10), 3, 1))
+            for (student_id, career), user_id in zip(students, ids)
+        ))
+
+        inscriptions, grades, final_inscriptions = [], [], []
+        for student_id, career in students:
+            subjects = plan[career]
+            regular = []
+            for code, calls in self.rng.sample(subjects, min(self.grades, len(subjects))):
+                final_grade, status = self._final_grade()
+                inscriptions.append((student_id, code))
+                grades.append((student_id, code, Decimal(self.rng.randint(10, 100)) / 10, final_grade, status))
+                if status == Grade.StatusSubject.REGULAR and calls:
+                    regular.append(calls)
+            for calls in regular[: self.final_inscriptions]:
+                final_inscriptions.append((student_id, self.rng.choice(calls)))
+        self._write(SubjectInscription, ["student_id", "subject_id"], inscriptions)
+        self._write(Grade, ["student_id", "subject_id", "promotion_grade", "final_grade", "status"], grades)
+        self._write(FinalExamInscription, ["student_id", "final_exam_id"], final_inscriptions)
+
+    def _final_grade(self):
+        """(final_grade, status) following Grade.derive_status(): 30% free, 40% promoted, 30% regular."""
+        roll = self.rng.random()
+        if roll < 0.3:
+            return None, Grade.StatusSubject.FREE
+        if roll < 0.7:
+            return Decimal(self.rng.randint(60, 100)) / 10, Grade.StatusSubject.PROMOTED
+        return Decimal(self.rng.randint(20, 59)) / 10, Grade.StatusSubject.REGULAR
+
+    @staticmethod
+    def _user_fields():
+        return ["id", "username", "password", "role", "dni", "first_name", "last_name", "email", "date_joined"]
+
+    def _user(self, user_id, username, dni, role):
+        return (
+            user_id, username, self.password, role, dni, self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES),
+            f"{username}@seed.edu", self.now,
+        )
+
+    # Writing
+
+    def _write(self, model, fields, rows):
+        """Insert rows (tuples of values for fields, by attname) in batches of batch_size."""
+        label = model._meta.label
+        start = time.perf_counter()
+        written = 0
+        for batch in _batched(rows, self.batch_size):
+            if self.use_copy:
+                self._copy(model, fields, batch)
+            else:
+                model.objects.bulk_create(
+                    [model(**dict(zip(fields, row))) for row in batch], batch_size=self.BULK_BATCH_SIZE
+                )
+            written += len(batch)
+        self.counts[label] = self.counts.get(label, 0) + written
+        if written:
+            self.log(f"{label}: {written} rows in {time.perf_counter() - start:.1f}s")
+
+    def _copy(self, model, fields, batch):
+        """COPY one batch; columns not in fields get their model defaults (auto_now fields: now)."""
+        meta = model._meta
+        given = [meta.get_field(name) for name in fields]
+        extra = [f for f in meta.concrete_fields if f not in given and f is not meta.auto_field]
+        defaults = [self._default(f) for f in extra]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow([COPY_NULL if value is None else value for value in (*row, *defaults)])
+        buffer.seek(0)
+
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(f.column) for f in (*given, *extra))
+        sql = f"COPY {qn(meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def _default(self, field):
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            return self.now if isinstance(field, models.DateTimeField) else timezone.localdate(self.now)
+        return field.get_default()
+
+    def _finish(self):
+        """Reset sequences, rebuild derived rows, drop stale caches and refresh planner statistics."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [CustomUser, FinalExam]):
+                cursor.execute(sql)
+        start = time.perf_counter()
+        eligible = FinalExamEligibility.objects.rebuild()
+        self.counts[FinalExamEligibility._meta.label] = eligible
+        self.log(f"{FinalExamEligibility._meta.label}: {eligible} rows in {time.perf_counter() - start:.1f}s")
+        invalidate_model_choices()
+        StudentDashboardService.invalidate_curriculum()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
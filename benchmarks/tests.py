@@ -0,0 +1,90 @@
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from academics.models import FinalExam, FinalExamEligibility, Grade
+from benchmarks.fixtures import BENCH_PASSWORD
+from inscriptions.models import FinalExamInscription, SubjectInscription
+from users import urls as users_urls
+from users.models import CustomUser, Professor, Student
+
+
+class SeedUniversityCommandTest(TestCase):
+    options = dict(faculties=1, careers=2, subjects=6, finals=2, students=30, professors=3, grades=4,
+                   final_inscriptions=2, batch_size=50, stdout=StringIO())
+
+    def check_dataset(self):
+        self.assertEqual(Student.objects.count(), 30)
+        self.assertEqual(Professor.objects.count(), 3)
+        self.assertEqual(Grade.objects.count(), 120)
+        self.assertEqual(SubjectInscription.objects.count(), 120)
+        self.assertEqual(FinalExam.objects.count(), 24)
+        for grade in Grade.objects.all():
+            self.assertEqual(grade.status, grade.derive_status())
+        regular = set(
+            Grade.objects.filter(status=Grade.StatusSubject.REGULAR).values_list('student_id', 'subject_id')
+        )
+        for student_id, subject_id in FinalExamInscription.objects.values_list('student_id', 'final_exam__subject'):
+            self.assertIn((student_id, subject_id), regular)
+        self.assertEqual(
+            FinalExamEligibility.objects.count(),
+            Grade.objects.filter(status=Grade.StatusSubject.REGULAR).count() * 2,
+        )
+        user = CustomUser.objects.get(username='alumno000000')
+        self.assertTrue(user.check_password(BENCH_PASSWORD))
+        self.assertEqual(user.student.career_id, 'C0000')
+        # Sequences were reset after the explicit ids.
+        CustomUser.objects.create_user(username='nuevo', dni='1', role=CustomUser.Role.STUDENT)
+
+    def test_seed_with_copy(self):
+        call_command('seed_university', **self.options)
+        self.check_dataset()
+
+    def test_seed_with_bulk_create(self):
+        call_command('seed_university', no_copy=True, **self.options)
+        self.check_dataset()
+
+    def test_refuses_to_seed_twice(self):
+        call_command('seed_university', **self.options)
+        with self.assertRaises(CommandError):
+            call_command('seed_university', **self.options)
+
+
+class BenchViewsCommandTest(TestCase):
+    def setUp(self):
+        call_command('seed_university', faculties=1, careers=1, subjects=4, finals=1, students=10, professors=2,
+                     grades=3, final_inscriptions=1, stdout=StringIO())
+        self.baseline = Path(self.enterContext(TemporaryDirectory())) / 'baseline.json'
+
+    def bench(self, **options):
+        call_command('bench_views', existing=True, requests=1, warmup=0, baseline=str(self.baseline),
+                     stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_measures_every_view_and_leaves_data_untouched(self):
+        grades = list(Grade.objects.order_by('pk').values_list('pk', 'final_grade', 'status'))
+        self.bench(update_baseline=True)
+        cases = json.loads(self.baseline.read_text())['cases']
+        names = {label.split(' ')[0] for label in cases}
+        for pattern in users_urls.urlpatterns:
+            self.assertIn(f'users:{pattern.name}', names)
+        self.assertIn('login', names)
+        for label, result in cases.items():
+            self.assertLess(result['status'], 500, label)
+            self.assertGreater(result['p50'], 0, label)
+        self.assertEqual(list(Grade.objects.order_by('pk').values_list('pk', 'final_grade', 'status')), grades)
+        self.assertFalse(CustomUser.objects.filter(role=CustomUser.Role.ADMIN).exists())
+
+    def test_more_queries_than_the_baseline_fail(self):
+        # A single sample is too noisy for latency budgets; only query counts are checked here.
+        self.bench(update_baseline=True)
+        self.bench(tolerance=100)
+        baseline = json.loads(self.baseline.read_text())
+        baseline['cases']['users:student-dashboard GET']['queries'] -= 1
+        self.baseline.write_text(json.dumps(baseline))
+        with self.assertRaisesMessage(CommandError, '1 performance regression'):
+            self.bench(tolerance=100)
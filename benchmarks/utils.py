@@ -0,0 +1,188 @@
+"""Shared helpers for benchmark commands.
+
+Includes:
+- scratch_database: context manager that runs the block against a throwaway test database.
+- timed: measure the wall-clock duration of a callable.
+- summarize: latency percentiles for a list of samples.
+- run_concurrently: run a callable over items from N threads, collecting latencies.
+- profiled: count queries, database time and template render time of a block.
+- format_table: render rows as a fixed-width text table.
+"""
+
+import queue
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connection, connections
+from django.template.base import Template
+
+
+@contextmanager
+def scratch_database(keepdb=False):
+    """
+    Create a throwaway database, migrate it and point the default connection at it.
+
+    Args:
+        keepdb (bool): Reuse (and keep) the database between runs, like ``test --keepdb``.
+
+    Yields:
+        str: Name of the scratch database.
+    """
+    old_name = connection.settings_dict["NAME"]
+    name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb, serialize=False)
+    try:
+        yield name
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def timed(func, *args, **kwargs):
+    """Call func and return (result, elapsed_seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile (nearest-rank) of samples."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def summarize(samples):
+    """
+    Summarize latency samples (seconds) in milliseconds.
+
+    Returns:
+        dict: n, mean, p50, p95, p99 and max.
+    """
+    to_ms = 1000.0
+    return {
+        "n": len(samples),
+        "mean": statistics.fmean(samples) * to_ms if samples else 0.0,
+        "p50": percentile(samples, 50) * to_ms,
+        "p95": percentile(samples, 95) * to_ms,
+        "p99": percentile(samples, 99) * to_ms,
+        "max": max(samples) * to_ms if samples else 0.0,
+    }
+
+
+def run_concurrently(func, items, concurrency):
+    """
+    Call func(item) for every item from `concurrency` worker threads.
+
+    Each worker uses its own database connection and closes it on exit, so the
+    scratch database can be dropped afterwards.
+
+    Args:
+        func (Callable): Work for one item; its return value is collected.
+        items (Iterable): Work items.
+        concurrency (int): Number of worker threads.
+
+    Returns:
+        tuple[list, list[float], float]: Results, per-item latencies in seconds
+        and total wall-clock seconds.
+    """
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+    results, samples, lock = [], [], threading.Lock()
+
+    def worker():
+        try:
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    return
+                result, elapsed = timed(func, item)
+                with lock:
+                    results.append(result)
+                    samples.append(elapsed)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, samples, time.perf_counter() - start
+
+
+class Profile:
+    """
+    What a profiled() block spent, in seconds.
+
+    Attributes:
+        queries (int): Statements executed on the default connection.
+        db_time (float): Time spent executing them.
+        render_time (float): Time spent rendering Django templates, excluding the
+            queries run from the templates (lazy querysets), which count as db_time.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self._depth = 0
+
+
+@contextmanager
+def profiled():
+    """
+    Profile the block's database and template work on the current thread.
+
+    Queries are timed with connection.execute_wrapper(): for server-side cursors
+    (QuerySet.iterator) only the statement and its first fetch are measured.
+    Template time is taken around the outermost Template.render() call, so
+    included templates are not counted twice.
+
+    Yields:
+        Profile: Filled in while the block runs.
+    """
+    profile = Profile()
+    original_render = Template.render
+
+    def execute(run, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return run(sql, params, many, context)
+        finally:
+            profile.queries += 1
+            profile.db_time += time.perf_counter() - start
+
+    def render(template, context):
+        if profile._depth:
+            return original_render(template, context)
+        profile._depth += 1
+        start, db_before = time.perf_counter(), profile.db_time
+        try:
+            return original_render(template, context)
+        finally:
+            profile._depth -= 1
+            profile.render_time += time.perf_counter() - start - (profile.db_time - db_before)
+
+    Template.render = render
+    try:
+        with connection.execute_wrapper(execute):
+            yield profile
+    finally:
+        Template.render = original_render
+
+
+def format_table(headers, rows):
+    """Render headers and rows as a left-aligned text table."""
+    cells = [[str(h) for h in headers]] + [
+        [f"{c:.3f}" if isinstance(c, float) else str(c) for c in row] for row in rows
+    ]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(headers))]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(r, widths)) for r in cells]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
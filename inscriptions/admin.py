@@ -1,21 +1,43 @@
 """Django admin registrations for the Inscriptions app.
 
-Registers SubjectInscription and FinalExamInscription with basic list and search configuration.
+Registers SubjectInscription, FinalExamInscription and Waitlist with basic list and search configuration.
+
+Notes:
+    Changelists load the relations printed by their columns (list_select_related),
+    foreign keys use autocomplete widgets, and rows are searched by student or
+    subject code through indexed subqueries (users.admin mixins).
 """
 
 from django.contrib import admin
-from .models import SubjectInscription, FinalExamInscription
+
+from users.admin import ScalableAdminMixin, StudentRecordSearchMixin
+from .models import SubjectInscription, FinalExamInscription, Waitlist
 
 
 @admin.register(SubjectInscription)
-class SubjectInscriptionAdmin(admin.ModelAdmin):
+class SubjectInscriptionAdmin(StudentRecordSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for SubjectInscription: student, subject and inscription date."""
     list_display = ("student", "subject", "inscription_date")
-    search_fields = ("student__user__username", "subject__name", "subject__code")
+    list_select_related = ("student__user", "subject__career")
+    autocomplete_fields = ("student", "subject")
+    search_fields = ("student__student_id", "subject__code")
 
 
 @admin.register(FinalExamInscription)
-class FinalExamInscriptionAdmin(admin.ModelAdmin):
+class FinalExamInscriptionAdmin(StudentRecordSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for FinalExamInscription: student, final exam and inscription date."""
     list_display = ("student", "final_exam", "inscription_date")
-    search_fields = ("student__user__username", "final_exam__subject__name", "final_exam__subject__code")
+    list_select_related = ("student__user", "final_exam__subject")
+    autocomplete_fields = ("student", "final_exam")
+    search_fields = ("student__student_id", "final_exam__subject__code")
+    subject_fields = ("final_exam__subject",)
+
+
+@admin.register(Waitlist)
+class WaitlistAdmin(StudentRecordSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
+    """Admin for Waitlist: student, target and queue position."""
+    list_display = ("student", "subject", "final_exam", "created_at")
+    list_select_related = ("student__user", "subject__career", "final_exam__subject")
+    autocomplete_fields = ("student", "subject", "final_exam")
+    search_fields = ("student__student_id", "subject__code", "final_exam__subject__code")
+    subject_fields = ("subject", "final_exam__subject")
@@ -0,0 +1,39 @@
+"""Waitlist promotion worker.
+
+Hands freed seats in subjects and final exams to the oldest waitlist entries.
+Entries are locked with SELECT ... FOR UPDATE SKIP LOCKED, so several worker
+processes can run at the same time without promoting anyone twice.
+
+Usage:
+    python manage.py promote_waitlist              # drain once and exit
+    python manage.py promote_waitlist --loop       # keep polling
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services import WaitlistService
+
+
+class Command(BaseCommand):
+    help = "Promote waitlisted students into subjects/final exams with free seats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Entries locked per transaction.")
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when idle.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when idle (--loop).")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            promoted, handled = WaitlistService.promote(batch_size=options["batch_size"])
+            total += promoted
+            if promoted:
+                self.stdout.write(f"Promoted {promoted} waitlisted student(s).")
+            if handled:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} student(s) promoted."))
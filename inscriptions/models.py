@@ -3,6 +3,7 @@
 Defines:
 - SubjectInscription: links a Student to a Subject (course) with an inscription date.
 - FinalExamInscription: links a Student to a FinalExam session.
+- Waitlist: FIFO queue of students waiting for a seat in a full Subject or FinalExam.
 
 Notes:
     - Uniqueness constraints enforce one inscription per (student, subject) and (student, final_exam).
@@ -11,6 +12,7 @@ Notes:
 """
 
 from django.db import models
+from django.db.models import Q
 
 
 class SubjectInscription(models.Model):
@@ -24,9 +26,15 @@ class SubjectInscription(models.Model):
 
     Meta:
         unique_together: Ensures a student cannot enroll in the same subject twice.
+        indexes: (subject, student) lists a subject's students from the index alone; with the
+            unique (student, subject) index it replaces both plain FK indexes.
     """
-    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='subjects_inscriptions')
-    subject = models.ForeignKey('academics.Subject', on_delete=models.CASCADE, related_name='subject_inscriptions')
+    student = models.ForeignKey(
+        'users.Student', on_delete=models.CASCADE, related_name='subjects_inscriptions', db_index=False
+    )
+    subject = models.ForeignKey(
+        'academics.Subject', on_delete=models.CASCADE, related_name='subject_inscriptions', db_index=False
+    )
     inscription_date = models.DateField(auto_now_add=True)
 
     def __str__(self):
@@ -35,6 +43,7 @@ class SubjectInscription(models.Model):
 
     class Meta:
         unique_together = ('student', 'subject')
+        indexes = [models.Index(fields=['subject', 'student'], name='subject_inscr_subject_idx')]
 
 
 class FinalExamInscription(models.Model):
@@ -48,9 +57,15 @@ class FinalExamInscription(models.Model):
 
     Meta:
         unique_together: Ensures a student cannot enroll in the same final exam twice.
+        indexes: (final_exam, student) lists a session's students from the index alone; with the
+            unique (student, final_exam) index it replaces both plain FK indexes.
     """
-    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='final_exam_inscriptions')
-    final_exam = models.ForeignKey('academics.FinalExam', on_delete=models.CASCADE, related_name='final_exam_inscriptions')
+    student = models.ForeignKey(
+        'users.Student', on_delete=models.CASCADE, related_name='final_exam_inscriptions', db_index=False
+    )
+    final_exam = models.ForeignKey(
+        'academics.FinalExam', on_delete=models.CASCADE, related_name='final_exam_inscriptions', db_index=False
+    )
     inscription_date = models.DateField(auto_now_add=True)
 
     def __str__(self):
@@ -59,3 +74,58 @@ class FinalExamInscription(models.Model):
 
     class Meta:
         unique_together = ('student', 'final_exam')
+        indexes = [models.Index(fields=['final_exam', 'student'], name='final_inscription_final_idx')]
+
+
+class Waitlist(models.Model):
+    """
+    Waiting entry for a seat in a full Subject or FinalExam.
+
+    Exactly one of subject/final_exam is set (the "target"). Entries are promoted
+    in created_at order by the promote_waitlist worker once a seat is freed.
+
+    Attributes:
+        student (users.Student): Student waiting for a seat.
+        subject (academics.Subject | None): Target subject, if waiting for a course.
+        final_exam (academics.FinalExam | None): Target final exam session, if waiting for a final.
+        created_at (datetime): Queue position; auto-populated.
+
+    Meta:
+        unique_together: A student waits at most once per target.
+        indexes: (created_at, id) for the global FIFO walk of WaitlistService.promote(),
+            and (target, created_at) for queue positions in WaitlistService.join().
+    """
+    student = models.ForeignKey('users.Student', on_delete=models.CASCADE, related_name='waitlist_entries')
+    subject = models.ForeignKey(
+        'academics.Subject', on_delete=models.CASCADE, related_name='waitlist_entries', null=True, blank=True
+    )
+    final_exam = models.ForeignKey(
+        'academics.FinalExam', on_delete=models.CASCADE, related_name='waitlist_entries', null=True, blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        """Human-readable representation used in admin and logs."""
+        return f"{self.student_id} waiting for {self.target} ({self.created_at:%Y-%m-%d %H:%M})"
+
+    @property
+    def target(self):
+        """The Subject or FinalExam this entry waits for."""
+        return self.subject if self.subject_id else self.final_exam
+
+    class Meta:
+        unique_together = [('student', 'subject'), ('student', 'final_exam')]
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='waitlist_fifo'),
+            models.Index(fields=['subject', 'created_at'], name='waitlist_subject_queue'),
+            models.Index(fields=['final_exam', 'created_at'], name='waitlist_final_queue'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    Q(subject__isnull=False, final_exam__isnull=True)
+                    | Q(subject__isnull=True, final_exam__isnull=False)
+                ),
+                name='waitlist_single_target',
+            ),
+        ]
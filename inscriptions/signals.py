@@ -0,0 +1,60 @@
+"""Signal handlers for the Inscriptions app.
+
+Keeps Subject/FinalExam seats_taken consistent with the inscriptions:
+- Saving or deleting an inscription recounts the seats of its capped target, so
+  rows written outside the services (admin, shell) are counted and a deletion
+  gives its seat back.
+- Deleting an inscription promotes the head of its target's waitlist once the
+  transaction commits; the promote_waitlist worker remains the backstop (e.g.
+  for seats freed by raising a capacity).
+- Saving a capped Subject or FinalExam recounts its seats, so a capacity added to
+  a target that already has inscriptions starts from the real number.
+
+Notes:
+    The services claim seats themselves (claim_seat) and write inscriptions with
+    bulk_create, which sends no post_save; the seeder leaves targets uncapped.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from academics.models import FinalExam, Subject
+from inscriptions.models import FinalExamInscription, SubjectInscription
+
+
+@receiver(post_save, sender=SubjectInscription)
+@receiver(post_delete, sender=SubjectInscription)
+def recount_subject_seats(sender, instance, raw=False, **kwargs):
+    """Recount the seats of the subject of a saved or deleted inscription."""
+    if not raw:
+        Subject(pk=instance.subject_id).recount_seats()
+
+
+@receiver(post_save, sender=FinalExamInscription)
+@receiver(post_delete, sender=FinalExamInscription)
+def recount_final_exam_seats(sender, instance, raw=False, **kwargs):
+    """Recount the seats of the final exam of a saved or deleted inscription."""
+    if not raw:
+        FinalExam(pk=instance.final_exam_id).recount_seats()
+
+
+@receiver(post_delete, sender=SubjectInscription)
+@receiver(post_delete, sender=FinalExamInscription)
+def promote_waitlist_on_delete(sender, instance, **kwargs):
+    """Hand the freed seat to the head of the target's waitlist after commit."""
+    from users.services import WaitlistService
+
+    if sender is SubjectInscription:
+        target = {"subject": Subject(pk=instance.subject_id)}
+    else:
+        target = {"final_exam": FinalExam(pk=instance.final_exam_id)}
+    transaction.on_commit(lambda: WaitlistService.promote(**target))
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_save, sender=FinalExam)
+def recount_seats(sender, instance, raw=False, **kwargs):
+    """Recount seats when a capped subject or final exam is saved."""
+    if instance.capacity is not None and not raw:
+        instance.recount_seats()
@@ -1,5 +1,6 @@
+from django.db import IntegrityError
 from django.test import TestCase
-from inscriptions.models import SubjectInscription, FinalExamInscription
+from inscriptions.models import SubjectInscription, FinalExamInscription, Waitlist
 from users.models import CustomUser, Student
 from academics.models import Subject, FinalExam, Career, Faculty
 import datetime
@@ -106,3 +107,57 @@ class FinalExamInscriptionModelTest(TestCase):
         self.assertEqual(inscription.final_exam.subject.name, 'Matemática')
         self.assertIsNotNone(inscription.inscription_date)
         self.assertIn('student1', str(inscription))
+
+
+class WaitlistModelTest(TestCase):
+    def setUp(self):
+        self.faculty = Faculty.objects.create(
+            code='F1',
+            name='Facultad de Ingeniería',
+            dean='Decano Ejemplo',
+            established_date='1950-01-01'
+        )
+        self.career = Career.objects.create(
+            name='Ingeniería',
+            code='ING',
+            faculty=self.faculty,
+            director='Director',
+            duration_years=5
+        )
+        self.subject = Subject.objects.create(
+            name='Matemática',
+            code='MAT101',
+            career=self.career,
+            year=1,
+            category=Subject.Category.OBLIGATORY,
+            period=Subject.Period.FIRST,
+            semanal_hours=6
+        )
+        self.final_exam = FinalExam.objects.create(
+            subject=self.subject,
+            date=datetime.date(2024, 7, 1),
+            location='Aula 1',
+            duration=datetime.timedelta(hours=2),
+            call_number=1
+        )
+        self.user = CustomUser.objects.create_user(
+            username='student1',
+            password='testpass',
+            role=CustomUser.Role.STUDENT,
+            dni='12345678'
+        )
+        self.student = Student.objects.create(
+            student_id='S1',
+            user=self.user,
+            career=self.career,
+            enrollment_date='2022-01-01'
+        )
+
+    def test_entry_targets_subject(self):
+        entry = Waitlist.objects.create(student=self.student, subject=self.subject)
+        self.assertEqual(entry.target, self.subject)
+        self.assertIn('S1', str(entry))
+
+    def test_entry_requires_exactly_one_target(self):
+        with self.assertRaises(IntegrityError):
+            Waitlist.objects.create(student=self.student, subject=self.subject, final_exam=self.final_exam)
@@ -24,6 +24,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Generated files that only authenticated views may serve (document cache, job outputs).
+# Must stay outside MEDIA_ROOT, which is served without authentication in development.
+PRIVATE_FILES_ROOT = Path(os.getenv('PRIVATE_FILES_ROOT', str(BASE_DIR / 'private')))
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -45,10 +49,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'users.apps.UsersConfig',
     'academics.apps.AcademicsConfig',
     'inscriptions.apps.InscriptionsConfig',
     'accounts.apps.AccountsConfig',
+    'benchmarks.apps.BenchmarksConfig',
 ]
 
 MIDDLEWARE = [
@@ -96,6 +102,71 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# The dashboard and dropdown caches are invalidated from any process (web workers, promote_waitlist,
+# recompute_grade_status, seed_university), so the backend must be shared: the database by default
+# (table created by migrate), or e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache with
+# CACHE_LOCATION=redis://host:6379. Per-process backends (LocMemCache) are reported by `manage.py check`.
+# Each student holds a version token and a dashboard entry, so CACHE_MAX_ENTRIES must exceed twice the students.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'users.cache.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '200000'))},
+    }
+}
+
+# Seconds a student's dashboard context stays cached (invalidated earlier by signals).
+STUDENT_DASHBOARD_CACHE_TIMEOUT = int(os.getenv('STUDENT_DASHBOARD_CACHE_TIMEOUT', '900'))
+
+# Seconds the rendered faculty/career/subject dropdowns stay cached (invalidated earlier by signals).
+MODEL_CHOICE_CACHE_TIMEOUT = int(os.getenv('MODEL_CHOICE_CACHE_TIMEOUT', '3600'))
+
+# Who derives Grade.status from final_grade: "application" (Python, on save paths)
+# or "database" (PostgreSQL trigger installed by migrate; covers admin and bulk writes).
+GRADE_STATUS_MODE = os.getenv('GRADE_STATUS_MODE', 'application')
+
+# DOCX rendering backend (users.documents): "inline" renders in the request worker,
+# "process" offloads to a bounded pool of worker processes and answers 503 when full.
+DOCX_RENDER_BACKEND = os.getenv('DOCX_RENDER_BACKEND', 'inline')
+DOCX_RENDER_POOL_SIZE = int(os.getenv('DOCX_RENDER_POOL_SIZE', str(os.cpu_count() or 2)))
+DOCX_RENDER_TIMEOUT = float(os.getenv('DOCX_RENDER_TIMEOUT', '10'))
+DOCX_RENDER_MAX_PENDING = int(os.getenv('DOCX_RENDER_MAX_PENDING', str(2 * DOCX_RENDER_POOL_SIZE)))
+DOCX_PRELOAD_TEMPLATES = [BASE_DIR / 'regular_certificate.docx', BASE_DIR / 'ficha_alumno.docx']
+# Worker processes for bulk certificate ZIPs (admin endpoint and generate_certificates); 1 renders inline.
+DOCX_BATCH_WORKERS = int(os.getenv('DOCX_BATCH_WORKERS', str(DOCX_RENDER_POOL_SIZE)))
+# Bulk ZIP downloads a web process renders at once; further requests answer 503.
+DOCX_BATCH_MAX_CONCURRENT = int(os.getenv('DOCX_BATCH_MAX_CONCURRENT', '1'))
+
+# Rendered certificates/student files, stored under a hash of their inputs (users.documents.DocumentCache).
+# Least recently used files are evicted beyond DOCUMENT_CACHE_MAX_BYTES; 0 disables the cache.
+DOCUMENT_CACHE_DIR = os.getenv('DOCUMENT_CACHE_DIR', str(PRIVATE_FILES_ROOT / 'documents'))
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv('DOCUMENT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# Queued document jobs (users.models.DocumentJob, run by the run_document_jobs worker). Outputs are written
+# to an unguessable directory per job and served only by the document_job_download view; they are kept
+# DOCUMENT_JOB_TTL seconds; failed attempts are retried after DOCUMENT_JOB_RETRY_DELAY * 2 ** (attempt - 1)
+# seconds; a job running for more than DOCUMENT_JOB_LEASE seconds is considered abandoned and requeued.
+DOCUMENT_JOB_DIR = os.getenv('DOCUMENT_JOB_DIR', str(PRIVATE_FILES_ROOT / 'jobs'))
+DOCUMENT_JOB_TTL = int(os.getenv('DOCUMENT_JOB_TTL', str(24 * 60 * 60)))
+DOCUMENT_JOB_MAX_ATTEMPTS = int(os.getenv('DOCUMENT_JOB_MAX_ATTEMPTS', '3'))
+DOCUMENT_JOB_RETRY_DELAY = int(os.getenv('DOCUMENT_JOB_RETRY_DELAY', '30'))
+DOCUMENT_JOB_LEASE = int(os.getenv('DOCUMENT_JOB_LEASE', str(30 * 60)))
+
+# Admin list views (users.pagination): rows per keyset page and the largest ?page_size= accepted.
+ADMIN_LIST_PAGE_SIZE = 50
+ADMIN_LIST_MAX_PAGE_SIZE = 200
+
+# Django admin changelists (users.pagination.EstimatedCountPaginator): unfiltered lists of tables whose
+# planner estimate reaches this many rows show the estimate instead of running COUNT(*).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', '100000'))
+
+# The grading grid posts 4 fields per student; Django's default of 1000 rejects courses over ~250 students.
+DATA_UPLOAD_MAX_NUMBER_FIELDS = int(os.getenv('DATA_UPLOAD_MAX_NUMBER_FIELDS', '10000'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,38 +1,129 @@
 """Django admin registrations for the Users app.
 
-Registers CustomUser, Student, Professor, and Administrator with basic list and search configuration.
+Registers CustomUser, Student, Professor, and Administrator with basic list and search configuration,
+and DocumentJob for inspecting the document queue.
+
+Includes:
+- UserSearchMixin: admin search through the indexed UserSearchService.
+- StudentRecordSearchMixin: search of rows owned by a student (grades, inscriptions, waitlist).
+- ScalableAdminMixin: settings for tables that reach millions of rows.
 
 Notes:
-    Uses namespaced search_fields for related user and career lookups.
+    Uses namespaced search_fields for related user and career lookups. User,
+    student and professor searches go through the indexed UserSearchService
+    instead of icontains scans over every search field.
+
+    Changelists load the relations their columns print (list_select_related),
+    foreign keys are edited with autocomplete widgets instead of a <select> of
+    the whole table, and large tables show an estimated count (see
+    users.pagination.EstimatedCountPaginator).
 """
 
 from django.contrib import admin
-from .models import CustomUser, Student, Professor, Administrator
+from django.db.models import Q
+
+from academics.models import Subject
+from .models import CustomUser, Student, Professor, Administrator, DocumentJob
+from .pagination import EstimatedCountPaginator
+from .services import UserSearchService
+
+
+class UserSearchMixin:
+    """Admin search backed by UserSearchService (on the model's user relation, if any)."""
+    user_field = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        if self.user_field is None:
+            return UserSearchService.search(queryset, search_term), False
+        users = UserSearchService.search(CustomUser.objects.all(), search_term).values("id")
+        return queryset.filter(**{f"{self.user_field}__in": users}), False
+
+
+class StudentRecordSearchMixin:
+    """
+    Admin search for rows with a student and a subject (grades, inscriptions, waitlist).
+
+    A term matches the student through UserSearchService (DNI, username, legajo,
+    names) or the subject by code prefix. Both sides are resolved to ids in
+    subqueries, so the row table is filtered on its own foreign key indexes
+    instead of OR-ing LIKE conditions across joined tables.
+    """
+    subject_fields = ("subject",)
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        users = UserSearchService.search(CustomUser.objects.all(), term).values("id")
+        condition = Q(student__in=Student.objects.filter(user__in=users).values("pk"))
+        subjects = Subject.objects.filter(code__startswith=term.upper()).values("pk")
+        for field in self.subject_fields:
+            condition |= Q(**{f"{field}__in": subjects})
+        return queryset.filter(condition), False
+
+
+class ScalableAdminMixin:
+    """
+    Admin settings for tables that can reach millions of rows.
+
+    - list_select_related is applied in get_queryset too, so autocomplete
+      results and change forms print __str__ without extra queries.
+    - The paginator estimates the count of unfiltered lists, and the
+      "N total" link (a second COUNT(*) of the whole table) is hidden.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if isinstance(self.list_select_related, (list, tuple)):
+            queryset = queryset.select_related(*self.list_select_related)
+        return queryset
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(admin.ModelAdmin):
+class CustomUserAdmin(UserSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for CustomUser: username, role, DNI, and email."""
     list_display = ("username", "role", "dni", "email")
     search_fields = ("username", "dni", "email")
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(UserSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Student: identity, career, and enrollment date."""
     list_display = ("student_id", "user", "career", "enrollment_date")
+    list_select_related = ("user", "career__faculty")
+    autocomplete_fields = ("user", "career")
+    user_field = "user"
     search_fields = ("student_id", "user__username", "career__name")
 
 
 @admin.register(Professor)
-class ProfessorAdmin(admin.ModelAdmin):
+class ProfessorAdmin(UserSearchMixin, ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Professor: identity, degree, category, and hire date."""
     list_display = ("professor_id", "user", "degree", "category", "hire_date")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user", "subjects", "final_exams")
+    user_field = "user"
     search_fields = ("professor_id", "user__username", "degree")
 
 
 @admin.register(Administrator)
-class AdministratorAdmin(admin.ModelAdmin):
+class AdministratorAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin for Administrator: identity, position, and hire date."""
     list_display = ("administrator_id", "user", "position", "hire_date")
+    list_select_related = ("user",)
+    autocomplete_fields = ("user",)
     search_fields = ("administrator_id", "user__username", "position")
+
+
+@admin.register(DocumentJob)
+class DocumentJobAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    """Admin for DocumentJob: kind, status, attempts, progress, and timestamps."""
+    list_display = ("id", "kind", "status", "requested_by", "attempts", "progress", "total", "created_at", "expires_at")
+    list_filter = ("kind", "status")
+    list_select_related = ("requested_by",)
+    autocomplete_fields = ("requested_by",)
+    readonly_fields = ("locked_at", "output", "finished_at")
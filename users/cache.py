@@ -0,0 +1,71 @@
+"""Cache backend used by default (see CACHES in main.settings).
+
+Includes:
+- DatabaseCache: Django's database cache with batched writes on PostgreSQL.
+
+Notes:
+    Django's backend writes one key at a time (COUNT(*) for culling, SELECT,
+    then UPDATE or INSERT), so StudentDashboardService.invalidate_students
+    after a 250-student grade grid costs ~1000 queries. On PostgreSQL this
+    backend writes every key of set()/set_many() with a single
+    INSERT ... ON CONFLICT after the cull check; other databases fall back
+    to Django's implementation.
+"""
+
+import base64
+import pickle
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache.backends import db
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connections, router, transaction
+from django.utils.timezone import now as tz_now
+
+
+class DatabaseCache(db.DatabaseCache):
+    """DatabaseCache whose writes are one upsert per call on PostgreSQL."""
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self._upsert({key: value}, timeout, version):
+            super().set(key, value, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self._upsert(data, timeout, version):
+            return super().set_many(data, timeout, version)
+        return []
+
+    def _upsert(self, data, timeout, version):
+        """Write ``data`` with one INSERT ... ON CONFLICT; return False when not on PostgreSQL."""
+        db_alias = router.db_for_write(self.cache_model_class)
+        connection = connections[db_alias]
+        if connection.vendor != "postgresql":
+            return False
+        if not data:
+            return True
+
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            expires = datetime.max
+        else:
+            expires = datetime.fromtimestamp(timeout, tz=timezone.utc if settings.USE_TZ else None)
+        expires = connection.ops.adapt_datetimefield_value(expires.replace(microsecond=0))
+
+        params = []
+        for key, value in data.items():
+            pickled = base64.b64encode(pickle.dumps(value, self.pickle_protocol)).decode("latin1")
+            params += [self.make_and_validate_key(key, version=version), pickled, expires]
+
+        table = connection.ops.quote_name(self._table)
+        rows = ", ".join(["(%s, %s, %s)"] * len(data))
+        with transaction.atomic(using=db_alias), connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            num = cursor.fetchone()[0]
+            if num > self._max_entries:
+                self._cull(db_alias, cursor, tz_now(), num)
+            cursor.execute(
+                f"INSERT INTO {table} (cache_key, value, expires) VALUES {rows} "
+                "ON CONFLICT (cache_key) DO UPDATE SET value = EXCLUDED.value, expires = EXCLUDED.expires",
+                params,
+            )
+        return True
@@ -0,0 +1,62 @@
+"""System checks for the Users app.
+
+Includes:
+- check_shared_cache: warn when the default cache is local to each process.
+- check_private_files: reject document directories under MEDIA_ROOT.
+
+Notes:
+    Student dashboards (StudentDashboardService) and the curriculum dropdowns
+    (academics.choices) are invalidated by bumping version tokens in the
+    default cache. Workers and management commands (promote_waitlist,
+    recompute_grade_status, seed_university) run in their own processes, so
+    with a per-process backend their invalidations never reach the web
+    workers, which keep serving stale pages until the entries expire.
+
+    Certificates, student files and job outputs hold personal data; MEDIA_ROOT
+    is served without authentication (main.urls in development, usually the
+    web server in production), so they must live elsewhere.
+"""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+PRIVATE_DIR_SETTINGS = ("DOCUMENT_CACHE_DIR", "DOCUMENT_JOB_DIR")
+
+PER_PROCESS_CACHES = {"django.core.cache.backends.locmem.LocMemCache"}
+
+
+@register("caches")
+def check_shared_cache(app_configs, **kwargs):
+    """users.W001: the default cache backend is per process."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [
+        Warning(
+            f"The default cache ({backend}) is local to each process; dashboard and dropdown "
+            "invalidations sent by other processes (workers, management commands) are lost.",
+            hint="Use a shared backend: CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache "
+            "(the default) or a Redis cache.",
+            id="users.W001",
+        )
+    ]
+
+
+@register("security")
+def check_private_files(app_configs, **kwargs):
+    """users.E001: a document directory is inside MEDIA_ROOT."""
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    errors = []
+    for name in PRIVATE_DIR_SETTINGS:
+        directory = Path(getattr(settings, name)).resolve()
+        if directory.is_relative_to(media_root):
+            errors.append(
+                Error(
+                    f"{name} ({directory}) is inside MEDIA_ROOT, which is served without authentication.",
+                    hint="Point it under PRIVATE_FILES_ROOT (the default) or another directory outside MEDIA_ROOT.",
+                    id="users.E001",
+                )
+            )
+    return errors
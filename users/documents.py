@@ -0,0 +1,650 @@
+"""DOCX rendering for the Users app (certificates and student files).
+
+Includes:
+- CompiledDocxTemplate: a template read, patched and compiled once, rendered many times.
+- DocxTemplateRegistry: process-level cache of compiled templates keyed by path and mtime.
+- InlineRenderer / ProcessPoolRenderer: rendering backends (DOCX_RENDER_BACKEND).
+- render_docx: render a template path with a context to DOCX bytes.
+- DocumentCache: content-addressed store of rendered documents with LRU eviction.
+- render_many / stream_zip: batch rendering in worker processes, streamed as a ZIP archive.
+- acquire_batch_slot / SlotReleasingIterator: per-process cap on batch renders started by web requests.
+
+Notes:
+    Building a DocxTemplate per request re-reads the file, serializes and
+    regex-patches the document XML and recompiles every Jinja template (body,
+    headers, footers and core properties). A compiled template keeps the
+    file bytes, the patched XML of each part and a Jinja environment that
+    compiles each source once; a render only loads a fresh python-docx copy of
+    the in-memory package, fills it and saves it.
+
+    Rendering is CPU-bound. With DOCX_RENDER_BACKEND = "process" it runs in a
+    bounded pool of worker processes (spawned, templates preloaded) instead of
+    the request worker; when the pool is saturated or a render times out,
+    DocumentRenderUnavailable is raised and the views answer 503.
+
+    render_many starts its own pool of DOCX_BATCH_WORKERS processes per call.
+    The generate_certificates command calls it directly; web requests first
+    take one of the DOCX_BATCH_MAX_CONCURRENT batch slots of the process and
+    answer 503 when none is free.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+
+
+class _CompilingEnvironment(Environment):
+    """Jinja environment that compiles each template source only once."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals or template_class:
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled[source] = super().from_string(source)
+        return template
+
+
+class _TemplateCopy(DocxTemplate):
+    """Per-render DocxTemplate that reuses the patched XML of a CompiledDocxTemplate."""
+
+    def __init__(self, compiled):
+        super().__init__(BytesIO(compiled.source))
+        self._compiled = compiled
+
+    def build_xml(self, context, jinja_env=None):
+        return self.render_xml_part(self._compiled.body_xml, self.docx._part, context, jinja_env)
+
+    def build_headers_footers_xml(self, context, uri, jinja_env=None):
+        for rel_key, part in self.get_headers_footers(uri):
+            xml, encoding = self._compiled.parts_xml[rel_key]
+            yield rel_key, self.render_xml_part(xml, part, context, jinja_env).encode(encoding)
+
+
+class CompiledDocxTemplate:
+    """
+    A DOCX template loaded and pre-parsed once.
+
+    Attributes:
+        path (Path): Template file.
+        version (tuple[int, int]): (mtime_ns, size) of the file when it was loaded.
+        source (bytes): Raw template package.
+        body_xml (str): Patched document body, ready for Jinja.
+        parts_xml (dict[str, tuple[str, str]]): Patched header/footer XML and encoding per relationship id.
+    """
+
+    def __init__(self, path, version):
+        self.path = Path(path)
+        self.version = version
+        self.source = self.path.read_bytes()
+        self.jinja_env = _CompilingEnvironment()
+
+        loader = DocxTemplate(BytesIO(self.source))
+        loader.init_docx()
+        self.body_xml = loader.patch_xml(loader.get_xml())
+        self.parts_xml = {}
+        for uri in (DocxTemplate.HEADER_URI, DocxTemplate.FOOTER_URI):
+            for rel_key, part in loader.get_headers_footers(uri):
+                xml = loader.get_part_xml(part)
+                self.parts_xml[rel_key] = (loader.patch_xml(xml), loader.get_headers_footers_encoding(xml))
+        # Compile every Jinja source (body, headers, footers, properties) up front.
+        self.render({})
+
+    def render(self, context):
+        """
+        Render the template with a context.
+
+        Args:
+            context (dict): Template variables.
+
+        Returns:
+            bytes: The rendered DOCX file.
+        """
+        document = _TemplateCopy(self)
+        document.render(context, self.jinja_env)
+        output = BytesIO()
+        document.save(output)
+        return output.getvalue()
+
+
+class DocxTemplateRegistry:
+    """
+    Process-level cache of CompiledDocxTemplate objects.
+
+    Entries are keyed by absolute path and reloaded when the file's mtime or
+    size changes, so editing a template takes effect without a restart.
+    """
+
+    def __init__(self):
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """
+        Return the compiled template for path, loading it if missing or stale.
+
+        Raises:
+            FileNotFoundError: If the template file does not exist.
+        """
+        path = Path(os.path.abspath(path))
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        compiled = self._templates.get(path)
+        if compiled is None or compiled.version != version:
+            with self._lock:
+                compiled = self._templates.get(path)
+                if compiled is None or compiled.version != version:
+                    compiled = self._templates[path] = CompiledDocxTemplate(path, version)
+        return compiled
+
+    def clear(self):
+        """Forget every compiled template."""
+        with self._lock:
+            self._templates.clear()
+
+
+registry = DocxTemplateRegistry()
+
+
+class DocumentRenderUnavailable(Exception):
+    """The rendering backend cannot take or finish the job right now (HTTP 503)."""
+
+
+class DocumentRenderBusy(DocumentRenderUnavailable):
+    """Every render slot of the pool is taken."""
+
+
+class DocumentRenderTimeout(DocumentRenderUnavailable):
+    """The render did not finish within DOCX_RENDER_TIMEOUT seconds."""
+
+
+class InlineRenderer:
+    """Render in the calling thread (default backend)."""
+
+    def render(self, path, context):
+        return registry.get(path).render(context)
+
+    def shutdown(self):
+        pass
+
+
+def _preload_templates(paths):
+    """Process pool initializer: compile the known templates before the first job."""
+    for path in paths:
+        try:
+            registry.get(path)
+        except FileNotFoundError:
+            pass
+
+
+def _render_in_worker(path, context):
+    return registry.get(path).render(context)
+
+
+class ProcessPoolRenderer:
+    """
+    Render in a bounded pool of worker processes.
+
+    At most max_pending renders are queued or running; one more raises
+    DocumentRenderBusy right away instead of piling up behind the pool. A slot
+    is freed when its render finishes, even if the caller already gave up
+    waiting, so the bound reflects the real load of the workers.
+
+    Args:
+        workers (int): Worker processes.
+        timeout (float): Seconds a caller waits for its render.
+        max_pending (int): Render slots (running + queued).
+        preload (Iterable[str | Path]): Templates compiled by every worker at start-up.
+    """
+
+    def __init__(self, workers, timeout, max_pending, preload=()):
+        self.workers = workers
+        self.timeout = timeout
+        self.preload = [str(path) for path in preload]
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_preload_templates,
+                    initargs=(self.preload,),
+                )
+            return self._executor
+
+    def render(self, path, context):
+        if not self._slots.acquire(blocking=False):
+            raise DocumentRenderBusy("No hay capacidad para generar documentos en este momento.")
+        try:
+            future = self._get_executor().submit(_render_in_worker, str(path), context)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            raise DocumentRenderTimeout("La generación del documento demoró demasiado.") from exc
+        except BrokenProcessPool as exc:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next call.
+            with self._lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            raise DocumentRenderUnavailable("El generador de documentos se reinició.") from exc
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_renderer = None
+_renderer_config = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    """
+    Return the process-wide renderer configured by the DOCX_RENDER_* settings.
+
+    The renderer is rebuilt when the settings change (e.g. override_settings in tests).
+    """
+    global _renderer, _renderer_config
+    config = (
+        settings.DOCX_RENDER_BACKEND,
+        settings.DOCX_RENDER_POOL_SIZE,
+        settings.DOCX_RENDER_TIMEOUT,
+        settings.DOCX_RENDER_MAX_PENDING,
+        tuple(settings.DOCX_PRELOAD_TEMPLATES),
+    )
+    with _renderer_lock:
+        if config != _renderer_config:
+            if _renderer is not None:
+                _renderer.shutdown()
+            backend, workers, timeout, max_pending, preload = config
+            if backend == "process":
+                _renderer = ProcessPoolRenderer(workers, timeout, max_pending, preload)
+            else:
+                _renderer = InlineRenderer()
+            _renderer_config = config
+        return _renderer
+
+
+def render_docx(path, context):
+    """
+    Render the DOCX template at path with context on the configured backend.
+
+    Returns:
+        bytes: The rendered DOCX file.
+
+    Raises:
+        DocumentRenderUnavailable: The process pool is full or the render timed out.
+    """
+    return get_renderer().render(path, context)
+
+
+class DocumentCache:
+    """
+    Rendered documents stored on disk under a hash of their inputs.
+
+    The key is the SHA-256 of the template identity (path, mtime, size) and the
+    JSON-serialized render context, so a document is rendered again only when
+    its data, the date in its context or the template changes. The key doubles
+    as the HTTP ETag.
+
+    Files live in ``<directory>/<key[:2]>/<key>.docx``. Every hit refreshes the
+    file's mtime; when the store grows beyond max_bytes the least recently used
+    files are deleted until it is back under 90% of the limit.
+
+    Args:
+        directory (str | Path): Root of the store (DOCUMENT_CACHE_DIR).
+        max_bytes (int): Size bound (DOCUMENT_CACHE_MAX_BYTES); 0 disables the cache.
+    """
+
+    SUFFIX = ".docx"
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def key(self, template_path, context):
+        """Return the content address of rendering template_path with context."""
+        stat = Path(template_path).stat()
+        payload = json.dumps(
+            {
+                "template": [os.path.abspath(template_path), stat.st_mtime_ns, stat.st_size],
+                "context": context,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path_for(self, key):
+        return self.directory / key[:2] / f"{key}{self.SUFFIX}"
+
+    def open(self, key, template_path, context, render=None):
+        """
+        Open the rendered document for reading, rendering and storing it on a miss.
+
+        The file is opened before it can be evicted, so the handle stays valid
+        even if another process deletes it right after.
+
+        Args:
+            key (str): Value returned by key() for the same inputs.
+            template_path (str | Path): DOCX template.
+            context (dict): Render context.
+            render (Callable | None): Renderer (defaults to render_docx).
+
+        Returns:
+            BinaryIO: Open handle on the rendered DOCX.
+        """
+        path = self.path_for(key)
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            pass
+        else:
+            os.utime(handle.fileno())
+            return handle
+        content = (render or render_docx)(template_path, context)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as out:
+            out.write(content)
+        handle = open(tmp, "rb")
+        os.replace(tmp, path)
+        self._track(len(content))
+        return handle
+
+    def get(self, key):
+        """Return the stored document for key, or None, refreshing its LRU position."""
+        try:
+            with open(self.path_for(key), "rb") as handle:
+                os.utime(handle.fileno())
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def _entries(self):
+        """Yield (path, size, mtime) of every stored document."""
+        if not self.directory.is_dir():
+            return
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(self.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield Path(entry.path), stat.st_size, stat.st_mtime
+
+    def _track(self, added):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += added
+            over = self._size > self.max_bytes
+        if over:
+            self.evict(int(self.max_bytes * 0.9))
+
+    def evict(self, target_bytes):
+        """
+        Delete least recently used documents until the store holds at most target_bytes.
+
+        Returns:
+            tuple[int, int]: Files and bytes removed.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for path, size, _ in entries:
+            if total <= target_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            freed += size
+        with self._lock:
+            self._size = total
+        return removed, freed
+
+    def purge(self, older_than=None):
+        """
+        Delete stored documents.
+
+        Args:
+            older_than (float | None): Only files not used for this many seconds; None deletes all.
+
+        Returns:
+            tuple[int, int]: Files and bytes removed.
+        """
+        cutoff = None if older_than is None else time.time() - older_than
+        removed = freed = 0
+        for path, size, mtime in self._entries():
+            if cutoff is None or mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+                freed += size
+        with self._lock:
+            self._size = None
+        return removed, freed
+
+
+_document_cache = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache():
+    """Return the process-wide DocumentCache configured by DOCUMENT_CACHE_DIR/MAX_BYTES."""
+    global _document_cache
+    directory, max_bytes = Path(settings.DOCUMENT_CACHE_DIR), settings.DOCUMENT_CACHE_MAX_BYTES
+    with _document_cache_lock:
+        cache = _document_cache
+        if cache is None or cache.directory != directory or cache.max_bytes != max_bytes:
+            cache = _document_cache = DocumentCache(directory, max_bytes)
+        return cache
+
+
+def render_many(path, items, workers=None, cache=None):
+    """
+    Render one template for many contexts in parallel worker processes.
+
+    Results come back in input order. At most 4 x workers renders are in flight,
+    so a lazy iterable of items is consumed as fast as the pool renders it and
+    memory stays bounded. Documents already in the cache are read from it
+    instead of rendered (batch output is not stored, so a large batch does not
+    evict the documents students download one by one).
+
+    Args:
+        path (str | Path): DOCX template.
+        items (Iterable[tuple[Any, dict]]): (tag, context) pairs.
+        workers (int | None): Worker processes (default DOCX_BATCH_WORKERS); 1 renders inline.
+        cache (DocumentCache | None): Store to read from (default get_document_cache()).
+
+    Yields:
+        tuple[Any, bytes]: (tag, rendered DOCX) per item.
+    """
+    workers = workers or settings.DOCX_BATCH_WORKERS
+    cache = cache or get_document_cache()
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_preload_templates,
+            initargs=([str(path)],),
+        )
+    window = 4 * workers
+    pending = deque()
+    try:
+        for tag, context in items:
+            content = cache.get(cache.key(path, context)) if cache.enabled else None
+            if content is None:
+                if executor is not None:
+                    content = executor.submit(_render_in_worker, str(path), context)
+                else:
+                    content = registry.get(path).render(context)
+            pending.append((tag, content))
+            while pending and (len(pending) >= window or _is_ready(pending[0][1])):
+                yield _result(pending.popleft())
+        while pending:
+            yield _result(pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_batch_slots = None
+_batch_slots_size = None
+_batch_slots_lock = threading.Lock()
+
+
+def acquire_batch_slot():
+    """
+    Take one of the DOCX_BATCH_MAX_CONCURRENT batch slots of this process.
+
+    A web request holds the slot for as long as its render_many pool lives, so
+    one request worker never runs more than DOCX_BATCH_MAX_CONCURRENT x
+    DOCX_BATCH_WORKERS render processes for bulk downloads.
+
+    Returns:
+        Callable[[], None]: Releases the slot; later calls do nothing.
+
+    Raises:
+        DocumentRenderBusy: Every slot is taken.
+    """
+    global _batch_slots, _batch_slots_size
+    with _batch_slots_lock:
+        if _batch_slots_size != settings.DOCX_BATCH_MAX_CONCURRENT:
+            _batch_slots_size = settings.DOCX_BATCH_MAX_CONCURRENT
+            _batch_slots = threading.BoundedSemaphore(_batch_slots_size)
+        slots = _batch_slots
+    if not slots.acquire(blocking=False):
+        raise DocumentRenderBusy("Ya hay una descarga de documentos en lote en curso.")
+    released = threading.Event()
+
+    def release():
+        if not released.is_set():
+            released.set()
+            slots.release()
+
+    return release
+
+
+class SlotReleasingIterator:
+    """
+    Iterator over a batch stream that releases its batch slot when done.
+
+    The slot is released when the stream is exhausted or closed, whichever
+    comes first. StreamingHttpResponse closes it with the response, also when
+    the client disconnects before the first member is sent.
+    """
+
+    def __init__(self, iterable, release):
+        self._iterator = iter(iterable)
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._release()
+            raise
+
+    def close(self):
+        try:
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+
+def _is_ready(content):
+    return isinstance(content, bytes) or content.done()
+
+
+def _result(entry):
+    tag, content = entry
+    return tag, content if isinstance(content, bytes) else content.result()
+
+
+class _ZipBuffer:
+    """Write-only, non-seekable file object that collects what zipfile writes."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Build a ZIP archive incrementally.
+
+    zipfile writes to a non-seekable buffer (local headers followed by data
+    descriptors), which is drained after every member, so only one member is
+    held in memory at a time. Members are stored uncompressed: a DOCX is
+    already a deflated ZIP.
+
+    Args:
+        entries (Iterable[tuple[str, bytes]]): (name, content) pairs.
+
+    Yields:
+        bytes: Consecutive chunks of the archive.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+            yield buffer.drain()
+    yield buffer.drain()
@@ -0,0 +1,95 @@
+"""Streaming CSV export for the admin list views.
+
+Includes:
+- CsvExportMixin: adds ``?format=csv`` to a ListView (or serves only CSV).
+
+Notes:
+    Rows are read with values_list() over the related paths of csv_fields (the
+    joins select_related would do, without building model instances) through
+    QuerySet.iterator(), which uses a server-side cursor on PostgreSQL. The
+    header row is sent before the query runs and every chunk of rows is
+    written as soon as it is fetched, so memory stays flat and the download
+    starts right away even for million-row tables.
+"""
+
+import csv
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class CsvExportMixin:
+    """
+    CSV export for a ListView.
+
+    Attributes:
+        csv_fields (Sequence[tuple[str, str]]): (header, lookup path) pairs; paths may follow relations.
+        csv_filename (str): Download name prefix (the date is appended).
+        csv_only (bool): Answer every GET with CSV (export-only views).
+        csv_chunk_size (int): Rows fetched per round trip.
+
+    The export honors the view's filtering (get_queryset, e.g. the search box)
+    and, for keyset-paginated views, the selected sort; pagination is ignored.
+    """
+
+    csv_fields = ()
+    csv_filename = "export"
+    csv_only = False
+    csv_chunk_size = 2000
+    csv_rows_per_write = 500
+
+    def get(self, request, *args, **kwargs):
+        if self.csv_only or request.GET.get("format") == "csv":
+            return self.render_csv()
+        return super().get(request, *args, **kwargs)
+
+    def get_csv_queryset(self):
+        queryset = self.get_queryset()
+        if hasattr(self, "get_sort"):
+            sort = self.get_sort()
+            prefix = "-" if sort.startswith("-") else ""
+            queryset = queryset.order_by(*(prefix + field for field in self.sort_keys[sort.lstrip("-")]))
+        elif not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        return queryset
+
+    def iter_csv(self):
+        """Yield the CSV export, header first, in chunks of csv_rows_per_write lines."""
+        writer = csv.writer(_Echo())
+        # BOM so spreadsheet programs read the file as UTF-8 (accents in names).
+        yield "\ufeff" + writer.writerow([header for header, _ in self.csv_fields])
+        rows = (
+            self.get_csv_queryset()
+            .values_list(*(path for _, path in self.csv_fields))
+            .iterator(chunk_size=self.csv_chunk_size)
+        )
+        lines = []
+        for row in rows:
+            lines.append(writer.writerow(row))
+            if len(lines) >= self.csv_rows_per_write:
+                yield "".join(lines)
+                lines.clear()
+        if lines:
+            yield "".join(lines)
+
+    def render_csv(self):
+        filename = f"{self.csv_filename}-{timezone.localdate().strftime('%Y%m%d')}.csv"
+        response = StreamingHttpResponse(self.iter_csv(), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.copy()
+        for name in ("after", "before", "page_size"):
+            query.pop(name, None)
+        query["format"] = "csv"
+        context["csv_query"] = query.urlencode()
+        return context
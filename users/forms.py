@@ -5,14 +5,18 @@ Includes:
 - StudentProfileForm: student profile data linked to a Career.
 - ProfessorProfileForm: professor profile data.
 - AdministratorProfileForm: administrator profile data.
+- CertificateBatchForm: filter for the bulk regular certificate ZIP.
+- StudentFileExportForm: filter for the NDJSON student file export.
 
 Notes:
     Labels are in Spanish to match the current UI.
+    Career and faculty dropdowns use the cached choice fields of academics.choices.
 """
 
 from django import forms
 from users.models import CustomUser, Student, Professor, Administrator
-from academics.models import Career
+from academics.choices import CareerChoiceField, FacultyChoiceField
+from academics.models import Career, Faculty
 
 
 class UserForm(forms.ModelForm):
@@ -102,7 +106,7 @@ class StudentProfileForm(forms.ModelForm):
     Fields:
         student_id, career, enrollment_date.
     """
-    career = forms.ModelChoiceField(queryset=Career.objects.all(), label="Carrera")
+    career = CareerChoiceField(queryset=Career.objects.all(), label="Carrera")
 
     class Meta:
         model = Student
@@ -134,3 +138,37 @@ class AdministratorProfileForm(forms.ModelForm):
         model = Administrator
         fields = ['administrator_id', 'position', 'hire_date']
         labels = {'administrator_id': 'Legajo Administrador', 'position': 'Cargo', 'hire_date': 'Fecha de Alta'}
+
+
+class CertificateBatchForm(forms.Form):
+    """
+    Filter for the bulk regular certificate download.
+
+    Fields:
+        career, faculty (optional; both empty means every student),
+        after (resume after this legajo, i.e. the last certificate of an interrupted download).
+    """
+    career = CareerChoiceField(queryset=Career.objects.all(), required=False, label="Carrera")
+    faculty = FacultyChoiceField(queryset=Faculty.objects.all(), required=False, label="Facultad")
+    after = forms.CharField(required=False, max_length=20, label="Continuar después del legajo")
+
+
+class StudentFileExportForm(forms.Form):
+    """
+    Filter for the bulk student file export (query string of the NDJSON endpoint).
+
+    Fields:
+        career, faculty, enrolled_from, enrolled_to (inclusive), after (resume after this legajo).
+    """
+    career = CareerChoiceField(queryset=Career.objects.all(), required=False, label="Carrera")
+    faculty = FacultyChoiceField(queryset=Faculty.objects.all(), required=False, label="Facultad")
+    enrolled_from = forms.DateField(required=False, label="Ingreso desde")
+    enrolled_to = forms.DateField(required=False, label="Ingreso hasta")
+    after = forms.CharField(required=False, max_length=20, label="Continuar después del legajo")
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("enrolled_from"), cleaned.get("enrolled_to")
+        if start and end and start > end:
+            raise forms.ValidationError("La fecha de ingreso inicial es posterior a la final.")
+        return cleaned
@@ -0,0 +1,54 @@
+"""Export student files (ficha del alumno) as NDJSON, one student per line.
+
+Usage:
+    python manage.py export_student_files > fichas.ndjson
+    python manage.py export_student_files --career ING-SIS --output fichas.ndjson
+    python manage.py export_student_files --enrolled-from 2024-01-01 --after S-1000
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import Career, Faculty
+from users.services import StudentFileService
+
+
+class Command(BaseCommand):
+    help = "Stream student files as NDJSON in legajo order over a single server-side cursor."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="File to write (default: stdout).")
+        parser.add_argument("--career", metavar="CODE", help="Only students of this career.")
+        parser.add_argument("--faculty", metavar="CODE", help="Only students of this faculty's careers.")
+        parser.add_argument("--enrolled-from", type=date.fromisoformat, metavar="YYYY-MM-DD")
+        parser.add_argument("--enrolled-to", type=date.fromisoformat, metavar="YYYY-MM-DD")
+        parser.add_argument("--after", metavar="LEGAJO", help="Resume after this student_id.")
+        parser.add_argument("--chunk-size", type=int, default=StudentFileService.EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        students = StudentFileService.students(
+            career=self._get(Career, options["career"]),
+            faculty=self._get(Faculty, options["faculty"]),
+            enrolled_from=options["enrolled_from"],
+            enrolled_to=options["enrolled_to"],
+            after=options["after"],
+        )
+        chunks = StudentFileService.iter_ndjson(students, chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            self.stderr.write(f"Student files written to {options['output']}.")
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+
+    @staticmethod
+    def _get(model, code):
+        if code is None:
+            return None
+        try:
+            return model.objects.get(code=code)
+        except model.DoesNotExist:
+            raise CommandError(f"{model.__name__} {code!r} does not exist.")
@@ -0,0 +1,79 @@
+"""Render the regular certificate of every student of a career/faculty into a ZIP file.
+
+Usage:
+    python manage.py generate_certificates certificados.zip --career ING-SIS
+    python manage.py generate_certificates certificados.zip --faculty FI --workers 8
+    python manage.py generate_certificates certificados.zip --faculty FI --resume
+"""
+
+import zipfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academics.models import Career, Faculty
+from users.services import CertificateService
+
+
+class Command(BaseCommand):
+    help = (
+        "Render regular certificates in worker processes into a ZIP. The archive is closed every "
+        "--checkpoint certificates, so --resume continues an interrupted run after its last legajo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="ZIP file to write.")
+        parser.add_argument("--career", metavar="CODE", help="Only students of this career.")
+        parser.add_argument("--faculty", metavar="CODE", help="Only students of this faculty's careers.")
+        parser.add_argument("--workers", type=int, help="Worker processes (default DOCX_BATCH_WORKERS).")
+        parser.add_argument("--checkpoint", type=int, default=200, help="Certificates between checkpoints.")
+        parser.add_argument("--resume", action="store_true", help="Append to OUTPUT after its last certificate.")
+
+    def handle(self, *args, **options):
+        career = self._get(Career, options["career"])
+        faculty = self._get(Faculty, options["faculty"])
+        if not CertificateService.template_path().exists():
+            raise CommandError(f"Template not found: {CertificateService.template_path()}")
+
+        output = Path(options["output"])
+        after = None
+        if options["resume"] and output.exists():
+            with zipfile.ZipFile(output) as archive:
+                names = archive.namelist()
+            if names:
+                after = CertificateService.student_id_from_archive_name(max(names))
+        mode = "a" if after else "w"
+
+        students = CertificateService.students(career=career, faculty=faculty)
+        total = (students.filter(student_id__gt=after) if after else students).count()
+        if after:
+            self.stdout.write(f"Resuming after {after}: {total} certificate(s) left.")
+
+        def progress(done, student_id):
+            if done % options["checkpoint"] == 0 or done == total:
+                self.stdout.write(f"{done}/{total} certificate(s), last {student_id}")
+
+        archive = zipfile.ZipFile(output, mode=mode)
+        written = 0
+        try:
+            for name, content in CertificateService.iter_certificates(
+                students, after=after, workers=options["workers"], on_progress=progress
+            ):
+                archive.writestr(name, content)
+                written += 1
+                if written % options["checkpoint"] == 0:
+                    # Write the central directory so the file is a valid archive up to here.
+                    archive.close()
+                    archive = zipfile.ZipFile(output, mode="a")
+        finally:
+            archive.close()
+        self.stdout.write(self.style.SUCCESS(f"{written} certificate(s) written to {output}."))
+
+    @staticmethod
+    def _get(model, code):
+        if code is None:
+            return None
+        try:
+            return model.objects.get(code=code)
+        except model.DoesNotExist:
+            raise CommandError(f"{model.__name__} {code!r} does not exist.")
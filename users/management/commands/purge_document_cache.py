@@ -0,0 +1,41 @@
+"""Delete rendered documents from the certificate cache (DOCUMENT_CACHE_DIR).
+
+Usage:
+    python manage.py purge_document_cache --all
+    python manage.py purge_document_cache --older-than 30
+    python manage.py purge_document_cache --max-bytes 50000000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.documents import get_document_cache
+
+
+class Command(BaseCommand):
+    help = "Purge cached DOCX documents entirely, by age, or down to a size budget (least recently used first)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Delete every cached document.")
+        parser.add_argument(
+            "--older-than", type=float, metavar="DAYS", help="Delete documents not served for DAYS days."
+        )
+        parser.add_argument(
+            "--max-bytes", type=int, metavar="BYTES", help="Evict least recently used documents down to BYTES."
+        )
+
+    def handle(self, *args, **options):
+        if not (options["all"] or options["older_than"] is not None or options["max_bytes"] is not None):
+            raise CommandError("Pass --all, --older-than DAYS or --max-bytes BYTES.")
+
+        cache = get_document_cache()
+        files = freed = 0
+        if options["all"] or options["older_than"] is not None:
+            older_than = None if options["all"] else options["older_than"] * 86400
+            files, freed = cache.purge(older_than=older_than)
+        if options["max_bytes"] is not None:
+            evicted, evicted_bytes = cache.evict(options["max_bytes"])
+            files += evicted
+            freed += evicted_bytes
+        self.stdout.write(
+            self.style.SUCCESS(f"Document cache purged: {files} file(s), {freed} byte(s) freed from {cache.directory}.")
+        )
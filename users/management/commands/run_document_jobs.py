@@ -0,0 +1,45 @@
+"""Document job worker.
+
+Runs queued DocumentJob rows (bulk certificates, student files). Jobs are
+claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several worker processes can
+run at the same time without running a job twice. Idle workers requeue jobs
+abandoned by dead workers and delete expired outputs.
+
+Usage:
+    python manage.py run_document_jobs              # drain once and exit
+    python manage.py run_document_jobs --loop       # keep polling
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services import DocumentJobService
+
+
+class Command(BaseCommand):
+    help = "Run queued document generation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep polling instead of exiting when idle.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep when idle (--loop).")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            job = DocumentJobService.run_next()
+            if job is not None:
+                job.refresh_from_db()
+                total += 1
+                self.stdout.write(f"Job {job.pk} ({job.kind}): {job.status}. {job.error}".rstrip())
+                continue
+            requeued = DocumentJobService.requeue_stale()
+            expired = DocumentJobService.cleanup()
+            if requeued or expired:
+                self.stdout.write(f"Requeued {requeued} abandoned job(s), expired {expired} output(s).")
+            if requeued:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} job attempt(s) run."))
@@ -5,6 +5,7 @@ Defines:
 - Student: one-to-one profile linked to a Career.
 - Professor: one-to-one profile with teaching assignments and category.
 - Administrator: one-to-one profile for administrative staff.
+- DocumentJob: queued DOCX/ZIP generation job, run by the run_document_jobs worker.
 
 Notes:
     - db_table is set for each model to keep stable table names.
@@ -13,6 +14,7 @@ Notes:
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class CustomUser(AbstractUser):
@@ -42,6 +44,7 @@ class CustomUser(AbstractUser):
     class Meta:
         """Meta options for CustomUser."""
         db_table = 'users'
+        indexes = [models.Index(fields=['last_name', 'first_name', 'id'], name='user_name_idx')]
 
     def __str__(self):
         """Return full name for admin readability."""
@@ -57,15 +60,22 @@ class Student(models.Model):
         user (CustomUser): Related user account.
         career (academics.Career | None): Degree program; nullable if unset.
         enrollment_date (date): Enrollment date.
+
+    Indexes:
+        (career, student_id) serves the per-career exports and certificate batches, which page
+        through a career in student_id order; it replaces the plain career FK index.
     """
     student_id = models.CharField(max_length=20, unique=True, primary_key=True)
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='student')
-    career = models.ForeignKey('academics.Career', on_delete=models.SET_NULL, null=True, related_name='students')
+    career = models.ForeignKey(
+        'academics.Career', on_delete=models.SET_NULL, null=True, related_name='students', db_index=False
+    )
     enrollment_date = models.DateField()
 
     class Meta:
         """Meta options for Student."""
         db_table = 'students'
+        indexes = [models.Index(fields=['career', 'student_id'], name='student_career_idx')]
 
     def __str__(self):
         """Readable identifier combining student_id and full name."""
@@ -131,3 +141,70 @@ class Administrator(models.Model):
     def __str__(self):
         """Return full name for admin readability."""
         return f"{self.user.get_full_name()}"
+
+
+class DocumentJob(models.Model):
+    """
+    Document generation job, queued in the database and run by run_document_jobs.
+
+    Workers claim PENDING jobs whose run_after has passed with SELECT ... FOR
+    UPDATE SKIP LOCKED. A failed attempt is retried after an exponential backoff
+    until max_attempts; the output file is deleted once expires_at passes.
+
+    Attributes:
+        kind (str): What to generate (see Kind).
+        params (dict): Kind-specific parameters (career/faculty codes, student_id).
+        status (str): Lifecycle state (see Status).
+        requested_by (CustomUser | None): Owner; only they and administrators see the job.
+        attempts (int): Attempts started so far.
+        max_attempts (int): Attempts before the job is marked FAILED.
+        run_after (datetime): Earliest time a worker may (re)start the job.
+        locked_at (datetime | None): When the current attempt started.
+        progress / total (int): Documents rendered so far / expected.
+        output (str): Path of the generated file, relative to DOCUMENT_JOB_DIR.
+        filename (str): Download name of the output.
+        error (str): Last error message.
+        created_at, finished_at, expires_at (datetime): Timestamps.
+    """
+
+    class Kind(models.TextChoices):
+        CERTIFICATES = 'certificates', 'Certificados de alumno regular (ZIP)'
+        STUDENT_FILE = 'student_file', 'Ficha del alumno (DOCX)'
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendiente'
+        RUNNING = 'running', 'En proceso'
+        DONE = 'done', 'Terminado'
+        FAILED = 'failed', 'Fallido'
+        EXPIRED = 'expired', 'Vencido'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    requested_by = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='document_jobs'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    output = models.CharField(max_length=255, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """Meta options for DocumentJob."""
+        db_table = 'document_jobs'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='document_job_queue_idx'),
+            models.Index(fields=['status', 'expires_at'], name='document_job_expiry_idx'),
+        ]
+
+    def __str__(self):
+        """Return kind and status for admin readability."""
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
@@ -0,0 +1,249 @@
+"""Keyset (seek) pagination for the admin list views.
+
+Includes:
+- KeysetPage: one page of rows with opaque cursors to its neighbours.
+- KeysetPaginationMixin: ListView mixin that replaces OFFSET paging.
+- EstimatedCountPaginator: Django admin paginator that skips COUNT(*) on large tables.
+
+Notes:
+    Pages are selected with WHERE (key) > (last key seen) ORDER BY key LIMIT n
+    on an indexed, unique key (a sort column followed by the primary key), so
+    building any page reads page_size + 1 index entries, no matter how deep the
+    page is or how large the table grows. The price is that pages cannot be
+    addressed by number: the pager only offers first / previous / next.
+"""
+
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+
+def encode_cursor(values):
+    """Opaque URL-safe token for a tuple of key values."""
+    raw = json.dumps(list(values), cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, length):
+    """Key values of a token from encode_cursor(), or None if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def seek(fields, values, descending=False):
+    """
+    Q for rows strictly after values in (fields) order.
+
+    Expands the row comparison (a, b) > (x, y) into
+    a >= x AND (a > x OR (a = x AND b > y)); the leading range condition lets
+    the database walk the (a, b) index from x instead of scanning.
+    """
+    op = "lt" if descending else "gt"
+    branches = [
+        Q(**{f"{field}__{op}": value}, **dict(zip(fields[:i], values[:i])))
+        for i, (field, value) in enumerate(zip(fields, values))
+    ]
+    return Q(**{f"{fields[0]}__{op}e": values[0]}) & reduce(or_, branches)
+
+
+class KeysetPage:
+    """
+    One page of a keyset-paginated list.
+
+    Attributes:
+        object_list (list): Rows of the page.
+        next_cursor / previous_cursor (str | None): Tokens of the neighbour pages.
+        next_query / previous_query / first_query (str): Query strings that open them,
+            keeping the current sort and page size.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, query):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._query = query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def _link(self, **params):
+        query = self._query.copy()
+        for name in ("after", "before"):
+            query.pop(name, None)
+        query.update({name: value for name, value in params.items() if value})
+        return query.urlencode()
+
+    @property
+    def next_query(self):
+        return self._link(after=self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self._link(before=self.previous_cursor)
+
+    @property
+    def first_query(self):
+        return self._link()
+
+
+class KeysetPaginationMixin:
+    """
+    Keyset pagination and sorting for a ListView.
+
+    Subclasses declare sort_keys, mapping a sort name (the ``sort`` query
+    parameter, "-" prefix for descending) to the model fields of an index whose
+    last field is unique. Any other sort value falls back to default_sort, so a
+    request can never ask for an unindexed ORDER BY.
+
+    Query parameters:
+        sort: Sort name (e.g. "username", "-dni").
+        after / before: Cursor of the next / previous page.
+        page_size: Rows per page, capped at ADMIN_LIST_MAX_PAGE_SIZE.
+
+    Context:
+        page_obj (KeysetPage), is_paginated, sort (str),
+        sort_options (list[dict]): value, label, asc_query and desc_query of each sort key.
+    """
+
+    sort_keys = {"id": ("id",)}
+    sort_labels = {}
+    default_sort = "id"
+
+    def get_sort(self):
+        sort = self.request.GET.get("sort", self.default_sort)
+        return sort if sort.lstrip("-") in self.sort_keys else self.default_sort
+
+    def get_paginate_by(self, queryset):
+        try:
+            size = int(self.request.GET.get("page_size", settings.ADMIN_LIST_PAGE_SIZE))
+        except ValueError:
+            size = settings.ADMIN_LIST_PAGE_SIZE
+        return max(1, min(size, settings.ADMIN_LIST_MAX_PAGE_SIZE))
+
+    def paginate_queryset(self, queryset, page_size):
+        sort = self.get_sort()
+        descending = sort.startswith("-")
+        fields = self.sort_keys[sort.lstrip("-")]
+        params = self.request.GET
+        after = decode_cursor(params.get("after", ""), len(fields))
+        before = None if after else decode_cursor(params.get("before", ""), len(fields))
+
+        # Walk backwards (reversed order) to fetch the page before a cursor.
+        backwards = before is not None
+        reverse = descending != backwards
+        rows = queryset.order_by(*(f"-{field}" if reverse else field for field in fields))
+        cursor = after or before
+        if cursor is not None:
+            rows = rows.filter(seek(fields, cursor, descending=reverse))
+        rows = list(rows[: page_size + 1])
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+
+        def key(row):
+            return encode_cursor(getattr(row, field) for field in fields)
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if more or backwards:
+                next_cursor = key(rows[-1])
+            if (more and backwards) or (after is not None):
+                previous_cursor = key(rows[0])
+
+        page = KeysetPage(rows, next_cursor, previous_cursor, params.copy())
+        return None, page, rows, page.has_other_pages()
+
+    def _sort_query(self, sort):
+        """Query string of the first page sorted by sort, keeping the other parameters (e.g. search)."""
+        query = self.request.GET.copy()
+        for name in ("after", "before"):
+            query.pop(name, None)
+        query["sort"] = sort
+        return query.urlencode()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["sort"] = self.get_sort()
+        context["sort_options"] = [
+            {
+                "value": name,
+                "label": self.sort_labels.get(name, name),
+                "asc_query": self._sort_query(name),
+                "desc_query": self._sort_query(f"-{name}"),
+            }
+            for name in self.sort_keys
+        ]
+        return context
+
+
+def estimated_count(queryset):
+    """
+    Planner row estimate of an unfiltered queryset (PostgreSQL pg_class.reltuples).
+
+    Returns:
+        int | None: The estimate, or None if the queryset is filtered, sliced,
+        distinct or grouped, the backend is not PostgreSQL, or the table has
+        never been analyzed.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    query = queryset.query
+    if query.where or query.is_sliced or query.distinct or query.group_by or query.combinator:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of tables with millions of rows.
+
+    COUNT(*) reads the whole table on PostgreSQL. For an unfiltered list whose
+    estimate reaches ADMIN_ESTIMATED_COUNT_THRESHOLD, the count (and so the
+    number of pages) is the planner estimate kept fresh by autovacuum; filtered
+    lists and small tables are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
@@ -0,0 +1,73 @@
+"""Database-side indexes for the user search (UserSearchService).
+
+Identifier lookups need no extra DDL: on PostgreSQL, Django already creates a
+``varchar_pattern_ops`` B-tree (``*_like``) next to every unique CharField and
+CharField primary key, so ``dni``, ``username``, ``student_id`` and
+``professor_id`` answer both exact and prefix (``LIKE 'x%'``) matches from an
+index.
+
+Names are matched per word against first_name and last_name:
+
+- With the ``pg_trgm`` extension, GIN trigram indexes back fuzzy word matches
+  (``first_name %> 'gonzales'`` finds "Gonzalez").
+- Without it (extension not installable), B-tree indexes on
+  ``UPPER(name) text_pattern_ops`` back case-insensitive prefix matches.
+
+The indexes are created after migrate (see users.signals) because they use
+PostgreSQL-only operator classes and expressions; SQLite keeps plain
+``LIKE`` scans, which is fine for tests.
+"""
+
+import logging
+
+from django.db import DatabaseError, transaction
+
+from users.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+NAME_FIELDS = ("first_name", "last_name")
+_trigram_support = {}
+
+
+def supports_search_indexes(connection):
+    """Return True if the connection's backend can build the search indexes."""
+    return connection.vendor == "postgresql"
+
+
+def supports_trigram(connection):
+    """Return True if pg_trgm is installed in the connection's database (cached per database)."""
+    if not supports_search_indexes(connection):
+        return False
+    name = connection.settings_dict["NAME"]
+    if name not in _trigram_support:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_support[name] = cursor.fetchone() is not None
+    return _trigram_support[name]
+
+
+def install_search_indexes(connection):
+    """Create pg_trgm (if permitted) and the name indexes on the users table."""
+    table = connection.ops.quote_name(CustomUser._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        available = cursor.fetchone() is not None
+    if available:
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError as exc:
+            logger.warning("Could not create pg_trgm, user search falls back to name prefixes: %s", exc)
+    _trigram_support.pop(connection.settings_dict["NAME"], None)
+
+    with connection.cursor() as cursor:
+        for field in NAME_FIELDS:
+            column = connection.ops.quote_name(field)
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS users_{field}_upper_like ON {table} (UPPER({column}) text_pattern_ops)"
+            )
+            if supports_trigram(connection):
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS users_{field}_trgm ON {table} USING gin ({column} gin_trgm_ops)"
+                )
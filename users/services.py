@@ -1,20 +1,1075 @@
-from users.models import Student
+"""Service layer for the Users app.
+
+Includes:
+- StudentFileService: data for the student file (ficha del alumno), single or as an NDJSON export.
+- StudentDashboardService: the whole student dashboard in a constant number of queries,
+  with a versioned per-student cache.
+- SubjectInscriptionService: high-throughput subject inscription (inscription + grade row).
+- FinalExamInscriptionService: final exam inscription honoring the session capacity.
+- WaitlistService: FIFO waitlist for full subjects and final exams, promoted in batches.
+- GradeImportService: streaming CSV/XLSX grade import for one subject.
+- CertificateService: regular certificate data, single and in bulk (streamed ZIP).
+- DocumentJobService: database-backed queue of document generation jobs (run_document_jobs).
+- UserSearchService: indexed user search by DNI, username, legajo and name.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import zipfile
+from datetime import timedelta
+from itertools import chain
+from pathlib import Path
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.db.models import Exists, F, OuterRef, Q
+
+from academics.models import Career, Faculty, FinalExam, FinalExamEligibility, Grade, Subject
+from academics.signals import grades_bulk_updated
+from inscriptions.models import FinalExamInscription, SubjectInscription, Waitlist
+from users.documents import render_docx, render_many, stream_zip
+from users import search
+from users.models import CustomUser, DocumentJob, Professor, Student
 
 class StudentFileService:
-    
-    
+    """
+    Student file (ficha del alumno) data, for one student or exported in bulk.
+
+    Bulk exports read students in student_id order through one server-side
+    cursor (QuerySet.iterator), starting after an optional student_id, so memory
+    stays constant and an interrupted export resumes from its last record.
+    """
+
+    EXPORT_CHUNK_SIZE = 2000
+
     @staticmethod
     def get_student_file_data(student_id):
         
         try:
             student = Student.objects.select_related('user', 'career__faculty').get(student_id=student_id)
-            return {
-                "nro_legajo": student.student_id,
-                "apellido_nombre": student.user.get_full_name(),
-                "dni": student.user.dni,
-                "facultad_nombre": student.career.faculty.name,
-                "carrera_nombre": student.career.name,
-                "fecha_inscripcion": student.enrollment_date.strftime("%d/%m/%Y"),
-            }
+            return StudentFileService.to_file_data(student)
         except Student.DoesNotExist:
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def to_file_data(student):
+        """Student file dict of a Student loaded with user and career__faculty."""
+        career = student.career
+        return {
+            "nro_legajo": student.student_id,
+            "apellido_nombre": student.user.get_full_name(),
+            "dni": student.user.dni,
+            "facultad_nombre": career.faculty.name if career else "",
+            "carrera_nombre": career.name if career else "",
+            "fecha_inscripcion": student.enrollment_date.strftime("%d/%m/%Y"),
+        }
+
+    @staticmethod
+    def students(career=None, faculty=None, enrolled_from=None, enrolled_to=None, after=None):
+        """
+        Students to export, in student_id order.
+
+        Args:
+            career (Career | None), faculty (Faculty | None): Restrict to a career / a faculty's careers.
+            enrolled_from, enrolled_to (date | None): Inclusive enrollment_date range.
+            after (str | None): Keyset cursor; only student_id > after.
+        """
+        students = Student.objects.select_related("user", "career__faculty").order_by("student_id")
+        if career is not None:
+            students = students.filter(career=career)
+        if faculty is not None:
+            students = students.filter(career__faculty=faculty)
+        if enrolled_from is not None:
+            students = students.filter(enrollment_date__gte=enrolled_from)
+        if enrolled_to is not None:
+            students = students.filter(enrollment_date__lte=enrolled_to)
+        if after:
+            students = students.filter(student_id__gt=after)
+        return students
+
+    @classmethod
+    def iter_ndjson(cls, students, chunk_size=None, lines_per_chunk=200):
+        """
+        Serialize students as NDJSON (one student file object per line).
+
+        Args:
+            students (QuerySet[Student]): From students().
+            chunk_size (int | None): Rows fetched per round trip (default EXPORT_CHUNK_SIZE).
+            lines_per_chunk (int): Lines joined into each yielded chunk.
+
+        Yields:
+            str: Consecutive chunks of the export.
+        """
+        lines = []
+        for student in students.iterator(chunk_size=chunk_size or cls.EXPORT_CHUNK_SIZE):
+            lines.append(json.dumps(cls.to_file_data(student), ensure_ascii=False) + "\n")
+            if len(lines) >= lines_per_chunk:
+                yield "".join(lines)
+                lines.clear()
+        if lines:
+            yield "".join(lines)
+
+
+class StudentDashboardService:
+    """
+    Build the student dashboard context with a fixed number of queries.
+
+    Membership checks ("am I inscribed?", "can I take this final?") are resolved
+    in the database through EXISTS annotations, so the query count does not grow
+    with the number of subjects, grades or finals.
+
+    Queries:
+        1. Subjects of the student's career (plus any inscribed subject), annotated
+           with is_inscribed and is_eligible_for_final.
+        2. The student's grades with their subject.
+        3. Final exams the student is eligible for or inscribed in, annotated with
+           is_inscribed and is_eligible_for_final.
+
+    Caching:
+        get_cached_dashboard_data() stores the context under a key built from two
+        version tokens: one per student (bumped when its grades or inscriptions
+        change) and one for the curriculum (bumped when any Subject or FinalExam
+        changes). Invalidation only replaces a token, so stale entries are never
+        read again and simply expire. Tokens are random, so an evicted token can
+        never resurrect an old entry.
+    """
+
+    CACHE_PREFIX = "student-dashboard"
+    CURRICULUM_VERSION_KEY = f"{CACHE_PREFIX}:curriculum:version"
+
+    @classmethod
+    def _student_version_key(cls, student_id):
+        return f"{cls.CACHE_PREFIX}:student:{student_id}:version"
+
+    @classmethod
+    def _current_versions(cls, student_id):
+        """Return (student_token, curriculum_token), creating missing tokens."""
+        keys = [cls._student_version_key(student_id), cls.CURRICULUM_VERSION_KEY]
+        found = cache.get_many(keys)
+        tokens = []
+        for key in keys:
+            token = found.get(key)
+            if token is None:
+                token = uuid4().hex
+                if not cache.add(key, token, None):
+                    token = cache.get(key, token)
+            tokens.append(token)
+        return tuple(tokens)
+
+    @classmethod
+    def get_cached_dashboard_data(cls, student):
+        """
+        Return the dashboard context from cache, building it on a miss.
+
+        Args:
+            student (Student): Student whose dashboard is rendered.
+
+        Returns:
+            dict: Same structure as get_dashboard_data().
+        """
+        student_token, curriculum_token = cls._current_versions(student.pk)
+        key = f"{cls.CACHE_PREFIX}:{student.pk}:{student_token}:{curriculum_token}"
+        data = cache.get(key)
+        if data is None:
+            data = cls.get_dashboard_data(student)
+            cache.set(key, data, settings.STUDENT_DASHBOARD_CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def invalidate_student(cls, student_id):
+        """Drop the cached dashboard of one student."""
+        cache.set(cls._student_version_key(student_id), uuid4().hex, None)
+
+    @classmethod
+    def invalidate_students(cls, student_ids):
+        """Drop the cached dashboards of several students in one cache round trip."""
+        cache.set_many({cls._student_version_key(sid): uuid4().hex for sid in student_ids}, None)
+
+    @classmethod
+    def invalidate_curriculum(cls):
+        """Drop every cached dashboard (subjects or final exams changed)."""
+        cache.set(cls.CURRICULUM_VERSION_KEY, uuid4().hex, None)
+
+    @staticmethod
+    def get_dashboard_data(student):
+        """
+        Return the context used by users/student_dashboard.html.
+
+        Args:
+            student (Student): Student whose dashboard is rendered.
+
+        Returns:
+            dict: Evaluated lists (safe to cache/pickle) with keys subjects,
+            inscriptions, grades, eligible_finals and final_inscriptions.
+        """
+        regular_grade = Grade.objects.filter(
+            student=student, status=Grade.StatusSubject.REGULAR
+        )
+        eligibility = FinalExamEligibility.objects.filter(student=student)
+
+        subjects = list(
+            Subject.objects.annotate(
+                is_inscribed=Exists(
+                    SubjectInscription.objects.filter(student=student, subject=OuterRef("pk"))
+                ),
+                is_eligible_for_final=Exists(regular_grade.filter(subject=OuterRef("pk"))),
+            )
+            .filter(Q(career_id=student.career_id) | Q(is_inscribed=True))
+            .order_by("year", "name")
+        )
+
+        grades = list(Grade.objects.filter(student=student).select_related("subject"))
+
+        finals = list(
+            FinalExam.objects.annotate(
+                is_inscribed=Exists(
+                    FinalExamInscription.objects.filter(student=student, final_exam=OuterRef("pk"))
+                ),
+                is_eligible_for_final=Exists(eligibility.filter(final_exam=OuterRef("pk"))),
+            )
+            .filter(Q(is_eligible_for_final=True) | Q(is_inscribed=True))
+            .select_related("subject")
+            .order_by("date", "pk")
+        )
+
+        return {
+            "subjects": [s for s in subjects if s.career_id == student.career_id],
+            "inscriptions": [s for s in subjects if s.is_inscribed],
+            "grades": grades,
+            "eligible_finals": [f for f in finals if f.is_eligible_for_final],
+            "final_inscriptions": [f for f in finals if f.is_inscribed],
+        }
+
+
+class SubjectInscriptionService:
+    """
+    Inscribe students in subjects without get_or_create round trips.
+
+    Both rows (SubjectInscription and its Grade) are written in one transaction
+    with INSERT ... ON CONFLICT DO NOTHING semantics (bulk_create with
+    ignore_conflicts=True). A concurrent duplicate request therefore becomes a
+    no-op instead of an IntegrityError, a savepoint rollback and a retry.
+
+    Subjects with a capacity get their seat through Subject.claim_seat(), a single
+    conditional UPDATE. Subjects without capacity never touch the counter, so
+    they keep the lock-free path.
+
+    Notes:
+        bulk_create does not send post_save, so the student's dashboard cache and
+        final exam eligibility are refreshed explicitly.
+    """
+
+    CREATED = "created"
+    ALREADY_INSCRIBED = "already_inscribed"
+    FULL = "full"
+    INVALID = "invalid"
+
+    @classmethod
+    def inscribe(cls, student, subject):
+        """
+        Inscribe a student in a subject and make sure the Grade row exists.
+
+        Args:
+            student (Student): Student to inscribe.
+            subject (Subject): Target subject (career checks belong to the caller).
+
+        Returns:
+            str: CREATED, ALREADY_INSCRIBED or FULL.
+        """
+        return cls.inscribe_many(student, [subject])[subject.pk]
+
+    @classmethod
+    def inscribe_many(cls, student, subjects):
+        """
+        Inscribe a student in several subjects with one bulk_create per table.
+
+        Args:
+            student (Student): Student to inscribe.
+            subjects (Iterable[Subject]): Already validated target subjects.
+
+        Returns:
+            dict[str, str]: Subject code -> CREATED, ALREADY_INSCRIBED or FULL.
+        """
+        # Claim seats in primary-key order so concurrent batches cannot deadlock.
+        subjects = sorted(subjects, key=lambda s: s.pk)
+        results = {}
+        with transaction.atomic():
+            already = cls._inscribed_codes(student, [s.pk for s in subjects])
+            claimed = []
+            for subject in subjects:
+                if subject.pk in already:
+                    results[subject.pk] = cls.ALREADY_INSCRIBED
+                elif subject.capacity is None:
+                    results[subject.pk] = cls.CREATED
+                elif subject.claim_seat():
+                    claimed.append(subject)
+                else:
+                    results[subject.pk] = cls.FULL
+
+            if claimed:
+                # The seat claims hold the subject row locks, so this re-check is
+                # serialized against a concurrent duplicate of this very request.
+                raced = cls._inscribed_codes(student, [s.pk for s in claimed])
+                for subject in claimed:
+                    if subject.pk in raced:
+                        subject.release_seat()
+                        results[subject.pk] = cls.ALREADY_INSCRIBED
+                    else:
+                        results[subject.pk] = cls.CREATED
+
+            SubjectInscription.objects.bulk_create(
+                [SubjectInscription(student=student, subject=s) for s in subjects if results[s.pk] == cls.CREATED],
+                ignore_conflicts=True,
+            )
+            graded = [s.pk for s in subjects if results[s.pk] != cls.FULL]
+            Grade.objects.bulk_create(
+                [Grade(student=student, subject_id=code) for code in graded],
+                ignore_conflicts=True,
+            )
+            if graded:
+                FinalExamEligibility.objects.sync(student_ids=[student.pk], subject_ids=graded)
+        StudentDashboardService.invalidate_student(student.pk)
+        return results
+
+    @staticmethod
+    def _inscribed_codes(student, codes):
+        """Return the subset of subject codes the student is already inscribed in."""
+        return set(
+            SubjectInscription.objects.filter(student=student, subject_id__in=codes)
+            .values_list("subject_id", flat=True)
+        )
+
+
+class FinalExamInscriptionService:
+    """
+    Inscribe students in final exam sessions, claiming a seat when the session is capped.
+
+    Eligibility (REGULAR status) is checked by the caller.
+    """
+
+    CREATED = "created"
+    ALREADY_INSCRIBED = "already_inscribed"
+    FULL = "full"
+
+    @classmethod
+    def inscribe(cls, student, final_exam):
+        """
+        Inscribe a student in a final exam session.
+
+        Args:
+            student (Student): Student to inscribe.
+            final_exam (FinalExam): Target session.
+
+        Returns:
+            str: CREATED, ALREADY_INSCRIBED or FULL.
+        """
+        inscriptions = FinalExamInscription.objects.filter(student=student, final_exam=final_exam)
+        with transaction.atomic():
+            if inscriptions.exists():
+                return cls.ALREADY_INSCRIBED
+            if not final_exam.claim_seat():
+                return cls.FULL
+            # Re-check under the seat's row lock (only taken for capped sessions).
+            if final_exam.capacity is not None and inscriptions.exists():
+                final_exam.release_seat()
+                return cls.ALREADY_INSCRIBED
+            FinalExamInscription.objects.bulk_create(
+                [FinalExamInscription(student=student, final_exam=final_exam)], ignore_conflicts=True
+            )
+        StudentDashboardService.invalidate_student(student.pk)
+        return cls.CREATED
+
+
+class WaitlistService:
+    """
+    FIFO waitlist for full subjects and final exam sessions.
+
+    Students join when an inscription is rejected for lack of seats. Deleting an
+    inscription promotes the head of its target's queue once the transaction
+    commits (inscriptions.signals); the promote_waitlist worker calls promote()
+    as a backstop to hand any other freed seat to the oldest entries. Entries are locked with SELECT ... FOR UPDATE SKIP LOCKED, so several
+    workers can drain the queue in parallel without promoting anyone twice.
+    """
+
+    @staticmethod
+    def join(student, subject=None, final_exam=None):
+        """
+        Put the student on the waitlist of a subject or a final exam.
+
+        Joining twice keeps the original position.
+
+        Returns:
+            int: 1-based position in the target's queue.
+        """
+        Waitlist.objects.bulk_create(
+            [Waitlist(student=student, subject=subject, final_exam=final_exam)], ignore_conflicts=True
+        )
+        queue = Waitlist.objects.filter(subject=subject, final_exam=final_exam)
+        joined_at = queue.filter(student=student).values_list("created_at", flat=True).get()
+        return queue.filter(created_at__lte=joined_at).count()
+
+    @staticmethod
+    def _has_free_seat(target):
+        """Q for waitlist entries whose `target` relation can take one more student."""
+        return Q(**{f"{target}__isnull": False}) & (
+            Q(**{f"{target}__capacity__isnull": True})
+            | Q(**{f"{target}__seats_taken__lt": F(f"{target}__capacity")})
+        )
+
+    @classmethod
+    def promote(cls, batch_size=100, subject=None, final_exam=None):
+        """
+        Promote up to batch_size waiting students whose target has a free seat.
+
+        Entries whose student got inscribed some other way are dropped.
+
+        Args:
+            batch_size (int): Maximum number of entries locked by this call.
+            subject (Subject | None): Only promote from this subject's queue.
+            final_exam (FinalExam | None): Only promote from this final exam's queue.
+
+        Returns:
+            tuple[int, int]: Students promoted and entries handled (promoted or
+            dropped). A batch of dropped entries promotes nobody, so callers
+            draining the queue must keep going while handled > 0.
+        """
+        queue = Waitlist.objects.all()
+        if subject is not None:
+            queue = queue.filter(subject=subject)
+        if final_exam is not None:
+            queue = queue.filter(final_exam=final_exam)
+        with transaction.atomic():
+            entries = list(
+                queue.select_for_update(skip_locked=True, of=("self",))
+                .filter(cls._has_free_seat("subject") | cls._has_free_seat("final_exam"))
+                .select_related("subject", "final_exam")
+                .order_by("created_at", "pk")[:batch_size]
+            )
+            if not entries:
+                return 0, 0
+
+            subject_entries = [e for e in entries if e.subject_id]
+            final_entries = [e for e in entries if e.final_exam_id]
+            inscribed_subjects = set(
+                SubjectInscription.objects.filter(
+                    student_id__in={e.student_id for e in subject_entries},
+                    subject_id__in={e.subject_id for e in subject_entries},
+                ).values_list("student_id", "subject_id")
+            )
+            inscribed_finals = set(
+                FinalExamInscription.objects.filter(
+                    student_id__in={e.student_id for e in final_entries},
+                    final_exam_id__in={e.final_exam_id for e in final_entries},
+                ).values_list("student_id", "final_exam_id")
+            )
+
+            # Claim seats grouped by target (FIFO inside each group) so that
+            # concurrent workers lock target rows in the same order.
+            entries.sort(key=lambda e: (e.subject_id is None, str(e.subject_id or e.final_exam_id), e.created_at))
+            promoted, handled, full_targets = [], [], set()
+            for entry in entries:
+                if entry.subject_id:
+                    already = (entry.student_id, entry.subject_id) in inscribed_subjects
+                else:
+                    already = (entry.student_id, entry.final_exam_id) in inscribed_finals
+                target_key = (entry.subject_id, entry.final_exam_id)
+                if already:
+                    handled.append(entry)
+                elif target_key not in full_targets:
+                    if entry.target.claim_seat():
+                        promoted.append(entry)
+                        handled.append(entry)
+                    else:
+                        full_targets.add(target_key)
+
+            promoted_subjects = [e for e in promoted if e.subject_id]
+            SubjectInscription.objects.bulk_create(
+                [SubjectInscription(student_id=e.student_id, subject_id=e.subject_id) for e in promoted_subjects],
+                ignore_conflicts=True,
+            )
+            Grade.objects.bulk_create(
+                [Grade(student_id=e.student_id, subject_id=e.subject_id) for e in promoted_subjects],
+                ignore_conflicts=True,
+            )
+            if promoted_subjects:
+                FinalExamEligibility.objects.sync(
+                    student_ids={e.student_id for e in promoted_subjects},
+                    subject_ids={e.subject_id for e in promoted_subjects},
+                )
+            FinalExamInscription.objects.bulk_create(
+                [
+                    FinalExamInscription(student_id=e.student_id, final_exam_id=e.final_exam_id)
+                    for e in promoted if e.final_exam_id
+                ],
+                ignore_conflicts=True,
+            )
+            Waitlist.objects.filter(pk__in=[e.pk for e in handled]).delete()
+
+        StudentDashboardService.invalidate_students({e.student_id for e in promoted})
+        return len(promoted), len(handled)
+
+
+class GradeImportService:
+    """
+    Import the grades of one subject from a CSV or XLSX spreadsheet.
+
+    The file is read row by row (csv.reader over the upload stream, or openpyxl in
+    read-only mode), so memory is bounded by the size of the course, not the file.
+    Students are resolved by student_id (legajo) or DNI through dictionaries built
+    from a single query; changed grades are written in chunks of CHUNK_SIZE rows
+    (Grade.objects.bulk_update_values), all inside one transaction.
+
+    Columns (header row, case-insensitive, Spanish aliases accepted):
+        student_id|legajo or dni, promotion_grade|promocion, final_grade|final,
+        status|estado (optional). A missing column keeps the current value; an
+        empty cell clears the grade. A status is stored as a manual override; an
+        empty one keeps the current override or derives the status from
+        final_grade (Grade.set_status), as in grade_edit; "auto" clears the override.
+
+    Notes:
+        XLSX support requires the optional ``openpyxl`` package.
+    """
+
+    CHUNK_SIZE = 1000
+    MAX_REPORTED_ERRORS = 100
+    GRADE_FIELDS = ("promotion_grade", "final_grade")
+    UPDATE_FIELDS = ["promotion_grade", "final_grade", "status", "status_override", "last_updated"]
+    COLUMNS = {
+        "student_id": "student_id", "legajo": "student_id",
+        "dni": "dni",
+        "promotion_grade": "promotion_grade", "promocion": "promotion_grade", "promoción": "promotion_grade",
+        "final_grade": "final_grade", "final": "final_grade", "nota_final": "final_grade",
+        "status": "status", "estado": "status",
+    }
+    STATUS_ALIASES = {"libre": "free", "promocionado": "promoted", "promocionada": "promoted"}
+    CLEAR_OVERRIDE_STATUSES = {"auto", "calculado"}
+
+    @classmethod
+    def iter_rows(cls, uploaded_file):
+        """
+        Yield the rows of an uploaded spreadsheet as lists of stripped strings.
+
+        Args:
+            uploaded_file (UploadedFile): CSV (comma, semicolon or tab separated) or XLSX.
+
+        Raises:
+            ValueError: If the file is XLSX and openpyxl is not installed.
+        """
+        if uploaded_file.name.lower().endswith(".xlsx"):
+            yield from cls._iter_xlsx(uploaded_file)
+            return
+        text = io.TextIOWrapper(uploaded_file.file, encoding="utf-8-sig", newline="")
+        try:
+            first = text.readline()
+            try:
+                dialect = csv.Sniffer().sniff(first, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            for row in csv.reader(chain([first], text), dialect):
+                yield [cell.strip() for cell in row]
+        finally:
+            text.detach()
+
+    @staticmethod
+    def _iter_xlsx(uploaded_file):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as exc:
+            raise ValueError("Para importar archivos XLSX instalá openpyxl o subí un CSV.") from exc
+        try:
+            workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, KeyError) as exc:
+            raise ValueError("El archivo XLSX no es válido.") from exc
+        try:
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                yield [
+                    "" if value is None
+                    else str(int(value)) if isinstance(value, float) and value.is_integer()
+                    else str(value).strip()
+                    for value in row
+                ]
+        finally:
+            workbook.close()
+
+    @classmethod
+    def _status_lookup(cls):
+        lookup = dict(cls.STATUS_ALIASES)
+        for value, label in Grade.StatusSubject.choices:
+            lookup[value.lower()] = value
+            lookup[str(label).lower()] = value
+        return lookup
+
+    @classmethod
+    def import_grades(cls, subject, uploaded_file, dry_run=False):
+        """
+        Apply a spreadsheet of grades to the inscribed students of a subject.
+
+        Valid rows are applied even if other rows fail; every failure is counted
+        and the first MAX_REPORTED_ERRORS are described in the report.
+
+        Args:
+            subject (Subject): Subject being graded.
+            uploaded_file (UploadedFile): CSV or XLSX upload.
+            dry_run (bool): Validate only; nothing is written.
+
+        Returns:
+            dict: rows, updated, unchanged, error_count, errors (list of
+            (line, message)) and dry_run.
+        """
+        report = {"rows": 0, "updated": 0, "unchanged": 0, "error_count": 0, "errors": [], "dry_run": dry_run}
+
+        def error(line, message):
+            report["error_count"] += 1
+            if len(report["errors"]) < cls.MAX_REPORTED_ERRORS:
+                report["errors"].append((line, message))
+
+        try:
+            rows = cls.iter_rows(uploaded_file)
+            header = next(rows, None)
+        except UnicodeDecodeError:
+            error(1, "El archivo no está en UTF-8.")
+            return report
+        except (ValueError, csv.Error) as exc:
+            error(1, str(exc))
+            return report
+        columns = {}
+        for index, name in enumerate(header or []):
+            field = cls.COLUMNS.get(name.strip().lower().replace(" ", "_"))
+            if field and field not in columns:
+                columns[field] = index
+        if "student_id" not in columns and "dni" not in columns:
+            error(1, "Falta la columna student_id (legajo) o dni.")
+            return report
+
+        grades = list(
+            Grade.objects.filter(subject=subject, student__subjects_inscriptions__subject=subject)
+            .select_related("student__user")
+        )
+        by_student_id = {g.student_id: g for g in grades}
+        by_dni = {g.student.user.dni: g for g in grades}
+        form_fields = {name: Grade._meta.get_field(name).formfield() for name in cls.GRADE_FIELDS}
+        statuses = cls._status_lookup()
+        now = timezone.now()
+        pending, touched = {}, set()
+
+        def flush():
+            if pending and not dry_run:
+                Grade.objects.bulk_update_values(list(pending.values()), cls.UPDATE_FIELDS, batch_size=cls.CHUNK_SIZE)
+            pending.clear()
+
+        line = 1
+        with transaction.atomic():
+            try:
+                for line, row in enumerate(rows, start=2):
+                    if not any(row):
+                        continue
+                    report["rows"] += 1
+                    cell = {field: row[index] if index < len(row) else "" for field, index in columns.items()}
+                    grade = by_student_id.get(cell.get("student_id")) or by_dni.get(cell.get("dni"))
+                    if grade is None:
+                        key = cell.get("student_id") or cell.get("dni") or "?"
+                        error(line, f"Estudiante no inscripto en la materia: {key}.")
+                        continue
+
+                    values, failed = {}, False
+                    for name in cls.GRADE_FIELDS:
+                        if name not in cell:
+                            values[name] = getattr(grade, name)
+                            continue
+                        try:
+                            values[name] = form_fields[name].clean(cell[name].replace(",", "."))
+                        except ValidationError as exc:
+                            error(line, f"{name}: {' '.join(exc.messages)}")
+                            failed = True
+                    status = cell.get("status", "").lower()
+                    clear_override = status in cls.CLEAR_OVERRIDE_STATUSES
+                    if status and status not in statuses and not clear_override:
+                        error(line, f"Estado desconocido: {cell['status']}.")
+                        failed = True
+                    if failed:
+                        continue
+
+                    before = (grade.promotion_grade, grade.final_grade, grade.status, grade.status_override)
+                    ungraded = Grade.StatusSubject.FREE if grade.final_grade is not None else None
+                    grade.promotion_grade = values["promotion_grade"]
+                    grade.final_grade = values["final_grade"]
+                    grade.set_status(statuses.get(status), ungraded, clear_override=clear_override)
+                    if (grade.promotion_grade, grade.final_grade, grade.status, grade.status_override) == before:
+                        report["unchanged"] += 1
+                        continue
+                    grade.last_updated = now
+                    pending[grade.pk] = grade
+                    touched.add(grade.student_id)
+                    report["updated"] += 1
+                    if len(pending) >= cls.CHUNK_SIZE:
+                        flush()
+            except UnicodeDecodeError:
+                error(line + 1, "El archivo no está en UTF-8.")
+            except (ValueError, csv.Error) as exc:
+                error(line + 1, str(exc))
+            flush()
+            if touched and not dry_run:
+                grades_bulk_updated.send(sender=Grade, student_ids=touched, subject_ids=[subject.pk])
+        return report
+
+
+class CertificateService:
+    """
+    Regular student certificates ("certificado de alumno regular").
+
+    Builds the template context of one student and renders certificates in bulk
+    for every student of a career or faculty. Bulk runs walk the students in
+    student_id order with keyset pagination (student_id > last), so a run can
+    resume after the last certificate it produced, and render in worker
+    processes (users.documents.render_many).
+    """
+
+    TEMPLATE_NAME = "regular_certificate.docx"
+    CHUNK_SIZE = 500
+
+    @classmethod
+    def template_path(cls):
+        return Path(settings.BASE_DIR) / cls.TEMPLATE_NAME
+
+    @staticmethod
+    def get_context(student, today):
+        """
+        Template context of the certificate of student issued on today.
+
+        Args:
+            student (Student): With user and career__faculty loaded.
+            today (date): Issue date.
+
+        Returns:
+            dict: Context for regular_certificate.docx.
+        """
+        user = student.user
+        career = student.career
+        return {
+            "full_name": user.get_full_name() or user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "dni": user.dni,
+            "student_id": student.student_id,
+            "career_name": career.name if career else "",
+            "career_code": career.code if career else "",
+            "faculty_name": career.faculty.name if career and career.faculty else "",
+            "enrollment_date": student.enrollment_date.strftime("%d/%m/%Y") if student.enrollment_date else "",
+            "today_date": today.strftime("%d/%m/%Y"),
+            "today_day": f"{today.day:02d}",
+            "today_month": f"{today.month:02d}",
+            "today_year": f"{today.year}",
+        }
+
+    @staticmethod
+    def archive_name(student):
+        """Name of a student's certificate inside a bulk ZIP (starts with the student_id)."""
+        return f"{student.student_id}-certificado-regular.docx"
+
+    @staticmethod
+    def student_id_from_archive_name(name):
+        return name.split("-certificado-regular", 1)[0]
+
+    @staticmethod
+    def students(career=None, faculty=None):
+        """Students of a career and/or faculty (all when both are None), in student_id order."""
+        students = Student.objects.select_related("user", "career__faculty").order_by("student_id")
+        if career is not None:
+            students = students.filter(career=career)
+        if faculty is not None:
+            students = students.filter(career__faculty=faculty)
+        return students
+
+    @classmethod
+    def _iter_students(cls, students, after=None):
+        while True:
+            chunk = list((students.filter(student_id__gt=after) if after else students)[: cls.CHUNK_SIZE])
+            yield from chunk
+            if len(chunk) < cls.CHUNK_SIZE:
+                return
+            after = chunk[-1].student_id
+
+    @classmethod
+    def iter_certificates(cls, students, after=None, today=None, workers=None, on_progress=None):
+        """
+        Render the certificate of every student.
+
+        Args:
+            students (QuerySet[Student]): Ordered by student_id (see students()).
+            after (str | None): Resume after this student_id.
+            today (date | None): Issue date (defaults to today).
+            workers (int | None): Worker processes (default DOCX_BATCH_WORKERS).
+            on_progress (Callable[[int, str], None] | None): Called with the number of
+                certificates produced so far and the last student_id.
+
+        Yields:
+            tuple[str, bytes]: (archive_name, DOCX) per student.
+        """
+        today = today or timezone.localdate()
+        items = (
+            (student, cls.get_context(student, today)) for student in cls._iter_students(students, after)
+        )
+        for done, (student, content) in enumerate(
+            render_many(cls.template_path(), items, workers=workers), start=1
+        ):
+            yield cls.archive_name(student), content
+            if on_progress:
+                on_progress(done, student.student_id)
+
+    @classmethod
+    def stream_archive(cls, students, after=None, workers=None):
+        """ZIP of iter_certificates() as a stream of byte chunks (see users.documents.stream_zip)."""
+        return stream_zip(cls.iter_certificates(students, after=after, workers=workers))
+
+
+class DocumentJobService:
+    """
+    Database-backed queue for document generation (DocumentJob), without a broker.
+
+    submit() stores a PENDING job; run_document_jobs workers call run_next(),
+    which claims the oldest due job with SELECT ... FOR UPDATE SKIP LOCKED (so
+    any number of workers share the queue without running a job twice),
+    renders its output under DOCUMENT_JOB_DIR/<id>-<random hex>/ and marks it
+    DONE until DOCUMENT_JOB_TTL seconds later, when cleanup() deletes the file.
+    The directory name is unguessable and DOCUMENT_JOB_DIR lies outside
+    MEDIA_ROOT: outputs are only served by the document_job_download view.
+
+    A failed attempt is retried after DOCUMENT_JOB_RETRY_DELAY * 2 ** (attempt - 1)
+    seconds, up to max_attempts. A job left RUNNING for more than
+    DOCUMENT_JOB_LEASE seconds (its worker died) is put back in the queue; an
+    attempt finishes only if its lease is still current.
+    """
+
+    PROGRESS_EVERY = 50
+    HANDLERS = {
+        DocumentJob.Kind.CERTIFICATES: "_run_certificates",
+        DocumentJob.Kind.STUDENT_FILE: "_run_student_file",
+    }
+
+    @staticmethod
+    def submit(kind, params, user=None):
+        """Queue a job of kind with params on behalf of user."""
+        return DocumentJob.objects.create(
+            kind=kind, params=params, requested_by=user, max_attempts=settings.DOCUMENT_JOB_MAX_ATTEMPTS
+        )
+
+    @staticmethod
+    def visible_to(user):
+        """Jobs user may poll and download: all for administrators, their own otherwise."""
+        jobs = DocumentJob.objects.all()
+        if user.role == CustomUser.Role.ADMIN:
+            return jobs
+        return jobs.filter(requested_by=user)
+
+    @staticmethod
+    def output_path(job):
+        return Path(settings.DOCUMENT_JOB_DIR) / job.output
+
+    @staticmethod
+    def claim():
+        """
+        Lock the oldest due PENDING job and start an attempt on it.
+
+        Returns:
+            DocumentJob | None: The claimed job (RUNNING), or None if nothing is due.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            job = (
+                DocumentJob.objects.select_for_update(skip_locked=True)
+                .filter(status=DocumentJob.Status.PENDING, run_after__lte=now)
+                .order_by("run_after", "pk")
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = DocumentJob.Status.RUNNING
+            job.attempts += 1
+            job.locked_at = now
+            job.save(update_fields=["status", "attempts", "locked_at"])
+        return job
+
+    @classmethod
+    def run_next(cls):
+        """
+        Claim and run one job.
+
+        Returns:
+            DocumentJob | None: The job after its attempt, or None if the queue was empty.
+        """
+        job = cls.claim()
+        if job is not None:
+            cls.run(job)
+        return job
+
+    @classmethod
+    def run(cls, job):
+        """Run one attempt of a claimed job, recording success, retry or failure."""
+        directory = Path(settings.DOCUMENT_JOB_DIR) / f"{job.pk}-{uuid4().hex}"
+        directory.mkdir(parents=True)
+        try:
+            filename = getattr(cls, cls.HANDLERS[job.kind])(job, directory)
+        except Exception as exc:
+            shutil.rmtree(directory, ignore_errors=True)
+            cls._record_failure(job, exc)
+            return
+        now = timezone.now()
+        job.status, job.output, job.filename, job.error = (
+            DocumentJob.Status.DONE, f"{directory.name}/{filename}", filename, ""
+        )
+        job.finished_at, job.expires_at = now, now + timedelta(seconds=settings.DOCUMENT_JOB_TTL)
+        cls._finish(job, ["status", "output", "filename", "error", "finished_at", "expires_at"])
+
+    @classmethod
+    def _record_failure(cls, job, exc):
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= job.max_attempts:
+            job.status, job.finished_at = DocumentJob.Status.FAILED, timezone.now()
+        else:
+            job.status = DocumentJob.Status.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.DOCUMENT_JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        cls._finish(job, ["status", "error", "finished_at", "run_after"])
+
+    @staticmethod
+    def _finish(job, fields):
+        """Save the outcome of an attempt unless the job was requeued meanwhile (lease lost)."""
+        DocumentJob.objects.filter(
+            pk=job.pk, status=DocumentJob.Status.RUNNING, locked_at=job.locked_at
+        ).update(**{field: getattr(job, field) for field in fields})
+
+    @staticmethod
+    def requeue_stale():
+        """
+        Put RUNNING jobs whose lease (DOCUMENT_JOB_LEASE) expired back in the queue.
+
+        Returns:
+            int: Jobs requeued or, when out of attempts, marked FAILED.
+        """
+        now = timezone.now()
+        stale = DocumentJob.objects.filter(
+            status=DocumentJob.Status.RUNNING, locked_at__lt=now - timedelta(seconds=settings.DOCUMENT_JOB_LEASE)
+        )
+        failed = stale.filter(attempts__gte=F("max_attempts")).update(
+            status=DocumentJob.Status.FAILED, error="El proceso de trabajo dejó de responder.", finished_at=now
+        )
+        return failed + stale.update(status=DocumentJob.Status.PENDING, run_after=now, locked_at=None)
+
+    @staticmethod
+    def cleanup():
+        """
+        Delete the outputs of DONE jobs past expires_at and mark them EXPIRED.
+
+        Returns:
+            int: Jobs expired.
+        """
+        expired = DocumentJob.objects.filter(status=DocumentJob.Status.DONE, expires_at__lte=timezone.now())
+        outputs = dict(expired.values_list("pk", "output"))
+        for output in outputs.values():
+            if output:
+                shutil.rmtree(Path(settings.DOCUMENT_JOB_DIR) / Path(output).parent, ignore_errors=True)
+        return DocumentJob.objects.filter(pk__in=outputs).update(status=DocumentJob.Status.EXPIRED, output="")
+
+    @staticmethod
+    def _write(directory, filename, content):
+        """Write content (bytes or iterable of bytes) to directory/filename atomically."""
+        tmp = directory / f".{filename}.tmp"
+        with open(tmp, "wb") as out:
+            if isinstance(content, bytes):
+                out.write(content)
+            else:
+                for chunk in content:
+                    out.write(chunk)
+        os.replace(tmp, directory / filename)
+        return filename
+
+    @classmethod
+    def _run_certificates(cls, job, directory):
+        career_code, faculty_code = job.params.get("career"), job.params.get("faculty")
+        career = Career.objects.get(code=career_code) if career_code else None
+        faculty = Faculty.objects.get(code=faculty_code) if faculty_code else None
+        students = CertificateService.students(career=career, faculty=faculty)
+        DocumentJob.objects.filter(pk=job.pk).update(total=students.count(), progress=0)
+
+        def progress(done, _student_id):
+            if done % cls.PROGRESS_EVERY == 0:
+                DocumentJob.objects.filter(pk=job.pk).update(progress=done)
+
+        entries = CertificateService.iter_certificates(students, on_progress=progress)
+        scope = career_code or faculty_code or "todos"
+        filename = f"certificados-regulares-{scope}-{timezone.localdate().strftime('%Y%m%d')}.zip"
+        cls._write(directory, filename, stream_zip(entries))
+        DocumentJob.objects.filter(pk=job.pk).update(progress=F("total"))
+        return filename
+
+    @classmethod
+    def _run_student_file(cls, job, directory):
+        student_id = job.params["student_id"]
+        data = StudentFileService.get_student_file_data(student_id)
+        if data is None:
+            raise Student.DoesNotExist(f"No existe el legajo {student_id}.")
+        DocumentJob.objects.filter(pk=job.pk).update(total=1)
+        content = render_docx(Path(settings.BASE_DIR) / "ficha_alumno.docx", data)
+        DocumentJob.objects.filter(pk=job.pk).update(progress=1)
+        return cls._write(directory, f"ficha_alumno_{student_id}.docx", content)
+
+
+class UserSearchService:
+    """
+    Search users by DNI, username, student_id/professor_id or name.
+
+    Every branch is answered by its own index and the matching ids are combined
+    with UNION ALL, so the users table is only probed by primary key:
+
+    - dni, username, student_id, professor_id: exact or prefix match (B-tree).
+    - name: every word of the query must match the first or last name, fuzzily
+      through pg_trgm when available, otherwise as a case-insensitive prefix
+      (see users.search for the indexes).
+    """
+
+    MIN_TRIGRAM_LENGTH = 3
+
+    @classmethod
+    def search(cls, queryset, query):
+        """
+        Restrict queryset (of CustomUser) to the users matching query.
+
+        Args:
+            queryset (QuerySet[CustomUser]): Users to search in.
+            query (str): Free text typed in the search box.
+
+        Returns:
+            QuerySet[CustomUser]: queryset unchanged for a blank query.
+        """
+        query = query.strip()
+        if not query:
+            return queryset
+        branches = [
+            CustomUser.objects.filter(dni__startswith=query).values("id"),
+            CustomUser.objects.filter(username__startswith=query).values("id"),
+            Student.objects.filter(student_id__startswith=query).values("user_id"),
+            Professor.objects.filter(professor_id__startswith=query).values("user_id"),
+        ]
+        words = query.split()
+        if not any(word.isdigit() for word in words):
+            branches.append(CustomUser.objects.filter(cls._name_filter(words)).values("id"))
+        return queryset.filter(pk__in=branches[0].union(*branches[1:], all=True))
+
+    @classmethod
+    def _name_filter(cls, words):
+        trigram = search.supports_trigram(connection)
+        condition = Q()
+        for word in words:
+            if trigram and len(word) >= cls.MIN_TRIGRAM_LENGTH:
+                condition &= Q(first_name__trigram_word_similar=word) | Q(last_name__trigram_word_similar=word)
+            else:
+                condition &= Q(first_name__istartswith=word) | Q(last_name__istartswith=word)
+        return condition
@@ -0,0 +1,69 @@
+"""Signal handlers for the Users app.
+
+Keeps the per-student dashboard cache (StudentDashboardService) in sync:
+- Grade, SubjectInscription and FinalExamInscription changes invalidate the owning student.
+- Subject and FinalExam changes invalidate every dashboard (curriculum version).
+- grades_bulk_updated invalidates every student whose grades were written in bulk.
+
+Also installs the PostgreSQL user search indexes after migrate (users.search) and
+creates the table of a database cache backend (the default, see CACHES).
+
+Notes:
+    Bulk operations (bulk_create, bulk_update, QuerySet.update) do not send these
+    signals; callers must invalidate explicitly through StudentDashboardService.
+"""
+
+from django.core.management import call_command
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from academics.models import FinalExam, Grade, Subject
+from academics.signals import grades_bulk_updated
+from inscriptions.models import FinalExamInscription, SubjectInscription
+from users import search
+from users.services import StudentDashboardService
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+@receiver(post_save, sender=SubjectInscription)
+@receiver(post_delete, sender=SubjectInscription)
+@receiver(post_save, sender=FinalExamInscription)
+@receiver(post_delete, sender=FinalExamInscription)
+def invalidate_student_dashboard(sender, instance, **kwargs):
+    """Invalidate the dashboard of the student owning the changed row."""
+    StudentDashboardService.invalidate_student(instance.student_id)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+@receiver(post_save, sender=FinalExam)
+@receiver(post_delete, sender=FinalExam)
+def invalidate_curriculum_dashboards(sender, **kwargs):
+    """Invalidate every dashboard when the curriculum changes."""
+    StudentDashboardService.invalidate_curriculum()
+
+
+@receiver(grades_bulk_updated, sender=Grade)
+def invalidate_bulk_grade_dashboards(sender, student_ids, **kwargs):
+    """Invalidate the dashboards of the students touched by a bulk grade write."""
+    if student_ids is None:
+        StudentDashboardService.invalidate_curriculum()
+    else:
+        StudentDashboardService.invalidate_students(student_ids)
+
+
+@receiver(post_migrate)
+def install_user_search_indexes(sender, using="default", **kwargs):
+    """Create the trigram/prefix name indexes used by the user search (PostgreSQL only)."""
+    connection = connections[using]
+    if sender.name == "users" and search.supports_search_indexes(connection):
+        search.install_search_indexes(connection)
+
+
+@receiver(post_migrate)
+def create_cache_table(sender, using="default", **kwargs):
+    """Create the tables of database cache backends after migrate (createcachetable skips the others)."""
+    if sender.name == "users":
+        call_command("createcachetable", database=using, verbosity=0)
@@ -1,13 +1,50 @@
+import csv
+import json
+import os
+import shutil
+import threading
+import zipfile
 from datetime import date, timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import skipUnless
 from unittest.mock import patch
 from tempfile import TemporaryDirectory
 
-from django.test import TestCase, override_settings
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 from academics.models import Career, Faculty, FinalExam, Grade, Subject
-from inscriptions.models import FinalExamInscription, SubjectInscription
-from users.models import Administrator, CustomUser, Professor, Student
+from inscriptions.models import FinalExamInscription, SubjectInscription, Waitlist
+from users.documents import (
+    DocumentCache,
+    DocumentRenderBusy,
+    DocxTemplateRegistry,
+    ProcessPoolRenderer,
+    get_renderer,
+    render_docx,
+    render_many,
+)
+from users.checks import check_private_files, check_shared_cache
+from users.pagination import EstimatedCountPaginator
+from users.models import Administrator, CustomUser, DocumentJob, Professor, Student
+from users.services import (
+    CertificateService,
+    DocumentJobService,
+    FinalExamInscriptionService,
+    StudentDashboardService,
+    StudentFileService,
+    SubjectInscriptionService,
+    UserSearchService,
+    WaitlistService,
+)
 
 
 class CustomUserModelTest(TestCase):
@@ -97,6 +134,10 @@ class AdministratorModelTest(TestCase):
         self.assertEqual(admin.position, 'Manager')
 
 
+# Query-count assertions measure the application's queries; the default DatabaseCache would add its own.
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
 def make_admin(username="admin", dni="90000000"):
     user = CustomUser.objects.create_user(
         username=username,
@@ -384,6 +425,30 @@ class StudentViewsTests(TestCase):
         resp = self.client.post(reverse("users:subject-inscribe", args=[self.subject.code]))
         self.assertEqual(resp.status_code, 302)
 
+    def test_subject_inscribe_batch_reports_per_subject(self):
+        other = make_subject("FIS1", self.student.career)
+        foreign = make_subject("QUI1", make_career("OTR", make_faculty("F9")))
+        SubjectInscription.objects.create(student=self.student, subject=other)
+        self.client.force_login(self.student_user)
+
+        resp = self.client.post(
+            reverse("users:subject-inscribe-batch"),
+            data={"subjects": [self.subject.code, other.code, foreign.code]},
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        results = {row["code"]: row["result"] for row in resp.context["summary"]}
+        self.assertEqual(results, {
+            self.subject.code: SubjectInscriptionService.CREATED,
+            other.code: SubjectInscriptionService.ALREADY_INSCRIBED,
+            foreign.code: SubjectInscriptionService.INVALID,
+        })
+        self.assertEqual(
+            set(Grade.objects.filter(student=self.student).values_list("subject_id", flat=True)),
+            {self.subject.code, other.code},
+        )
+        self.assertFalse(SubjectInscription.objects.filter(student=self.student, subject=foreign).exists())
+
     def test_final_exam_inscribe_requires_regular(self):
         self.client.force_login(self.student_user)
         final = FinalExam.objects.create(
@@ -404,6 +469,19 @@ class StudentViewsTests(TestCase):
         self.assertEqual(resp.status_code, 302)
         self.assertTrue(FinalExamInscription.objects.filter(student=self.student, final_exam=final).exists())
 
+    def test_final_exam_inscribe_twice_reports_already_inscribed(self):
+        self.client.force_login(self.student_user)
+        final = FinalExam.objects.create(
+            subject=self.subject, date=date.today() + timedelta(days=10), duration=timedelta(hours=2), call_number=1
+        )
+        Grade.objects.create(student=self.student, subject=self.subject, status=Grade.StatusSubject.REGULAR)
+        url = reverse("users:final-inscribe", args=[final.id])
+        resp = self.client.post(url, follow=True)
+        self.assertEqual([str(m) for m in resp.context["messages"]], ["Inscripción al final realizada."])
+        resp = self.client.post(url, follow=True)
+        self.assertEqual([str(m) for m in resp.context["messages"]], ["Ya estabas inscripto en este final."])
+        self.assertEqual(FinalExamInscription.objects.filter(student=self.student).count(), 1)
+
     def test_download_certificate_requires_login_and_student_profile(self):
         # Unauthenticated -> redirect to login
         resp = self.client.get(reverse("users:student-regular-certificate"))
@@ -433,38 +511,879 @@ class StudentViewsTests(TestCase):
                 self.assertEqual(resp.status_code, 302)
                 self.assertEqual(resp["Location"], reverse("users:student-dashboard"))
 
-    @patch("users.views.DocxTemplate")
-    def test_download_certificate_success_returns_docx(self, mock_tpl_cls):
-        # Mock DocxTemplate to avoid real file IO and docx processing
-        class FakeTpl:
-            def __init__(self, *_args, **_kwargs):
-                pass
+    @patch("users.views.render_docx")
+    def test_download_certificate_success_returns_docx(self, mock_render):
+        # Mock the renderer to avoid real docx processing
+        mock_render.return_value = b"PK\x03\x04fake-docx-content"
 
-            def render(self, _context):
-                return None
+        # Ensure logged in as valid student
+        self.client.force_login(self.student_user)
+        with TemporaryDirectory() as tmpdir, override_settings(DOCUMENT_CACHE_DIR=tmpdir):
+            resp = self.client.get(reverse("users:student-regular-certificate"))
+
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(
+                resp["Content-Type"],
+                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            )
+            content_disp = resp["Content-Disposition"]
+            ok = (
+                "attachment; filename=\"certificado-regular-" in content_disp
+                or "attachment; filename=\"certificado-regular-stud-" in content_disp
+            )
+            self.assertTrue(ok)
+            self.assertTrue(len(b"".join(resp.streaming_content)) > 0)
+
+    @patch("users.views.render_docx")
+    def test_download_certificate_is_cached_and_revalidated(self, mock_render):
+        mock_render.return_value = b"PK\x03\x04fake-docx-content"
+        self.client.force_login(self.student_user)
+        url = reverse("users:student-regular-certificate")
+        with TemporaryDirectory() as tmpdir, override_settings(DOCUMENT_CACHE_DIR=tmpdir):
+            first = self.client.get(url)
+            second = self.client.get(url)
+            self.assertEqual(b"".join(second.streaming_content), mock_render.return_value)
+            self.assertEqual(mock_render.call_count, 1)
+            self.assertEqual(first["ETag"], second["ETag"])
 
-            def save(self, dest):
-                # Write some bytes to the provided BytesIO
-                dest.write(b"PK\x03\x04fake-docx-content")
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(resp.status_code, 304)
+            self.assertEqual(mock_render.call_count, 1)
 
-        mock_tpl_cls.return_value = FakeTpl()
 
-        # Ensure logged in as valid student
-        self.client.force_login(self.student_user)
+class DocxTemplateRegistryTests(TestCase):
+    def setUp(self):
+        self.registry = DocxTemplateRegistry()
+        self.tmpdir = TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "plantilla.docx"
+        shutil.copy(Path(settings.BASE_DIR) / "ficha_alumno.docx", self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def document_text(self, content):
+        with zipfile.ZipFile(BytesIO(content)) as docx:
+            return docx.read("word/document.xml").decode()
+
+    def test_compiles_once_and_renders_per_context(self):
+        compiled = self.registry.get(self.path)
+        self.assertIs(self.registry.get(self.path), compiled)
+        first = self.document_text(compiled.render({"dni": "11111111"}))
+        second = self.document_text(compiled.render({"dni": "22222222"}))
+        self.assertIn("11111111", first)
+        self.assertNotIn("11111111", second)
+        self.assertIn("22222222", second)
+
+    def test_reloads_when_file_changes(self):
+        compiled = self.registry.get(self.path)
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNot(self.registry.get(self.path), compiled)
+
+    def test_missing_template_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.registry.get(Path(self.tmpdir.name) / "missing.docx")
+
+
+class DocumentCacheTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.template = Path(settings.BASE_DIR) / "ficha_alumno.docx"
+        self.cache = DocumentCache(Path(self.tmpdir.name) / "cache", max_bytes=250)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def store(self, dni, content=b"x" * 100):
+        key = self.cache.key(self.template, {"dni": dni})
+        self.cache.open(key, self.template, {"dni": dni}, render=lambda *args: content).close()
+        return self.cache.path_for(key)
+
+    def test_key_depends_on_context(self):
+        self.assertEqual(self.cache.key(self.template, {"dni": "1"}), self.cache.key(self.template, {"dni": "1"}))
+        self.assertNotEqual(self.cache.key(self.template, {"dni": "1"}), self.cache.key(self.template, {"dni": "2"}))
+
+    def test_evicts_least_recently_used(self):
+        first = self.store("1")
+        second = self.store("2")
+        os.utime(first, (1, 1))
+        os.utime(second, (2, 2))
+        third = self.store("3")
+        self.assertFalse(first.exists())
+        self.assertTrue(second.exists())
+        self.assertTrue(third.exists())
+
+    def test_purge_command(self):
+        old = self.store("1")
+        recent = self.store("2")
+        os.utime(old, (1, 1))
+        with override_settings(DOCUMENT_CACHE_DIR=self.cache.directory, DOCUMENT_CACHE_MAX_BYTES=250):
+            call_command("purge_document_cache", older_than=1, stdout=StringIO())
+            self.assertFalse(old.exists())
+            self.assertTrue(recent.exists())
+            call_command("purge_document_cache", all=True, stdout=StringIO())
+        self.assertFalse(recent.exists())
+
+
+@override_settings(DOCX_BATCH_WORKERS=1, DOCUMENT_CACHE_MAX_BYTES=0)
+class CertificateBatchTests(TestCase):
+    def setUp(self):
+        self.career = make_career()
+        self.students = [
+            make_student(f"stud{i}", f"2000000{i}", self.career)[1] for i in range(3)
+        ]
+        make_student("other", "30000001", make_career("MED", make_faculty("F2")))
+
+    def read_zip(self, data):
+        archive = zipfile.ZipFile(BytesIO(data))
+        return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_admin_downloads_career_zip_and_resumes(self):
+        self.client.force_login(make_admin())
+        url = reverse("users:certificate-batch")
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        resp = self.client.get(url, {"career": self.career.code})
+        self.assertEqual(resp["Content-Type"], "application/zip")
+        self.assertEqual(resp["X-Certificate-Count"], "3")
+        members = self.read_zip(b"".join(resp.streaming_content))
+        self.assertEqual(
+            list(members), [CertificateService.archive_name(student) for student in self.students]
+        )
+        self.assertTrue(all(content.startswith(b"PK") for content in members.values()))
+
+        resp = self.client.get(url, {"career": self.career.code, "after": self.students[0].student_id})
+        self.assertEqual(resp["X-Certificate-Count"], "2")
+        self.assertEqual(len(self.read_zip(b"".join(resp.streaming_content))), 2)
+
+    @override_settings(DOCX_BATCH_MAX_CONCURRENT=1)
+    def test_concurrent_download_answers_503_until_stream_ends(self):
+        self.client.force_login(make_admin())
+        url = reverse("users:certificate-batch")
+        first = self.client.get(url, {"career": self.career.code})
+        self.assertEqual(first.status_code, 200)
+
+        busy = self.client.get(url, {"career": self.career.code})
+        self.assertEqual(busy.status_code, 503)
+        self.assertEqual(busy["Retry-After"], "5")
+
+        self.assertEqual(len(self.read_zip(b"".join(first.streaming_content))), 3)
+        second = self.client.get(url, {"career": self.career.code})
+        self.assertEqual(len(self.read_zip(b"".join(second.streaming_content))), 3)
+
+    def test_requires_admin(self):
+        user, _ = make_student("stud9", "20000009", self.career)
+        self.client.force_login(user)
+        resp = self.client.get(reverse("users:certificate-batch"), {"career": self.career.code})
+        self.assertEqual(resp.status_code, 302)
+
+    def test_command_resumes_after_last_certificate(self):
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "certificados.zip"
+            with zipfile.ZipFile(output, "w") as archive:
+                archive.writestr(CertificateService.archive_name(self.students[0]), b"previous run")
+            call_command(
+                "generate_certificates", str(output), career=self.career.code, resume=True, checkpoint=1,
+                stdout=StringIO(),
+            )
+            with zipfile.ZipFile(output) as archive:
+                self.assertEqual(
+                    archive.namelist(), [CertificateService.archive_name(student) for student in self.students]
+                )
+                self.assertEqual(archive.read(archive.namelist()[0]), b"previous run")
+
+    @override_settings(DOCX_BATCH_WORKERS=2)
+    def test_render_many_in_worker_processes_keeps_order(self):
+        path = Path(settings.BASE_DIR) / "ficha_alumno.docx"
+        items = [(dni, {"dni": dni}) for dni in ("30111222", "30111223", "30111224")]
+        results = list(render_many(path, items))
+        self.assertEqual([tag for tag, _ in results], ["30111222", "30111223", "30111224"])
+        for dni, content in results:
+            with zipfile.ZipFile(BytesIO(content)) as docx:
+                self.assertIn(dni, docx.read("word/document.xml").decode())
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.client.force_login(self.admin)
+        for i in range(7):
+            CustomUser.objects.create_user(
+                username=f"user{i}", password="x", role=CustomUser.Role.STUDENT, dni=f"5000000{i}",
+                last_name="Perez" if i % 2 else "Gomez", first_name=f"N{i}",
+            )
+
+    def walk(self, url, params, direction="next"):
+        pages = []
+        resp = self.client.get(url, params)
+        while True:
+            page = resp.context["page_obj"]
+            pages.append([getattr(row, "username", None) or row.pk for row in page])
+            if not getattr(page, f"has_{direction}")():
+                return pages, resp
+            resp = self.client.get(f"{url}?{getattr(page, f'{direction}_query')}")
+
+    def test_pages_cover_every_row_once_in_both_directions(self):
+        url = reverse("users:user-list")
+        expected = list(CustomUser.objects.order_by("username").values_list("username", flat=True))
+        pages, last = self.walk(url, {"page_size": 3})
+        self.assertEqual([len(p) for p in pages], [3, 3, 2])
+        self.assertEqual(sum(pages, []), expected)
+
+        back, _ = self.walk(f"{url}?{last.context['page_obj'].previous_query}", {}, direction="previous")
+        self.assertEqual(sum(reversed(back), []), expected[:-2])
+
+    def test_composite_and_descending_keys(self):
+        url = reverse("users:user-list")
+        expected = [
+            u.username for u in CustomUser.objects.order_by("-last_name", "-first_name", "-id")
+        ]
+        pages, _ = self.walk(url, {"page_size": 2, "sort": "-name"})
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_page_query_count_and_size_cap(self):
+        url = reverse("users:user-list")
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, {"page_size": "2", "sort": "unindexed"})
+        selects = [q["sql"] for q in ctx.captured_queries if 'FROM "users"' in q["sql"]]
+        self.assertNotIn("OFFSET", " ".join(selects))
+        self.assertNotIn("COUNT(", " ".join(selects))
+        self.assertEqual(resp.context["sort"], "username")
+        with override_settings(ADMIN_LIST_MAX_PAGE_SIZE=4):
+            self.assertEqual(len(self.client.get(url, {"page_size": 1000}).context["users"]), 4)
+
+    def test_other_admin_lists_paginate(self):
+        career = make_career()
+        for code in ("MAT1", "FIS1", "QUI1"):
+            make_subject(code, career)
+        pages, _ = self.walk(reverse("users:subject-list"), {"page_size": 2, "sort": "code"})
+        self.assertEqual(sum(pages, []), ["FIS1", "MAT1", "QUI1"])
+        for name in ("faculty-list", "career-list", "final-list"):
+            self.assertEqual(self.client.get(reverse(f"users:{name}")).status_code, 200)
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.user, self.student = make_student()
+        self.user.first_name, self.user.last_name = "Lucía", "González"
+        self.user.save()
+        self.prof_user, self.prof = make_professor()
+
+    def search(self, query):
+        return set(UserSearchService.search(CustomUser.objects.all(), query).values_list("username", flat=True))
+
+    def test_identifier_prefixes(self):
+        self.assertEqual(self.search("1000000"), {"stud", "prof"})
+        self.assertEqual(self.search(self.student.student_id), {"stud"})
+        self.assertEqual(self.search("P-1000"), {"prof"})
+        self.assertEqual(self.search("adm"), {"admin"})
+
+    def test_every_word_matches_a_name(self):
+        self.assertEqual(self.search("gonz"), {"stud"})
+        self.assertEqual(self.search("lucía gonzález"), {"stud"})
+        self.assertEqual(self.search("lucía pérez"), set())
+        self.assertEqual(self.search("   "), {"admin", "stud", "prof"})
+
+    def test_user_list_search_box_keeps_query_across_pages(self):
+        self.client.force_login(self.admin)
+        resp = self.client.get(reverse("users:user-list"), {"q": "1000000", "page_size": 1})
+        self.assertEqual(len(resp.context["users"]), 1)
+        self.assertIn("q=1000000", resp.context["page_obj"].next_query)
+        self.assertContains(resp, 'value="1000000"')
+
+    def test_admin_student_search(self):
+        self.user.is_staff = self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+        resp = self.client.get(reverse("admin:users_student_changelist"), {"q": "gonz"})
+        self.assertEqual([s.pk for s in resp.context["cl"].result_list], [self.student.pk])
+
+
+class StudentFileExportTests(TestCase):
+    def setUp(self):
+        self.career = make_career()
+        self.students = [make_student(f"stud{i}", f"2000000{i}", self.career)[1] for i in range(3)]
+        Student.objects.filter(pk=self.students[2].pk).update(enrollment_date=date(2024, 3, 1))
+        make_student("other", "30000001", make_career("MED", make_faculty("F2")))
+
+    def read_ndjson(self, resp):
+        return [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+
+    def test_admin_streams_filtered_ndjson(self):
+        self.client.force_login(make_admin())
+        url = reverse("users:student-file-export")
+        records = self.read_ndjson(self.client.get(url, {"career": self.career.code}))
+        self.assertEqual([r["nro_legajo"] for r in records], [s.student_id for s in self.students])
+        self.assertEqual(records[0], StudentFileService.get_student_file_data(self.students[0].student_id))
+
+        records = self.read_ndjson(self.client.get(url, {"enrolled_from": "2024-01-01"}))
+        self.assertEqual([r["nro_legajo"] for r in records], [self.students[2].student_id])
+        records = self.read_ndjson(self.client.get(url, {"career": self.career.code, "after": self.students[0].pk}))
+        self.assertEqual(len(records), 2)
+        resp = self.client.get(url, {"enrolled_from": "2024-01-01", "enrolled_to": "2023-01-01"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_export_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            students = StudentFileService.students()
+            chunks = list(StudentFileService.iter_ndjson(students, chunk_size=2, lines_per_chunk=1))
+        self.assertEqual(len(chunks), 4)
+
+    def test_command_writes_ndjson(self):
+        out = StringIO()
+        call_command("export_student_files", faculty=self.career.faculty.code, stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+class CsvExportTests(TestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.user, self.student = make_student()
+        self.user.last_name = "González"
+        self.user.save()
+        self.career = self.student.career
+        self.subject = make_subject("MAT1", self.career)
+        self.client.force_login(self.admin)
+
+    def read_csv(self, resp):
+        body = b"".join(resp.streaming_content).decode("utf-8")
+        self.assertTrue(body.startswith("\ufeff"))
+        return list(csv.reader(body[1:].splitlines()))
+
+    def test_user_list_exports_search_results_in_sort_order(self):
+        url = reverse("users:user-list")
+        resp = self.client.get(url, {"format": "csv", "sort": "-username", "page_size": 1})
+        self.assertEqual(resp["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn('filename="usuarios-', resp["Content-Disposition"])
+        rows = self.read_csv(resp)
+        self.assertEqual(rows[0][:3], ["id", "usuario", "nombre"])
+        self.assertEqual([row[1] for row in rows[1:]], ["stud", "admin"])
+        self.assertEqual(rows[1][3], "González")
+        self.assertEqual(rows[1][7], self.student.student_id)
+
+        rows = self.read_csv(self.client.get(url, {"format": "csv", "q": "gonz"}))
+        self.assertEqual([row[1] for row in rows[1:]], ["stud"])
+        self.assertIn("format=csv", self.client.get(url, {"q": "gonz"}).context["csv_query"])
+
+    def test_grade_and_inscription_exports(self):
+        Grade.objects.create(student=self.student, subject=self.subject, promotion_grade=8)
+        SubjectInscription.objects.create(student=self.student, subject=self.subject)
+        rows = self.read_csv(self.client.get(reverse("users:grade-export"), {"subject": "MAT1"}))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][1:5], [self.student.student_id, "González", self.user.first_name, "MAT1"])
+        rows = self.read_csv(self.client.get(reverse("users:subject-inscription-export"), {"subject": "FIS1"}))
+        self.assertEqual(len(rows), 1)
+        rows = self.read_csv(self.client.get(reverse("users:subject-inscription-export")))
+        self.assertEqual(rows[1][4], "MAT1")
+
+    def test_export_requires_admin(self):
+        self.client.force_login(self.user)
+        resp = self.client.get(reverse("users:grade-export"))
+        self.assertEqual(resp.status_code, 302)
+
+
+class AdminPerformanceTests(TestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.admin.is_staff = self.admin.is_superuser = True
+        self.admin.save()
+        self.client.force_login(self.admin)
+        self.career = make_career()
+        self.subjects = [make_subject(f"MAT{i}", self.career) for i in range(3)]
+
+    def add_grades(self, count, offset=0):
+        for i in range(offset, offset + count):
+            _, student = make_student(f"stud{i}", f"2000{i:04d}", self.career)
+            Grade.objects.create(student=student, subject=self.subjects[i % 3])
+
+    def changelist_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, params or {})
+        self.assertEqual(resp.status_code, 200)
+        return resp, ctx.captured_queries
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse("admin:academics_grade_changelist")
+        self.add_grades(2)
+        _, few = self.changelist_queries(url)
+        self.add_grades(8, offset=2)
+        resp, many = self.changelist_queries(url)
+        self.assertEqual(len(resp.context["cl"].result_list), 10)
+        self.assertEqual(len(few), len(many))
+        for name in (
+            "academics_subject", "academics_finalexam", "academics_career", "users_student", "users_professor",
+            "inscriptions_subjectinscription", "inscriptions_finalexaminscription", "inscriptions_waitlist",
+        ):
+            self.assertEqual(self.client.get(reverse(f"admin:{name}_changelist")).status_code, 200)
+
+    def test_change_form_uses_autocomplete(self):
+        self.add_grades(1)
+        grade = Grade.objects.get()
+        resp = self.client.get(reverse("admin:academics_grade_change", args=[grade.pk]))
+        self.assertEqual(resp.content.decode().count('class="admin-autocomplete"'), 2)
+        self.assertNotContains(resp, "MAT2")
+        resp = self.client.get(
+            reverse("admin:autocomplete"),
+            {"app_label": "academics", "model_name": "grade", "field_name": "subject", "term": "MAT"},
+        )
+        self.assertEqual(len(resp.json()["results"]), 3)
+
+    def test_search_matches_student_or_subject_code(self):
+        self.add_grades(4)
+        url = reverse("admin:academics_grade_changelist")
+        resp = self.client.get(url, {"q": "S-20000001"})
+        self.assertEqual([g.student.user.username for g in resp.context["cl"].result_list], ["stud1"])
+        resp = self.client.get(url, {"q": "mat0"})
+        self.assertEqual(resp.context["cl"].result_count, 2)
+
+    @skipUnless(connection.vendor == "postgresql", "Estimates read pg_class.")
+    def test_unfiltered_changelist_uses_estimated_count(self):
+        self.add_grades(5)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Grade._meta.db_table}")
+        url = reverse("admin:academics_grade_changelist")
+        with override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1):
+            resp, queries = self.changelist_queries(url)
+            self.assertEqual(resp.context["cl"].result_count, 5)
+            self.assertFalse([q for q in queries if "COUNT(" in q["sql"] and "academics_grade" in q["sql"]])
+            resp, queries = self.changelist_queries(url, {"q": "mat0"})
+            self.assertTrue([q for q in queries if "COUNT(" in q["sql"]])
+        self.assertEqual(EstimatedCountPaginator(Grade.objects.order_by("pk"), 2).count, 5)
+
+
+class DocumentJobTests(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.overrides = override_settings(
+            DOCUMENT_JOB_DIR=self.tmpdir.name, DOCX_BATCH_WORKERS=1, DOCUMENT_CACHE_MAX_BYTES=0
+        )
+        self.overrides.enable()
+        self.user, self.student = make_student()
+
+    def tearDown(self):
+        self.overrides.disable()
+        self.tmpdir.cleanup()
+
+    def test_student_file_job_submit_run_download(self):
+        self.client.force_login(self.user)
+        resp = self.client.post(
+            reverse("users:document-job-submit"), {"kind": "student_file", "student_id": self.student.student_id}
+        )
+        self.assertEqual(resp.status_code, 202)
+        status_url = resp["Location"]
+        self.assertEqual(self.client.get(status_url).json()["status"], DocumentJob.Status.PENDING)
+        job_id = resp.json()["id"]
+        self.assertEqual(
+            self.client.get(reverse("users:document-job-download", args=[job_id])).status_code, 409
+        )
+
+        call_command("run_document_jobs", stdout=StringIO())
+
+        data = self.client.get(status_url).json()
+        self.assertEqual((data["status"], data["progress"], data["total"]), (DocumentJob.Status.DONE, 1, 1))
+        resp = self.client.get(data["download_url"])
+        self.assertEqual(resp.status_code, 200)
+        with zipfile.ZipFile(BytesIO(b"".join(resp.streaming_content))) as docx:
+            self.assertIn(self.user.dni, docx.read("word/document.xml").decode())
+
+    def test_students_only_see_their_own_jobs(self):
+        _, other = make_student("stud2", "10000009", self.student.career)
+        self.client.force_login(self.user)
+        resp = self.client.post(
+            reverse("users:document-job-submit"), {"kind": "student_file", "student_id": other.student_id}
+        )
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.post(reverse("users:document-job-submit"), {"kind": "certificates"})
+        self.assertEqual(resp.status_code, 403)
+        job = DocumentJobService.submit(DocumentJob.Kind.STUDENT_FILE, {"student_id": other.student_id})
+        self.assertEqual(self.client.get(reverse("users:document-job-status", args=[job.pk])).status_code, 404)
+
+    def test_certificates_job_reports_progress(self):
+        self.client.force_login(make_admin())
+        resp = self.client.post(
+            reverse("users:document-job-submit"), {"kind": "certificates", "career": self.student.career.code}
+        )
+        self.assertEqual(resp.status_code, 202)
+        job = DocumentJobService.run_next()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.total), (DocumentJob.Status.DONE, 1, 1))
+        with zipfile.ZipFile(DocumentJobService.output_path(job)) as archive:
+            self.assertEqual(archive.namelist(), [CertificateService.archive_name(self.student)])
+
+    @override_settings(DOCUMENT_JOB_RETRY_DELAY=10)
+    def test_failed_attempts_back_off_then_fail(self):
+        job = DocumentJobService.submit(DocumentJob.Kind.STUDENT_FILE, {"student_id": "missing"})
+        before = timezone.now()
+        DocumentJobService.run_next()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (DocumentJob.Status.PENDING, 1))
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=10))
+        self.assertIsNone(DocumentJobService.run_next())
+
+        DocumentJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        DocumentJobService.run_next()
+        job.refresh_from_db()
+        self.assertGreaterEqual(job.run_after, timezone.now() + timedelta(seconds=19))
+
+        DocumentJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        DocumentJobService.run_next()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (DocumentJob.Status.FAILED, 3))
+        self.assertIn("missing", job.error)
+
+    def test_stale_jobs_are_requeued_and_outputs_expire(self):
+        job = DocumentJobService.submit(DocumentJob.Kind.STUDENT_FILE, {"student_id": self.student.student_id})
+        DocumentJobService.claim()
+        DocumentJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(DocumentJobService.requeue_stale(), 1)
+
+        DocumentJobService.run_next()
+        job.refresh_from_db()
+        path = DocumentJobService.output_path(job)
+        self.assertTrue(path.is_file())
+        # One unguessable directory per job.
+        self.assertRegex(path.parent.name, rf"^{job.pk}-[0-9a-f]{{32}}$")
+        DocumentJob.objects.filter(pk=job.pk).update(expires_at=timezone.now())
+        self.assertEqual(DocumentJobService.cleanup(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DocumentJob.Status.EXPIRED)
+        self.assertFalse(path.parent.exists())
+
+
+class DocumentJobConcurrencyTests(TransactionTestCase):
+    def test_workers_never_claim_the_same_job(self):
+        jobs = [DocumentJobService.submit(DocumentJob.Kind.STUDENT_FILE, {"student_id": str(i)}) for i in range(8)]
+        barrier = threading.Barrier(4)
+        claimed = []
+
+        def worker():
+            try:
+                barrier.wait()
+                while (job := DocumentJobService.claim()) is not None:
+                    claimed.append(job.pk)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(claimed), [job.pk for job in jobs])
+
+
+class DocxRenderBackendTests(TestCase):
+    def setUp(self):
+        self.user, self.student = make_student()
+
+    @patch("users.views.render_docx", side_effect=DocumentRenderBusy("Sin capacidad."))
+    def test_views_answer_503_when_renderer_is_busy(self, _mock_render):
+        self.client.force_login(self.user)
         resp = self.client.get(reverse("users:student-regular-certificate"))
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp["Retry-After"], "5")
+        resp = self.client.get(reverse("users:student-file-docx", args=[self.student.student_id]))
+        self.assertEqual(resp.status_code, 503)
+
+    def test_pool_rejects_when_all_slots_are_taken(self):
+        renderer = ProcessPoolRenderer(workers=1, timeout=5, max_pending=1)
+        renderer._slots.acquire()
+        with self.assertRaises(DocumentRenderBusy):
+            renderer.render(Path(settings.BASE_DIR) / "ficha_alumno.docx", {})
+        self.assertIsNone(renderer._executor)
+
+    def test_process_backend_renders_in_worker(self):
+        path = Path(settings.BASE_DIR) / "ficha_alumno.docx"
+        with override_settings(DOCX_RENDER_BACKEND="process", DOCX_RENDER_POOL_SIZE=1, DOCX_PRELOAD_TEMPLATES=[path]):
+            try:
+                content = render_docx(path, {"dni": "30111222"})
+            finally:
+                get_renderer().shutdown()
+        with zipfile.ZipFile(BytesIO(content)) as docx:
+            self.assertIn("30111222", docx.read("word/document.xml").decode())
+
+
+class StudentDashboardServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student_user, self.student = make_student()
+        self.career = self.student.career
+
+    def _make_subjects(self, count, start=0):
+        subjects = [make_subject(f"S{i:03d}", self.career) for i in range(start, start + count)]
+        for subj in subjects[::2]:
+            SubjectInscription.objects.create(student=self.student, subject=subj)
+            Grade.objects.create(student=self.student, subject=subj, status=Grade.StatusSubject.REGULAR)
+            FinalExam.objects.create(
+                subject=subj, date=date.today(), location="Aula", duration=timedelta(hours=2), call_number=1
+            )
+        return subjects
+
+    def test_annotations_replace_membership_checks(self):
+        inscribed, other = self._make_subjects(2)
+        final = FinalExam.objects.get(subject=inscribed)
+        FinalExamInscription.objects.create(student=self.student, final_exam=final)
 
+        data = StudentDashboardService.get_dashboard_data(self.student)
+
+        flags = {s.code: (s.is_inscribed, s.is_eligible_for_final) for s in data["subjects"]}
+        self.assertEqual(flags, {inscribed.code: (True, True), other.code: (False, False)})
+        self.assertEqual([s.code for s in data["inscriptions"]], [inscribed.code])
+        self.assertEqual([f.pk for f in data["eligible_finals"]], [final.pk])
+        self.assertEqual([f.pk for f in data["final_inscriptions"]], [final.pk])
+        self.assertTrue(data["eligible_finals"][0].is_inscribed)
+
+    def test_query_count_is_flat(self):
+        self._make_subjects(2)
+        with self.assertNumQueries(3):
+            StudentDashboardService.get_dashboard_data(self.student)
+
+        self._make_subjects(30, start=2)
+        with self.assertNumQueries(3):
+            data = StudentDashboardService.get_dashboard_data(self.student)
+            [g.subject.name for g in data["grades"]]
+            [f.subject.name for f in data["eligible_finals"]]
+        self.assertEqual(len(data["subjects"]), 32)
+
+    def test_dashboard_view_renders(self):
+        self._make_subjects(3)
+        self.client.force_login(self.student_user)
+        resp = self.client.get(reverse("users:student-dashboard"))
         self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Inscripto")
+
+
+class StudentDashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student_user, self.student = make_student()
+        self.subject = make_subject(career=self.student.career)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_second_read_hits_cache(self):
+        StudentDashboardService.get_cached_dashboard_data(self.student)
+        with self.assertNumQueries(0):
+            data = StudentDashboardService.get_cached_dashboard_data(self.student)
+        self.assertEqual([s.code for s in data["subjects"]], [self.subject.code])
+
+    def test_inscription_and_grade_signals_invalidate(self):
+        StudentDashboardService.get_cached_dashboard_data(self.student)
+        SubjectInscription.objects.create(student=self.student, subject=self.subject)
+        data = StudentDashboardService.get_cached_dashboard_data(self.student)
+        self.assertEqual([s.code for s in data["inscriptions"]], [self.subject.code])
+
+        grade = Grade.objects.create(student=self.student, subject=self.subject)
+        self.assertEqual(len(StudentDashboardService.get_cached_dashboard_data(self.student)["grades"]), 1)
+        grade.delete()
+        self.assertEqual(StudentDashboardService.get_cached_dashboard_data(self.student)["grades"], [])
+
+    def test_curriculum_change_invalidates_every_student(self):
+        _, other = make_student(username="stud2", dni="10000009", career=self.student.career)
+        for student in (self.student, other):
+            StudentDashboardService.get_cached_dashboard_data(student)
+        make_subject("NEW1", self.student.career)
+        for student in (self.student, other):
+            data = StudentDashboardService.get_cached_dashboard_data(student)
+            self.assertIn("NEW1", [s.code for s in data["subjects"]])
+
+
+class SubjectInscriptionServiceTests(TestCase):
+    def setUp(self):
+        self.student_user, self.student = make_student()
+        self.subject = make_subject(career=self.student.career)
+
+    def test_inscribe_is_idempotent(self):
         self.assertEqual(
-            resp["Content-Type"],
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            SubjectInscriptionService.inscribe(self.student, self.subject), SubjectInscriptionService.CREATED
         )
-        content_disp = resp["Content-Disposition"]
-        ok = (
-            "attachment; filename=\"certificado-regular-" in content_disp
-            or "attachment; filename=\"certificado-regular-stud-" in content_disp
+        self.assertEqual(
+            SubjectInscriptionService.inscribe(self.student, self.subject),
+            SubjectInscriptionService.ALREADY_INSCRIBED,
         )
-        self.assertTrue(ok)
-        self.assertTrue(len(resp.content) > 0)
+        self.assertEqual(SubjectInscription.objects.filter(student=self.student).count(), 1)
+        self.assertEqual(Grade.objects.filter(student=self.student).count(), 1)
+
+    def test_inscribe_backfills_missing_grade(self):
+        SubjectInscription.objects.create(student=self.student, subject=self.subject)
+        SubjectInscriptionService.inscribe(self.student, self.subject)
+        self.assertTrue(Grade.objects.filter(student=self.student, subject=self.subject).exists())
+
+
+class SubjectCapacityTests(TestCase):
+    def setUp(self):
+        self.career = make_career()
+        self.subject = make_subject(career=self.career)
+        self.subject.capacity = 1
+        self.subject.save()
+
+    def test_full_subject_rejects_and_deletion_frees_seat(self):
+        _, first = make_student(career=self.career)
+        _, second = make_student(username="stud2", dni="10000009", career=self.career)
+        self.assertEqual(SubjectInscriptionService.inscribe(first, self.subject), SubjectInscriptionService.CREATED)
+        self.assertEqual(SubjectInscriptionService.inscribe(second, self.subject), SubjectInscriptionService.FULL)
+        self.assertFalse(Grade.objects.filter(student=second).exists())
+
+        SubjectInscription.objects.get(student=first).delete()
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.seats_taken, 0)
+        self.assertEqual(SubjectInscriptionService.inscribe(second, self.subject), SubjectInscriptionService.CREATED)
+
+    def test_setting_capacity_recounts_existing_inscriptions(self):
+        subject = make_subject("FIS1", self.career)
+        _, student = make_student(career=self.career)
+        SubjectInscription.objects.create(student=student, subject=subject)
+        subject.capacity = 10
+        subject.save()
+        subject.refresh_from_db()
+        self.assertEqual(subject.seats_taken, 1)
+
+    def test_inscriptions_written_outside_the_service_keep_the_count(self):
+        _, first = make_student(career=self.career)
+        _, second = make_student(username="stud2", dni="10000009", career=self.career)
+        inscription = SubjectInscription.objects.create(student=first, subject=self.subject)
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.seats_taken, 1)
+        self.assertEqual(SubjectInscriptionService.inscribe(second, self.subject), SubjectInscriptionService.FULL)
+
+        inscription.delete()
+        SubjectInscription.objects.get_or_create(student=second, subject=self.subject)
+        SubjectInscription.objects.filter(student=second).delete()
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.seats_taken, 0)
+
+
+class SubjectCapacityConcurrencyTests(TransactionTestCase):
+    @skipUnless(connection.vendor == "postgresql", "Needs row locks held across connections.")
+    def test_parallel_inscriptions_never_oversell(self):
+        career = make_career()
+        subject = make_subject(career=career)
+        subject.capacity = 3
+        subject.save()
+        students = [make_student(f"stud{i}", f"2000000{i}", career)[1] for i in range(10)]
+        barrier = threading.Barrier(len(students))
+        results = []
+
+        def inscribe(student):
+            try:
+                barrier.wait()
+                results.append(SubjectInscriptionService.inscribe(student, subject))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=inscribe, args=(student,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        subject.refresh_from_db()
+        self.assertEqual(results.count(SubjectInscriptionService.CREATED), 3)
+        self.assertEqual(results.count(SubjectInscriptionService.FULL), 7)
+        self.assertEqual(SubjectInscription.objects.filter(subject=subject).count(), 3)
+        self.assertEqual(subject.seats_taken, 3)
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        self.career = make_career()
+        self.subject = make_subject(career=self.career)
+        self.subject.capacity = 1
+        self.subject.save()
+        _, self.first = make_student(career=self.career)
+        self.second_user, self.second = make_student(username="stud2", dni="10000009", career=self.career)
+        SubjectInscriptionService.inscribe(self.first, self.subject)
+
+    def test_full_subject_queues_and_promotes_after_deletion(self):
+        self.client.force_login(self.second_user)
+        resp = self.client.post(reverse("users:subject-inscribe", args=[self.subject.code]))
+        self.assertEqual(resp.status_code, 302)
+        self.assertTrue(Waitlist.objects.filter(student=self.second, subject=self.subject).exists())
+
+        self.assertEqual(WaitlistService.promote(), (0, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            SubjectInscription.objects.get(student=self.first).delete()
+
+        self.assertTrue(SubjectInscription.objects.filter(student=self.second, subject=self.subject).exists())
+        self.assertTrue(Grade.objects.filter(student=self.second, subject=self.subject).exists())
+        self.assertFalse(Waitlist.objects.exists())
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.seats_taken, 1)
+
+    def test_deletion_promotes_final_exam_waiter(self):
+        final = FinalExam.objects.create(
+            subject=self.subject, date=date.today(), location="Aula", duration=timedelta(hours=2),
+            call_number=1, capacity=1,
+        )
+        self.assertEqual(FinalExamInscriptionService.inscribe(self.first, final), FinalExamInscriptionService.CREATED)
+        WaitlistService.join(self.second, final_exam=final)
+        with self.captureOnCommitCallbacks(execute=True):
+            FinalExamInscription.objects.filter(student=self.first).delete()
+        self.assertTrue(FinalExamInscription.objects.filter(student=self.second, final_exam=final).exists())
+        self.assertFalse(Waitlist.objects.exists())
+
+    def test_drain_skips_batches_of_stale_entries(self):
+        self.subject.capacity = 10
+        self.subject.save()
+        stale = [make_student(f"stale{i}", f"2000001{i}", self.career)[1] for i in range(3)]
+        for student in stale:
+            WaitlistService.join(student, subject=self.subject)
+            SubjectInscriptionService.inscribe(student, self.subject)
+        WaitlistService.join(self.second, subject=self.subject)
+
+        call_command("promote_waitlist", batch_size=3, stdout=StringIO())
+
+        self.assertTrue(SubjectInscription.objects.filter(student=self.second, subject=self.subject).exists())
+        self.assertFalse(Waitlist.objects.exists())
+
+    def test_join_keeps_fifo_position(self):
+        _, third = make_student(username="stud3", dni="10000010", career=self.career)
+        self.assertEqual(WaitlistService.join(self.second, subject=self.subject), 1)
+        self.assertEqual(WaitlistService.join(third, subject=self.subject), 2)
+        self.assertEqual(WaitlistService.join(self.second, subject=self.subject), 1)
+
+    def test_full_final_exam_queues(self):
+        final = FinalExam.objects.create(
+            subject=self.subject, date=date.today(), location="Aula", duration=timedelta(hours=2),
+            call_number=1, capacity=0,
+        )
+        Grade.objects.create(student=self.second, subject=self.subject, status=Grade.StatusSubject.REGULAR)
+        self.client.force_login(self.second_user)
+        self.client.post(reverse("users:final-inscribe", args=[final.id]))
+        self.assertFalse(FinalExamInscription.objects.filter(student=self.second).exists())
+        self.assertTrue(Waitlist.objects.filter(student=self.second, final_exam=final).exists())
+
+
+class WaitlistWorkerConcurrencyTests(TransactionTestCase):
+    def test_parallel_workers_never_double_promote(self):
+        career = make_career()
+        subject = make_subject(career=career)
+        subject.capacity = 5
+        subject.save()
+        for i in range(20):
+            _, student = make_student(f"stud{i}", f"300000{i:02d}", career)
+            WaitlistService.join(student, subject=subject)
+        promoted = []
+
+        def worker():
+            try:
+                while (result := WaitlistService.promote(batch_size=3))[1]:
+                    promoted.append(result[0])
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        subject.refresh_from_db()
+        self.assertEqual(sum(promoted), 5)
+        self.assertEqual(SubjectInscription.objects.filter(subject=subject).count(), 5)
+        self.assertEqual(subject.seats_taken, 5)
+        self.assertEqual(Waitlist.objects.filter(subject=subject).count(), 15)
 
 
 class ProfessorViewsTests(TestCase):
@@ -520,6 +1439,193 @@ class ProfessorViewsTests(TestCase):
     # update_status should set PROMOTED for final_grade >= 6
         self.assertEqual(grade.status, Grade.StatusSubject.PROMOTED)
 
+    def test_grade_edit_writes_once_and_tracks_override(self):
+        SubjectInscription.objects.create(student=self.student, subject=self.subject)
+        grade = Grade.objects.create(student=self.student, subject=self.subject)
+        self.client.force_login(self.prof_user)
+        url = reverse("users:grade-edit", args=[grade.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, data={"final_grade": 4, "status": Grade.StatusSubject.FREE})
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "academics_grade"')]
+        self.assertEqual(len(updates), 1)
+        grade.refresh_from_db()
+        self.assertEqual((grade.status, grade.status_override), (Grade.StatusSubject.FREE, Grade.StatusSubject.FREE))
+
+        # An unrelated edit keeps the override; only the clear box drops it.
+        self.client.post(url, data={"final_grade": 4, "status": Grade.StatusSubject.FREE, "notes": "ok"})
+        grade.refresh_from_db()
+        self.assertEqual((grade.status, grade.status_override), (Grade.StatusSubject.FREE, Grade.StatusSubject.FREE))
+        self.client.post(url, data={
+            "final_grade": 4, "status": Grade.StatusSubject.FREE, "notes": "ok", "clear_status_override": "on",
+        })
+        grade.refresh_from_db()
+        self.assertEqual((grade.status, grade.status_override), (Grade.StatusSubject.REGULAR, None))
+
+    def _grid_data(self, grades, **rows):
+        data = {
+            "form-TOTAL_FORMS": str(len(grades)),
+            "form-INITIAL_FORMS": str(len(grades)),
+            "form-MIN_NUM_FORMS": "0",
+            "form-MAX_NUM_FORMS": "1000",
+        }
+        for i, grade in enumerate(grades):
+            row = {"id": grade.pk, "promotion_grade": "", "final_grade": "", "status": grade.status}
+            row.update(rows.get(grade.student_id, {}))
+            data.update({f"form-{i}-{k}": v for k, v in row.items()})
+        return data
+
+    def _grid_course(self, size):
+        students = [self.student] + [
+            make_student(f"grid{i}", f"3100000{i}", self.student.career)[1] for i in range(size - 1)
+        ]
+        SubjectInscription.objects.bulk_create([SubjectInscription(student=s, subject=self.subject) for s in students])
+        Grade.objects.bulk_create([Grade(student=s, subject=self.subject) for s in students])
+        return list(
+            Grade.objects.filter(subject=self.subject)
+            .order_by("student__user__last_name", "student__user__first_name", "pk")
+        )
+
+    def test_grade_grid_saves_all_rows_with_derived_status(self):
+        grades = self._grid_course(3)
+        s1, s2, s3 = (g.student_id for g in grades)
+        self.client.force_login(self.prof_user)
+        resp = self.client.post(
+            reverse("users:grade-list", args=[self.subject.code]),
+            data=self._grid_data(grades, **{
+                s1: {"final_grade": "8"},
+                s2: {"final_grade": "4"},
+                s3: {"final_grade": "9", "status": Grade.StatusSubject.FREE},
+            }),
+        )
+        self.assertEqual(resp.status_code, 302)
+        status = dict(Grade.objects.filter(subject=self.subject).values_list("student_id", "status"))
+        self.assertEqual(status, {
+            s1: Grade.StatusSubject.PROMOTED,
+            s2: Grade.StatusSubject.REGULAR,
+            s3: Grade.StatusSubject.FREE,
+        })
+
+    def test_grade_grid_keeps_overrides_on_unrelated_edits(self):
+        grades = self._grid_course(2)
+        Grade.objects.update(status_override=Grade.StatusSubject.FREE, status=Grade.StatusSubject.FREE)
+        s1, s2 = (g.student_id for g in grades)
+        self.client.force_login(self.prof_user)
+        resp = self.client.post(
+            reverse("users:grade-list", args=[self.subject.code]),
+            data=self._grid_data(Grade.objects.filter(pk__in=[g.pk for g in grades]).order_by("pk"), **{
+                s1: {"final_grade": "8"},
+                s2: {"final_grade": "8", "clear_status_override": "on"},
+            }),
+        )
+        self.assertEqual(resp.status_code, 302)
+        rows = dict(
+            (student_id, (status, override))
+            for student_id, status, override in Grade.objects.values_list("student_id", "status", "status_override")
+        )
+        self.assertEqual(rows, {
+            s1: (Grade.StatusSubject.FREE, Grade.StatusSubject.FREE),
+            s2: (Grade.StatusSubject.PROMOTED, None),
+        })
+
+    def test_grade_grid_rejects_whole_sheet_on_invalid_row(self):
+        grades = self._grid_course(2)
+        s1, s2 = (g.student_id for g in grades)
+        self.client.force_login(self.prof_user)
+        resp = self.client.post(
+            reverse("users:grade-list", args=[self.subject.code]),
+            data=self._grid_data(grades, **{s1: {"final_grade": "8"}, s2: {"final_grade": "abc"}}),
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertFalse(Grade.objects.filter(subject=self.subject, final_grade__isnull=False).exists())
+
+    def test_grade_grid_rejects_foreign_grade(self):
+        grades = self._grid_course(1)
+        other = Grade.objects.create(student=self.student, subject=make_subject("HIS1", self.student.career))
+        self.client.force_login(self.prof_user)
+        data = self._grid_data(grades, **{self.student.pk: {"final_grade": "8"}})
+        data["form-0-id"] = other.pk
+        resp = self.client.post(reverse("users:grade-list", args=[self.subject.code]), data=data)
+        self.assertEqual(resp.status_code, 200)
+        other.refresh_from_db()
+        self.assertIsNone(other.final_grade)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_grade_grid_query_count_is_constant(self):
+        self.client.force_login(self.prof_user)
+        url = reverse("users:grade-list", args=[self.subject.code])
+        self.client.get(url)  # warm up session/user lookups
+        grades = self._grid_course(5)
+        data = self._grid_data(grades, **{g.student_id: {"final_grade": "7"} for g in grades})
+        with self.assertNumQueries(14):
+            self.client.post(url, data=data)
+        self.assertEqual(Grade.objects.filter(status=Grade.StatusSubject.PROMOTED).count(), 5)
+
+    def _import(self, content, name="notas.csv", **extra):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"), content_type="text/csv")
+        return self.client.post(
+            reverse("users:grade-import", args=[self.subject.code]), data={"file": upload, **extra}
+        )
+
+    def test_grade_import_csv_updates_by_student_id_or_dni(self):
+        grades = self._grid_course(3)
+        s1, s2, s3 = (Student.objects.select_related("user").get(pk=g.student_id) for g in grades)
+        self.client.force_login(self.prof_user)
+        resp = self._import(
+            "legajo;dni;promocion;final;estado\n"
+            f"{s1.pk};;8;7,5;\n"
+            f";{s2.user.dni};6;4;\n"
+            f"{s3.pk};;9;9;libre\n"
+            "NOPE;;7;7;\n"
+            f"{s1.pk};;abc;7;\n"
+        )
+        self.assertEqual(resp.status_code, 200)
+        report = resp.context["report"]
+        self.assertEqual((report["rows"], report["updated"], report["error_count"]), (5, 3, 2))
+        status = dict(Grade.objects.filter(subject=self.subject).values_list("student_id", "status"))
+        self.assertEqual(status, {
+            s1.pk: Grade.StatusSubject.PROMOTED,
+            s2.pk: Grade.StatusSubject.REGULAR,
+            s3.pk: Grade.StatusSubject.FREE,
+        })
+
+    def test_grade_import_keeps_overrides_unless_cleared(self):
+        grades = self._grid_course(2)
+        Grade.objects.update(status_override=Grade.StatusSubject.FREE, status=Grade.StatusSubject.FREE)
+        s1, s2 = (g.student_id for g in grades)
+        self.client.force_login(self.prof_user)
+        self._import(f"legajo;final\n{s1};8\n{s2};8\n")
+        self.assertEqual(
+            set(Grade.objects.values_list("status", "status_override")),
+            {(Grade.StatusSubject.FREE, Grade.StatusSubject.FREE)},
+        )
+        self._import(f"legajo;final;estado\n{s1};8;\n{s2};8;auto\n")
+        rows = {g.student_id: (g.status, g.status_override) for g in Grade.objects.all()}
+        self.assertEqual(rows, {
+            s1: (Grade.StatusSubject.FREE, Grade.StatusSubject.FREE),
+            s2: (Grade.StatusSubject.PROMOTED, None),
+        })
+
+    def test_grade_import_dry_run_and_missing_key_column(self):
+        grades = self._grid_course(1)
+        self.client.force_login(self.prof_user)
+        resp = self._import(f"student_id,final_grade\n{grades[0].student_id},8\n", dry_run="on")
+        self.assertEqual(resp.context["report"]["updated"], 1)
+        self.assertFalse(Grade.objects.filter(final_grade__isnull=False).exists())
+
+        resp = self._import("nombre,final\nAna,8\n")
+        self.assertEqual(resp.context["report"]["error_count"], 1)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_grade_import_query_count_is_constant(self):
+        self.client.force_login(self.prof_user)
+        self.client.get(reverse("users:grade-list", args=[self.subject.code]))  # warm up session/user lookups
+        grades = self._grid_course(6)
+        content = "legajo,final\n" + "".join(f"{g.student_id},7\n" for g in grades)
+        with self.assertNumQueries(14):
+            self._import(content)
+        self.assertEqual(Grade.objects.filter(status=Grade.StatusSubject.PROMOTED).count(), 6)
+
     def test_professor_final_inscriptions_list(self):
         final = FinalExam.objects.create(
             subject=self.subject,
@@ -534,3 +1640,36 @@ class ProfessorViewsTests(TestCase):
         self.client.force_login(self.prof_user)
         resp = self.client.get(reverse("users:professor-final-inscriptions", args=[final.id]))
         self.assertEqual(resp.status_code, 200)
+
+
+class SharedCacheCheckTests(TestCase):
+    def test_per_process_cache_is_reported(self):
+        self.assertEqual(check_shared_cache(None), [])
+        with override_settings(CACHES=LOCMEM_CACHES):
+            self.assertEqual([w.id for w in check_shared_cache(None)], ["users.W001"])
+
+
+class PrivateFilesCheckTests(TestCase):
+    def test_document_directories_under_media_root_are_rejected(self):
+        self.assertEqual(check_private_files(None), [])
+        with override_settings(DOCUMENT_JOB_DIR=str(Path(settings.MEDIA_ROOT) / "jobs")):
+            self.assertEqual([e.id for e in check_private_files(None)], ["users.E001"])
+
+
+class DatabaseCacheTests(TestCase):
+    def test_set_many_writes_every_key_in_one_statement(self):
+        cache.set("stale", 1)
+        data = {f"key-{i}": {"value": i} for i in range(50)}
+        with CaptureQueriesContext(connection) as ctx:
+            cache.set_many({**data, "stale": 2})
+        if connection.vendor == "postgresql":
+            writes = [q["sql"] for q in ctx.captured_queries if "INSERT" in q["sql"] or "UPDATE" in q["sql"]]
+            self.assertEqual(len(writes), 1)
+        self.assertEqual(cache.get_many(list(data)), data)
+        self.assertEqual(cache.get("stale"), 2)
+
+    def test_set_keeps_timeouts(self):
+        cache.set("forever", "a", None)
+        cache.set("expired", "b", -1)
+        self.assertEqual(cache.get("forever"), "a")
+        self.assertIsNone(cache.get("expired"))
@@ -4,6 +4,7 @@ Sections:
 - Admin: CRUD for users, faculties, careers, subjects, finals, and assignments.
 - Student: dashboard, subject/final inscriptions, certificates, student file.
 - Professor: dashboard, grade management, final inscriptions.
+- Document jobs: submit, poll and download queued document generation.
 
 Notes:
     Namespaced via app_name = "users" to enable reverse('users:<name>').
@@ -22,20 +23,31 @@ from .views import (
     FinalExamListView, FinalExamCreateView, FinalExamUpdateView, FinalExamDeleteView,
     assign_subject_professors,
     assign_final_professors,
+    certificate_batch,
+    GradeExportView,
+    SubjectInscriptionExportView,
 
     # Vistas de Estudiante
     student_dashboard,
     subject_inscribe,
+    subject_inscribe_batch,
     final_exam_inscribe,
     download_regular_certificate,
     StudentFileDocxView, # Agregado
     StudentFileJSONView, # Agregado
+    StudentFileExportView,
 
     # Vistas de Profesor
     professor_dashboard,
     grade_list,
+    grade_import,
     grade_edit,
     professor_final_inscriptions,
+
+    # Trabajos de documentos
+    document_job_submit,
+    document_job_status,
+    document_job_download,
 )
 
 app_name = "users"
@@ -69,20 +81,31 @@ urlpatterns = [
     path('admin/finals/<int:pk>/edit/', FinalExamUpdateView.as_view(), name='final-edit'),
     path('admin/finals/<int:pk>/delete/', FinalExamDeleteView.as_view(), name='final-delete'),
     path('admin/finals/<int:pk>/assign-professors/', assign_final_professors, name='assign-final-professors'),
+    path('admin/certificates/regular/', certificate_batch, name='certificate-batch'),
+    path('admin/grades.csv', GradeExportView.as_view(), name='grade-export'),
+    path('admin/inscriptions.csv', SubjectInscriptionExportView.as_view(), name='subject-inscription-export'),
 
     # Student
     path('student/dashboard/', student_dashboard, name='student-dashboard'),
     path('student/subject/<str:subject_code>/inscribe/', subject_inscribe, name='subject-inscribe'),
+    path('student/subjects/inscribe/', subject_inscribe_batch, name='subject-inscribe-batch'),
     path('student/final/<int:final_exam_id>/inscribe/', final_exam_inscribe, name='final-inscribe'),
     path('student/certificate/regular/', download_regular_certificate, name='student-regular-certificate'),
     
     # Nuevas rutas para la Ficha del Alumno
     path('student/<str:student_id>/file/docx/', StudentFileDocxView.as_view(), name='student-file-docx'),
     path('student/<str:student_id>/file/json/', StudentFileJSONView.as_view(), name='student-file-json'),
+    path('admin/students/files.ndjson', StudentFileExportView.as_view(), name='student-file-export'),
 
     # Professor
     path('professor/dashboard/', professor_dashboard, name='professor-dashboard'),
     path('professor/grades/<str:subject_code>/', grade_list, name='grade-list'),
+    path('professor/grades/<str:subject_code>/import/', grade_import, name='grade-import'),
     path('professor/grade/<int:pk>/edit/', grade_edit, name='grade-edit'),
-    path('professor/final/<int:final_exam_id>/inscriptions/', professor_final_inscriptions, name='professor-final-inscriptions')
+    path('professor/final/<int:final_exam_id>/inscriptions/', professor_final_inscriptions, name='professor-final-inscriptions'),
+
+    # Document jobs
+    path('documents/jobs/', document_job_submit, name='document-job-submit'),
+    path('documents/jobs/<int:pk>/', document_job_status, name='document-job-status'),
+    path('documents/jobs/<int:pk>/download/', document_job_download, name='document-job-download'),
 ]
\ No newline at end of file
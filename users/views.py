@@ -12,18 +12,19 @@ Notes:
     - Keeps business rules minimal in views; core rules live in models/services.
 """
 
-from io import BytesIO
 from pathlib import Path
 
-from docxtpl import DocxTemplate
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.db import transaction
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_POST
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -31,11 +32,39 @@ from django.views.generic import (
     UpdateView,
 )
 
-from academics.forms import CareerForm, FacultyForm, FinalExamForm, GradeForm, SubjectForm
-from academics.models import Career, Faculty, FinalExam, Grade, Subject
+from academics.forms import (
+    CareerForm, FacultyForm, FinalExamForm, GradeForm, GradeGridFormSet, GradeImportForm, SubjectForm,
+)
+from academics.models import Career, Faculty, FinalExam, FinalExamEligibility, Grade, Subject
 from inscriptions.models import FinalExamInscription, SubjectInscription
-from users.forms import AdministratorProfileForm, ProfessorProfileForm, StudentProfileForm, UserForm
-from users.models import CustomUser, Professor, Student
+from users.documents import (
+    DocumentRenderUnavailable,
+    SlotReleasingIterator,
+    acquire_batch_slot,
+    get_document_cache,
+    render_docx,
+)
+from users.forms import (
+    AdministratorProfileForm,
+    CertificateBatchForm,
+    ProfessorProfileForm,
+    StudentFileExportForm,
+    StudentProfileForm,
+    UserForm,
+)
+from users.models import CustomUser, DocumentJob, Professor, Student
+from users.exports import CsvExportMixin
+from users.pagination import KeysetPaginationMixin
+from users.services import (
+    CertificateService,
+    DocumentJobService,
+    FinalExamInscriptionService,
+    GradeImportService,
+    StudentDashboardService,
+    SubjectInscriptionService,
+    UserSearchService,
+    WaitlistService,
+)
 
 
 # --------- Permisos y Clases Base ---------
@@ -66,11 +95,28 @@ def admin_dashboard(request):
     return render(request, "users/admin_dashboard.html")
 
 
-class UserListView(BaseAdminView, ListView):
-    """Lista todos los usuarios."""
+class UserListView(BaseAdminView, CsvExportMixin, KeysetPaginationMixin, ListView):
+    """Lista los usuarios, paginados por clave (keyset)."""
     model = CustomUser
     template_name = "users/user_list.html"
     context_object_name = "users"
+    sort_keys = {"username": ("username",), "name": ("last_name", "first_name", "id"), "dni": ("dni",)}
+    sort_labels = {"username": "Usuario", "name": "Apellido y nombre", "dni": "DNI"}
+    default_sort = "username"
+    csv_filename = "usuarios"
+    csv_fields = (
+        ("id", "id"), ("usuario", "username"), ("nombre", "first_name"), ("apellido", "last_name"),
+        ("dni", "dni"), ("email", "email"), ("rol", "role"), ("legajo_alumno", "student__student_id"),
+        ("legajo_profesor", "professor__professor_id"), ("activo", "is_active"), ("alta", "date_joined"),
+    )
+
+    def get_queryset(self):
+        return UserSearchService.search(super().get_queryset(), self.request.GET.get("q", ""))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["q"] = self.request.GET.get("q", "")
+        return context
 
 
 class UserCreateView(BaseAdminView, CreateView):
@@ -186,10 +232,18 @@ class UserDeleteView(BaseAdminView, DeleteView):
 
 
 # Vistas CRUD para los modelos Académicos
-class FacultyListView(BaseAdminView, ListView):
+class FacultyListView(BaseAdminView, CsvExportMixin, KeysetPaginationMixin, ListView):
     model = Faculty
     template_name = "users/faculty_list.html"
     context_object_name = "faculties"
+    sort_keys = {"name": ("name", "code"), "code": ("code",)}
+    sort_labels = {"name": "Nombre", "code": "Código"}
+    default_sort = "name"
+    csv_filename = "facultades"
+    csv_fields = (
+        ("codigo", "code"), ("nombre", "name"), ("decano", "dean"), ("email", "email"), ("telefono", "phone"),
+        ("fundacion", "established_date"),
+    )
 
 
 class FacultyCreateView(BaseAdminView, CreateView):
@@ -217,10 +271,19 @@ class FacultyDeleteView(BaseAdminView, DeleteView):
     slug_url_kwarg = "code"
 
 
-class CareerListView(BaseAdminView, ListView):
+class CareerListView(BaseAdminView, CsvExportMixin, KeysetPaginationMixin, ListView):
     model = Career
     template_name = "users/career_list.html"
     context_object_name = "careers"
+    queryset = Career.objects.select_related("faculty")
+    sort_keys = {"name": ("name", "code"), "code": ("code",)}
+    sort_labels = {"name": "Nombre", "code": "Código"}
+    default_sort = "name"
+    csv_filename = "carreras"
+    csv_fields = (
+        ("codigo", "code"), ("nombre", "name"), ("facultad", "faculty__code"), ("facultad_nombre", "faculty__name"),
+        ("director", "director"), ("duracion_anios", "duration_years"),
+    )
 
 
 class CareerCreateView(BaseAdminView, CreateView):
@@ -248,11 +311,20 @@ class CareerDeleteView(BaseAdminView, DeleteView):
     slug_url_kwarg = "code"
 
 
-class SubjectListView(BaseAdminView, ListView):
+class SubjectListView(BaseAdminView, CsvExportMixin, KeysetPaginationMixin, ListView):
     model = Subject
     template_name = "users/subject_list.html"
     context_object_name = "subjects"
     queryset = Subject.objects.select_related("career").all()
+    sort_keys = {"name": ("name", "code"), "code": ("code",)}
+    sort_labels = {"name": "Nombre", "code": "Código"}
+    default_sort = "name"
+    csv_filename = "materias"
+    csv_fields = (
+        ("codigo", "code"), ("nombre", "name"), ("carrera", "career__code"), ("carrera_nombre", "career__name"),
+        ("anio", "year"), ("categoria", "category"), ("periodo", "period"), ("horas_semanales", "semanal_hours"),
+        ("cupo", "capacity"), ("inscriptos", "seats_taken"),
+    )
 
 
 class SubjectCreateView(BaseAdminView, CreateView):
@@ -309,11 +381,19 @@ def assign_subject_professors(request, code):
     return render(request, "users/assign_professors.html", {"subject": subject, "professors": profs})
 
 
-class FinalExamListView(BaseAdminView, ListView):
+class FinalExamListView(BaseAdminView, CsvExportMixin, KeysetPaginationMixin, ListView):
     model = FinalExam
     template_name = "users/final_list.html"
     context_object_name = "finals"
     queryset = FinalExam.objects.select_related("subject").all()
+    sort_keys = {"date": ("date", "id"), "id": ("id",)}
+    sort_labels = {"date": "Fecha", "id": "Alta"}
+    default_sort = "date"
+    csv_filename = "finales"
+    csv_fields = (
+        ("id", "id"), ("materia", "subject__code"), ("materia_nombre", "subject__name"), ("fecha", "date"),
+        ("llamado", "call_number"), ("lugar", "location"), ("cupo", "capacity"), ("inscriptos", "seats_taken"),
+    )
 
 
 class FinalExamCreateView(BaseAdminView, CreateView):
@@ -337,6 +417,43 @@ class FinalExamDeleteView(BaseAdminView, DeleteView):
     context_object_name = "object"
 
 
+class GradeExportView(BaseAdminView, CsvExportMixin, ListView):
+    """CSV de todas las notas (opcionalmente de una materia, ?subject=CODE)."""
+    model = Grade
+    csv_only = True
+    csv_filename = "notas"
+    csv_fields = (
+        ("id", "id"), ("legajo", "student__student_id"), ("apellido", "student__user__last_name"),
+        ("nombre", "student__user__first_name"), ("materia", "subject__code"), ("materia_nombre", "subject__name"),
+        ("promocion", "promotion_grade"), ("final", "final_grade"), ("estado", "status"),
+        ("actualizado", "last_updated"),
+    )
+
+    def get_queryset(self):
+        grades = super().get_queryset()
+        if self.request.GET.get("subject"):
+            grades = grades.filter(subject_id=self.request.GET["subject"])
+        return grades
+
+
+class SubjectInscriptionExportView(BaseAdminView, CsvExportMixin, ListView):
+    """CSV de todas las inscripciones a materias (opcionalmente de una materia, ?subject=CODE)."""
+    model = SubjectInscription
+    csv_only = True
+    csv_filename = "inscripciones"
+    csv_fields = (
+        ("id", "id"), ("legajo", "student__student_id"), ("apellido", "student__user__last_name"),
+        ("nombre", "student__user__first_name"), ("materia", "subject__code"), ("materia_nombre", "subject__name"),
+        ("fecha", "inscription_date"),
+    )
+
+    def get_queryset(self):
+        inscriptions = super().get_queryset()
+        if self.request.GET.get("subject"):
+            inscriptions = inscriptions.filter(subject_id=self.request.GET["subject"])
+        return inscriptions
+
+
 @login_required
 @user_passes_test(is_admin)
 def assign_final_professors(request, pk):
@@ -377,38 +494,16 @@ def is_student(user):
 def student_dashboard(request):
     """
     Render student dashboard with subjects, grades, and inscriptions.
+
+    The context is built by StudentDashboardService in a constant number of queries
+    and cached per student until their grades, inscriptions or the curriculum change.
     """
     student = getattr(request.user, "student", None)
     if not student:
         messages.error(request, "Tu perfil de estudiante no está configurado. Contactá a un administrador.")
         return redirect("home")
-    subjects = Subject.objects.filter(career=student.career)
-    inscriptions = SubjectInscription.objects.filter(student=student).select_related("subject")
-    inscribed_subject_codes = list(inscriptions.values_list("subject__code", flat=True))
-    grades = Grade.objects.filter(student=student).select_related("subject")
-
-    eligible_subject_ids = (
-        grades.filter(status=Grade.StatusSubject.REGULAR)
-        .values_list("subject_id", flat=True)
-        .distinct()
-    )
-    eligible_finals = FinalExam.objects.filter(subject_id__in=eligible_subject_ids)
-
-    final_inscriptions = (
-        FinalExamInscription.objects.filter(student=student)
-        .select_related("final_exam__subject")
-        .order_by("final_exam__date")
-    )
-    inscribed_final_ids = list(final_inscriptions.values_list("final_exam_id", flat=True))
-
-    return render(request, "users/student_dashboard.html", {
-        "subjects": subjects,
-        "inscriptions": inscriptions,
-        "grades": grades,
-        "eligible_finals": eligible_finals,
-        "final_inscriptions": final_inscriptions,
-        "inscribed_final_ids": inscribed_final_ids,
-        "inscribed_subject_codes": inscribed_subject_codes})
+    context = StudentDashboardService.get_cached_dashboard_data(student)
+    return render(request, "users/student_dashboard.html", context)
 
 
 @login_required
@@ -416,40 +511,115 @@ def student_dashboard(request):
 def subject_inscribe(request, subject_code):
     """
     Create subject inscription and ensure grade record exists.
+
+    Uses SubjectInscriptionService: a single transaction with conflict-ignoring
+    inserts, so concurrent POSTs during the enrollment window never retry.
     """
     student = request.user.student
     subject = get_object_or_404(Subject, code=subject_code, career=student.career)
     if request.method == "POST":
-        created = False
-        obj, created = SubjectInscription.objects.get_or_create(student=student, subject=subject)
-        Grade.objects.get_or_create(student=student, subject=subject)
-        if created:
+        result = SubjectInscriptionService.inscribe(student, subject)
+        if result == SubjectInscriptionService.CREATED:
             messages.success(request, "Inscripción a la materia realizada.")
+        elif result == SubjectInscriptionService.FULL:
+            position = WaitlistService.join(student, subject=subject)
+            messages.warning(request, f"No hay cupo en esta materia. Quedaste en lista de espera (posición {position}).")
         else:
             messages.info(request, "Ya estabas inscripto en esta materia.")
         return redirect("users:student-dashboard")
     return render(request, "users/inscribe_confirm.html", {"subject": subject})
 
 
+@login_required
+@user_passes_test(is_student)
+@require_POST
+def subject_inscribe_batch(request):
+    """
+    Inscribe the student in several subjects with a single POST.
+
+    The posted codes are validated in one query against the student's career and
+    written with one bulk_create per table. Renders a per-subject result summary.
+    """
+    student = request.user.student
+    codes = list(dict.fromkeys(request.POST.getlist("subjects")))
+    if not codes:
+        messages.error(request, "Seleccioná al menos una materia.")
+        return redirect("users:student-dashboard")
+
+    subjects = {s.code: s for s in Subject.objects.filter(career=student.career, code__in=codes)}
+    results = SubjectInscriptionService.inscribe_many(student, subjects.values())
+    for code, result in results.items():
+        if result == SubjectInscriptionService.FULL:
+            WaitlistService.join(student, subject=subjects[code])
+    summary = [
+        {"code": code, "subject": subjects.get(code), "result": results.get(code, SubjectInscriptionService.INVALID)}
+        for code in codes
+    ]
+    return render(request, "users/inscribe_batch_result.html", {"summary": summary})
+
+
 @login_required
 @user_passes_test(is_student)
 def final_exam_inscribe(request, final_exam_id):
     """
     Create final exam inscription if the subject status is REGULAR.
+
+    Eligibility is read from the precomputed FinalExamEligibility table.
     """
     student = request.user.student
     final_exam = get_object_or_404(FinalExam, pk=final_exam_id, subject__career=student.career)
-    grade = Grade.objects.filter(student=student, subject=final_exam.subject).order_by("-id").first()
-    if not grade or grade.status not in [Grade.StatusSubject.REGULAR]:
+    if not FinalExamEligibility.objects.filter(student=student, final_exam=final_exam).exists():
         messages.error(request, "Solo puedes inscribirte si la materia está regular.")
         return redirect("users:student-dashboard")
     if request.method == "POST":
-        FinalExamInscription.objects.get_or_create(student=student, final_exam=final_exam)
-        messages.success(request, "Inscripción al final realizada.")
+        result = FinalExamInscriptionService.inscribe(student, final_exam)
+        if result == FinalExamInscriptionService.FULL:
+            position = WaitlistService.join(student, final_exam=final_exam)
+            messages.warning(request, f"No hay cupo en este final. Quedaste en lista de espera (posición {position}).")
+        elif result == FinalExamInscriptionService.ALREADY_INSCRIBED:
+            messages.info(request, "Ya estabas inscripto en este final.")
+        else:
+            messages.success(request, "Inscripción al final realizada.")
         return redirect("users:student-dashboard")
     return render(request, "users/inscribe_confirm.html", {"final_exam": final_exam})
 
 
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _docx_response(request, template_path, context, filename):
+    """
+    Serve a rendered DOCX attachment through the document cache.
+
+    The cache key is sent as ETag; a matching If-None-Match gets 304 without
+    rendering or reading the file. With the cache disabled the document is
+    rendered on every request.
+    """
+    cache = get_document_cache()
+    if not cache.enabled:
+        response = HttpResponse(render_docx(template_path, context), content_type=DOCX_CONTENT_TYPE)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    key = cache.key(template_path, context)
+    etag = f'"{key}"'
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        handle = cache.open(key, template_path, context, render=render_docx)
+        response = FileResponse(handle, as_attachment=True, filename=filename, content_type=DOCX_CONTENT_TYPE)
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _render_unavailable(exc):
+    """503 response for a saturated or timed-out document renderer."""
+    response = HttpResponse(f"{exc} Intentá de nuevo en unos segundos.", status=503, content_type="text/plain")
+    response["Retry-After"] = "5"
+    return response
+
+
 @login_required
 @user_passes_test(is_student)
 def download_regular_certificate(request):
@@ -458,54 +628,66 @@ def download_regular_certificate(request):
     """
     # Evitar acceder a request.user.student directamente (puede lanzar RelatedObjectDoesNotExist)
     user = request.user
-    student = Student.objects.filter(user=user).select_related("career__faculty").first()
+    student = Student.objects.filter(user=user).select_related("user", "career__faculty").first()
     if not student:
         messages.error(request, "Tu perfil de estudiante no está configurado. Contactá a un administrador.")
         return redirect("home")
 
-    template_path = Path(settings.BASE_DIR) / "regular_certificate.docx"
+    template_path = CertificateService.template_path()
     if not template_path.exists():
         messages.error(request, "No se encontró la plantilla de certificado.")
         return redirect("users:student-dashboard")
 
     today = timezone.localdate()
-    context = {
-        "full_name": request.user.get_full_name() or request.user.username,
-        "first_name": request.user.first_name,
-        "last_name": request.user.last_name,
-        "dni": request.user.dni,
-        "student_id": student.student_id,
-        "career_name": student.career.name if student.career else "",
-        "career_code": student.career.code if student.career else "",
-        "faculty_name": (
-            student.career.faculty.name
-            if getattr(student, "career", None) and student.career and student.career.faculty
-            else ""
-        ),
-        "enrollment_date": student.enrollment_date.strftime("%d/%m/%Y") if student.enrollment_date else "",
-        "today_date": today.strftime("%d/%m/%Y"),
-        "today_day": f"{today.day:02d}",
-        "today_month": f"{today.month:02d}",
-        "today_year": f"{today.year}",
-    }
+    context = CertificateService.get_context(student, today)
 
+    filename = f"certificado-regular-{request.user.last_name or request.user.username}-{today.strftime('%Y%m%d')}.docx"
     try:
-        doc = DocxTemplate(str(template_path))
-        doc.render(context)
-        output = BytesIO()
-        doc.save(output)
-        output.seek(0)
+        return _docx_response(request, template_path, context, filename)
+    except DocumentRenderUnavailable as exc:
+        return _render_unavailable(exc)
     except Exception:
         messages.error(request, "Ocurrió un error al generar el certificado.")
         return redirect("users:student-dashboard")
 
-    filename = f"certificado-regular-{request.user.last_name or request.user.username}-{today.strftime('%Y%m%d')}.docx"
-    response = HttpResponse(
-        output.getvalue(),
-        content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-    )
-    response["Content-Disposition"] = f"attachment; filename=\"{filename}\""
-    return response
+
+@login_required
+@user_passes_test(is_admin)
+def certificate_batch(request):
+    """
+    Download the regular certificates of a career or faculty as one ZIP.
+
+    The archive is rendered in worker processes and streamed member by member.
+    Each download holds one of the DOCX_BATCH_MAX_CONCURRENT batch slots of
+    the process until the stream ends; when none is free the view answers 503.
+    Members are named after the legajo in ascending order, so an interrupted
+    download resumes with ``after`` set to the last legajo received.
+    X-Certificate-Count announces how many certificates the archive holds.
+    """
+    form = CertificateBatchForm(request.GET or None)
+    if form.is_bound and form.is_valid():
+        if not CertificateService.template_path().exists():
+            messages.error(request, "No se encontró la plantilla de certificado.")
+            return redirect("users:admin-dashboard")
+        career, faculty = form.cleaned_data["career"], form.cleaned_data["faculty"]
+        after = form.cleaned_data["after"] or None
+        students = CertificateService.students(career=career, faculty=faculty)
+        total = (students.filter(student_id__gt=after) if after else students).count()
+
+        scope = career.code if career else faculty.code if faculty else "todos"
+        filename = f"certificados-regulares-{scope}-{timezone.localdate().strftime('%Y%m%d')}.zip"
+        try:
+            release = acquire_batch_slot()
+        except DocumentRenderUnavailable as exc:
+            return _render_unavailable(exc)
+        response = StreamingHttpResponse(
+            SlotReleasingIterator(CertificateService.stream_archive(students, after=after), release),
+            content_type="application/zip",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["X-Certificate-Count"] = str(total)
+        return response
+    return render(request, "users/certificate_batch.html", {"form": form})
 
 
 # ------- Vistas de Profesor -------
@@ -529,26 +711,80 @@ def professor_dashboard(request):
     return render(request, "users/professor_dashboard.html", {"subjects": subjects, "finals": finals})
 
 
-@login_required
-@user_passes_test(is_professor)
-def grade_list(request, subject_code):
+def _backfill_grades(subject):
     """
-    List grades for a subject and backfill missing Grade entries.
+    Create the missing Grade rows of a subject's inscribed students.
+
+    Returns:
+        set[str]: student_id of every student inscribed in the subject.
     """
-    professor = request.user.professor
-    subject = get_object_or_404(Subject, code=subject_code, professors=professor)
     enrolled_student_ids = set(SubjectInscription.objects.filter(subject=subject).values_list("student_id", flat=True))
     existing_grade_student_ids = set(Grade.objects.filter(subject=subject).values_list("student_id", flat=True))
     missing_ids = enrolled_student_ids - existing_grade_student_ids
     if missing_ids:
         Grade.objects.bulk_create([Grade(student_id=sid, subject=subject) for sid in missing_ids])
+        # bulk_create skips post_save, so eligibility and cached dashboards are refreshed explicitly.
+        FinalExamEligibility.objects.sync(student_ids=missing_ids, subject_ids=[subject.pk])
+        StudentDashboardService.invalidate_students(missing_ids)
+    return enrolled_student_ids
+
+
+@login_required
+@user_passes_test(is_professor)
+def grade_list(request, subject_code):
+    """
+    List grades for a subject, backfill missing Grade entries and grade the
+    whole course at once.
+
+    POST validates every row of the grid together and persists the changed ones
+    with a single bulk_update (see BaseGradeGridFormSet.save_bulk).
+    """
+    professor = request.user.professor
+    subject = get_object_or_404(Subject, code=subject_code, professors=professor)
+    enrolled_student_ids = _backfill_grades(subject)
 
     grades = (
-        Grade.objects.filter(subject=subject)
+        Grade.objects.filter(subject=subject, student_id__in=enrolled_student_ids)
         .select_related("student__user")
-        .order_by("student__user__last_name", "student__user__first_name")
+        .order_by("student__user__last_name", "student__user__first_name", "pk")
     )
-    return render(request, "users/grade_list.html", {"grades": grades, "subject": subject})
+    if request.method == "POST":
+        formset = GradeGridFormSet(request.POST, queryset=grades)
+        if formset.is_valid():
+            saved = formset.save_bulk()
+            messages.success(request, f"Se guardaron {len(saved)} nota(s).")
+            return redirect("users:grade-list", subject_code=subject.code)
+        messages.error(request, "Revisá las notas marcadas: no se guardó ningún cambio.")
+    else:
+        formset = GradeGridFormSet(queryset=grades)
+    return render(request, "users/grade_list.html", {"formset": formset, "subject": subject})
+
+
+@login_required
+@user_passes_test(is_professor)
+def grade_import(request, subject_code):
+    """
+    Import a subject's grades from an uploaded CSV/XLSX spreadsheet.
+
+    The file is streamed row by row by GradeImportService; the response shows a
+    validation report (updated, unchanged and rejected rows).
+    """
+    subject = get_object_or_404(Subject, code=subject_code, professors=request.user.professor)
+    report = None
+    if request.method == "POST":
+        form = GradeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            _backfill_grades(subject)
+            report = GradeImportService.import_grades(
+                subject, form.cleaned_data["file"], dry_run=form.cleaned_data["dry_run"]
+            )
+            if report["dry_run"]:
+                messages.info(request, "Validación completa: no se guardaron cambios.")
+            else:
+                messages.success(request, f"Se actualizaron {report['updated']} nota(s).")
+    else:
+        form = GradeImportForm()
+    return render(request, "users/grade_import.html", {"form": form, "subject": subject, "report": report})
 
 
 @login_required
@@ -568,10 +804,8 @@ def grade_edit(request, pk):
     if request.method == "POST":
         form = GradeForm(request.POST, instance=grade)
         if form.is_valid():
-            status_was_changed = "status" in form.changed_data
-            saved = form.save()
-            if not status_was_changed:
-                saved.update_status()
+            # GradeForm.save() resolves status (manual override or derived) before its single UPDATE.
+            form.save()
             return redirect("users:grade-list", subject_code=grade.subject.code)
     else:
         form = GradeForm(instance=grade)
@@ -626,20 +860,11 @@ class StudentFileDocxView(View):
             return redirect('users:student-dashboard')
 
         try:
-            doc = DocxTemplate(str(doc_path))
-            doc.render(student_data)
-            output = BytesIO()
-            doc.save(output)
-            output.seek(0)
-            
             filename = f"ficha_alumno_{student_id}.docx"
-            response = HttpResponse(
-                output.getvalue(),
-                content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            )
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
-            return response
-        
+            return _docx_response(request, doc_path, student_data, filename)
+
+        except DocumentRenderUnavailable as exc:
+            return _render_unavailable(exc)
         except Exception as e:
             messages.error(request, f"Ocurrió un error al generar la Ficha: {e}")
             return redirect('users:student-dashboard')
@@ -651,4 +876,110 @@ class StudentFileJSONView(View):
         student_data = StudentFileService.get_student_file_data(student_id)
         if not student_data:
             return JsonResponse({'error': 'Ficha de Alumno no encontrada.'}, status=404)
-        return JsonResponse(student_data)
\ No newline at end of file
+        return JsonResponse(student_data)
+
+
+class StudentFileExportView(BaseAdminView, View):
+    """
+    Stream the student files of every student (or a filtered set) as NDJSON.
+
+    Filters come from the query string (StudentFileExportForm). Records are
+    ordered by legajo, so an interrupted export resumes with ``after`` set to
+    the last nro_legajo received.
+    """
+    def get(self, request):
+        form = StudentFileExportForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({'error': form.errors}, status=400)
+        students = StudentFileService.students(
+            career=form.cleaned_data['career'],
+            faculty=form.cleaned_data['faculty'],
+            enrolled_from=form.cleaned_data['enrolled_from'],
+            enrolled_to=form.cleaned_data['enrolled_to'],
+            after=form.cleaned_data['after'] or None,
+        )
+        response = StreamingHttpResponse(
+            StudentFileService.iter_ndjson(students), content_type='application/x-ndjson; charset=utf-8'
+        )
+        response['Content-Disposition'] = 'attachment; filename="fichas_alumnos.ndjson"'
+        return response
+
+
+# --------- Trabajos de documentos en segundo plano ---------
+def _job_payload(job):
+    """JSON representation of a DocumentJob for the status endpoints."""
+    payload = {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+        "expires_at": job.expires_at,
+        "status_url": reverse("users:document-job-status", args=[job.pk]),
+    }
+    if job.status == DocumentJob.Status.DONE:
+        payload["download_url"] = reverse("users:document-job-download", args=[job.pk])
+    return payload
+
+
+@login_required
+@require_POST
+def document_job_submit(request):
+    """
+    Queue a document job and answer 202 with its status URL.
+
+    POST fields:
+        kind: "certificates" (administrators; optional career/faculty codes) or
+        "student_file" (student_id; administrators or the student themself).
+    """
+    kind = request.POST.get("kind")
+    if kind == DocumentJob.Kind.CERTIFICATES:
+        if not is_admin(request.user):
+            return JsonResponse({"error": "Solo un administrador puede generar certificados masivos."}, status=403)
+        form = CertificateBatchForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"error": form.errors}, status=400)
+        career, faculty = form.cleaned_data["career"], form.cleaned_data["faculty"]
+        params = {"career": career.code if career else None, "faculty": faculty.code if faculty else None}
+    elif kind == DocumentJob.Kind.STUDENT_FILE:
+        student_id = request.POST.get("student_id", "")
+        student = Student.objects.filter(student_id=student_id).only("user_id").first()
+        if student is None:
+            return JsonResponse({"error": "Ficha de Alumno no encontrada."}, status=404)
+        if not is_admin(request.user) and student.user_id != request.user.pk:
+            return JsonResponse({"error": "No podés pedir la ficha de otro alumno."}, status=403)
+        params = {"student_id": student_id}
+    else:
+        return JsonResponse({"error": "Tipo de documento desconocido."}, status=400)
+
+    job = DocumentJobService.submit(kind, params, user=request.user)
+    response = JsonResponse(_job_payload(job), status=202)
+    response["Location"] = reverse("users:document-job-status", args=[job.pk])
+    return response
+
+
+@login_required
+def document_job_status(request, pk):
+    """Poll a document job (404 for jobs of other users)."""
+    job = get_object_or_404(DocumentJobService.visible_to(request.user), pk=pk)
+    response = JsonResponse(_job_payload(job))
+    if job.status in (DocumentJob.Status.PENDING, DocumentJob.Status.RUNNING):
+        response["Retry-After"] = "2"
+    return response
+
+
+@login_required
+def document_job_download(request, pk):
+    """Download the output of a finished job (409 while pending, 410 once expired or failed)."""
+    job = get_object_or_404(DocumentJobService.visible_to(request.user), pk=pk)
+    if job.status in (DocumentJob.Status.PENDING, DocumentJob.Status.RUNNING):
+        return JsonResponse(_job_payload(job), status=409)
+    path = DocumentJobService.output_path(job) if job.status == DocumentJob.Status.DONE else None
+    if path is None or not path.is_file():
+        return JsonResponse(_job_payload(job), status=410)
+    content_type = "application/zip" if job.filename.endswith(".zip") else DOCX_CONTENT_TYPE
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=job.filename, content_type=content_type)